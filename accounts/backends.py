@@ -0,0 +1,94 @@
+"""
+Authentication backends.
+PinBackend logs keypad users in by PIN, looked up through the indexed keyed
+hash column instead of comparing plaintext PINs row by row. Both backends
+resolve the session's user from a short-lived process-local cache, so role
+checks on the operator panel's AJAX calls don't query the user table.
+"""
+
+import copy
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import ValidationError
+
+from .models import CustomUser, hash_pin
+
+PIN_PATTERN = re.compile(r'\d{4}')
+
+# Seconds a cached user is trusted; bounds staleness after edits made by another process
+USER_CACHE_TTL = 60
+
+# Cached users; past this the cache starts over
+USER_CACHE_MAX_KEYS = 1024
+
+
+class UserCache:
+    """
+    Process-local TTL cache of users by id.
+
+    Saving or deleting a user drops its entry (see accounts.signals). Each hit
+    returns a copy, so a request changing request.user can't leak into others.
+    """
+
+    _users: Dict[int, Tuple[float, CustomUser]] = {}  # id -> (expiry, user)
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, user_id) -> Optional[CustomUser]:
+        """Return a copy of the cached user, or None if absent or expired."""
+        entry = cls._users.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return copy.copy(entry[1])
+
+    @classmethod
+    def set(cls, user: CustomUser) -> None:
+        with cls._lock:
+            if len(cls._users) >= USER_CACHE_MAX_KEYS:
+                cls._users = {}
+            cls._users[user.pk] = (time.monotonic() + USER_CACHE_TTL, copy.copy(user))
+
+    @classmethod
+    def invalidate(cls, user_id) -> None:
+        """Drop one user; the next request reloads it."""
+        with cls._lock:
+            cls._users.pop(user_id, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._users = {}
+
+
+class CachedUserBackend(ModelBackend):
+    """ModelBackend whose get_user() is served from UserCache."""
+
+    def get_user(self, user_id):
+        try:
+            user_id = CustomUser._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
+        user = UserCache.get(user_id)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            UserCache.set(user)
+        return user if self.user_can_authenticate(user) else None
+
+
+class PinBackend(CachedUserBackend):
+    """Authenticate with authenticate(request, pin='1234')."""
+
+    def authenticate(self, request, pin=None, **kwargs):
+        if pin is None or not PIN_PATTERN.fullmatch(pin):
+            return None
+        # An index lookup on pin_hash; a PIN shared by two users identifies neither
+        users = list(CustomUser.objects.filter(pin_hash=hash_pin(pin), is_active=True)[:2])
+        if len(users) != 1 or not self.user_can_authenticate(users[0]):
+            return None
+        return users[0]
@@ -19,15 +19,15 @@ class Command(BaseCommand):
                 is_staff=True,
                 is_superuser=True
             )
-            admin_user.numeric_password = '0001'
+            admin_user.set_pin('0001')
             admin_user.save()
             self.stdout.write(self.style.SUCCESS(
                 f'✓ Admin account created: {admin_username} / {admin_password} (PIN: 0001)'
             ))
         else:
-            # Update existing admin with numeric password
+            # Update existing admin's PIN
             admin_user = CustomUser.objects.get(username=admin_username)
-            admin_user.numeric_password = '0001'
+            admin_user.set_pin('0001')
             admin_user.save()
             self.stdout.write(self.style.WARNING(
                 f'Admin account "{admin_username}" already exists (PIN updated to 0001)'
@@ -45,15 +45,15 @@ class Command(BaseCommand):
                 full_name='QC Operator',
                 email='operator@magicqc.com'
             )
-            operator_user.numeric_password = '0002'
+            operator_user.set_pin('0002')
             operator_user.save()
             self.stdout.write(self.style.SUCCESS(
                 f'✓ Operator account created: {operator_username} / {operator_password} (PIN: 0002)'
             ))
         else:
-            # Update existing operator with numeric password
+            # Update existing operator's PIN
             operator_user = CustomUser.objects.get(username=operator_username)
-            operator_user.numeric_password = '0002'
+            operator_user.set_pin('0002')
             operator_user.save()
             self.stdout.write(self.style.WARNING(
                 f'Operator account "{operator_username}" already exists (PIN updated to 0002)'
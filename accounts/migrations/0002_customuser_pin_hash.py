@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+from django.utils.crypto import salted_hmac
+
+
+def hash_existing_pins(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    users = CustomUser.objects.exclude(numeric_password__isnull=True).exclude(numeric_password='')
+    for user_id, pin in users.values_list('id', 'numeric_password'):
+        pin_hash = salted_hmac('accounts.CustomUser.pin', pin, algorithm='sha256').hexdigest()
+        CustomUser.objects.filter(id=user_id).update(pin_hash=pin_hash)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='pin_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Keyed hash of the 4-digit numeric PIN for login', max_length=64, null=True),
+        ),
+        # Plaintext PINs can't be recovered from their hashes, so this only runs forwards
+        migrations.RunPython(hash_existing_pins, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='numeric_password',
+        ),
+    ]
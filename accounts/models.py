@@ -1,5 +1,13 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.crypto import salted_hmac
+
+PIN_HASH_SALT = 'accounts.CustomUser.pin'
+
+
+def hash_pin(pin):
+    """Keyed hash (HMAC-SHA256 under SECRET_KEY) a PIN is stored and looked up by"""
+    return salted_hmac(PIN_HASH_SALT, pin, algorithm='sha256').hexdigest()
 
 class CustomUser(AbstractUser):
     """Custom user model with role-based access"""
@@ -10,7 +18,8 @@ class CustomUser(AbstractUser):
     
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='operator')
     full_name = models.CharField(max_length=100, blank=True)
-    numeric_password = models.CharField(max_length=4, blank=True, null=True, help_text='4-digit numeric PIN for login')
+    pin_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True, editable=False,
+                                help_text='Keyed hash of the 4-digit numeric PIN for login')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
@@ -22,6 +31,10 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
     
+    def set_pin(self, pin):
+        """Set the keypad PIN; only its keyed hash is stored"""
+        self.pin_hash = hash_pin(pin) if pin else None
+    
     def is_admin(self):
         return self.role == 'admin'
     
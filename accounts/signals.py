@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import UserCache
+from .models import CustomUser
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the cached user now and again once the change is committed"""
+    UserCache.invalidate(instance.pk)
+    # A copy cached from the pre-commit row in the meantime is dropped too
+    transaction.on_commit(lambda: UserCache.invalidate(instance.pk))
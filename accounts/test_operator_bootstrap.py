@@ -0,0 +1,161 @@
+"""
+Test suite for the operator station bootstrap.
+Tests the payload the station validates with, and its version: 304 while
+nothing changed, a new version once the PO, a product, a size chart or a
+tolerance rule is edited.
+"""
+
+from datetime import date
+
+from magic_qc.testing import clear_products, create_size_chart, setup_test_database
+
+
+def start_session():
+    """An operator with an active session on a two-size PO, and a client logged in as them."""
+    from django.test import Client
+    from accounts.models import CustomUser, OperatorSession
+    from products.models import Product, PurchaseOrder
+
+    clear_products()
+    operator, _ = CustomUser.objects.get_or_create(username='bootstrap_operator', defaults={'role': 'operator'})
+    order = PurchaseOrder.objects.create(
+        po_number='PO-BOOTSTRAP', date=date(2026, 5, 1), brand='INDITEX',
+        origin_country='Morocco', article_type='sweat_shirt',
+    )
+    product = Product.objects.create(purchase_order=order, size='8/9', quantity=50, color='Navy')
+    Product.objects.create(purchase_order=order, size='8/9', quantity=10, color='Red')
+    Product.objects.create(purchase_order=order, size='9/10', quantity=30, color='Navy')
+    session = OperatorSession.objects.create(
+        operator=operator, purchase_order=order, product=product, status='active'
+    )
+    client = Client()
+    client.force_login(operator)
+    return client, session
+
+
+def test_bootstrap_payload():
+    """Test the payload carries the session, PO, product, codes and per-size aligned lists."""
+    setup_test_database()
+    from django.urls import reverse
+    from products.charts import SizeChartRegistry
+
+    print("\n" + "="*70)
+    print("TEST 1: Operator Bootstrap - Payload")
+    print("="*70)
+
+    client, session = start_session()
+    payload = client.get(reverse('operator_bootstrap')).json()
+
+    assert payload['success'] and payload['version'].startswith(f'{session.id}-')
+    assert payload['session']['id'] == session.id and 'measurements_count' not in payload['session']
+    assert payload['purchase_order']['po_number'] == 'PO-BOOTSTRAP'
+    assert payload['purchase_order']['article_type'] == 'sweat_shirt'
+    assert payload['purchase_order']['sizes'] == {'8/9': 60, '9/10': 30}
+    assert payload['product'] == {'id': session.product_id, 'size': '8/9', 'color': 'Navy', 'quantity': 50}
+
+    codes = payload['codes']
+    print(f"Codes: {len(codes)}, required: {len(payload['required_codes'])}, sizes: {len(payload['size_charts'])}")
+    assert codes[:3] == ['A', 'B', 'C'] and len(payload['names']) == len(codes)
+    assert payload['required_codes'] and set(payload['required_codes']) <= set(codes)
+    assert sorted(payload['size_charts']) == sorted(SizeChartRegistry.all()['sweat_shirt'])
+    for size, lists in payload['size_charts'].items():
+        assert len(lists['standard']) == len(lists['minus']) == len(lists['plus']) == len(codes), size
+        chart = SizeChartRegistry.get(size).chart
+        assert lists['standard'] == [chart.get(code) for code in codes], size
+        assert all(minus >= 0 and plus >= 0 for minus, plus in zip(lists['minus'], lists['plus']))
+
+    clear_products()
+    print("✓ Session, PO sizes, product and aligned standard/minus/plus lists per size")
+
+
+def test_bootstrap_version_changes():
+    """Test a matching ETag gets 304 until the PO, a product, a chart or a rule changes."""
+    setup_test_database()
+    from django.urls import reverse
+    from products.models import StandardSizeChart, ToleranceRule
+
+    print("\n" + "="*70)
+    print("TEST 2: Operator Bootstrap - Version and 304")
+    print("="*70)
+
+    client, session = start_session()
+    url = reverse('operator_bootstrap')
+    response = client.get(url)
+    versions = [response.json()['version']]
+    assert response['ETag'] == f'"{versions[0]}"'
+    assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+
+    def assert_new_version(change):
+        response = client.get(url, HTTP_IF_NONE_MATCH=f'"{versions[-1]}"')
+        assert response.status_code == 200, change
+        version = response.json()['version']
+        print(f"{change}: {version}")
+        assert version not in versions, change
+        assert response['ETag'] == f'"{version}"'
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+        versions.append(version)
+        return response.json()
+
+    chart = rule = None
+    try:
+        order = session.purchase_order
+        order.origin_country = 'Portugal'
+        order.save()
+        assert_new_version('PO edited')
+
+        other = order.products.get(color='Red')
+        other.quantity = 12
+        other.save()
+        assert assert_new_version('product edited')['purchase_order']['sizes']['8/9'] == 62
+
+        chart = create_size_chart('sweat_shirt', '8/9', 40.0)
+        assert assert_new_version('chart saved')['size_charts']['8/9']['standard'][0] == 40.0
+
+        rule = ToleranceRule.objects.create(
+            article_type='sweat_shirt', size='8/9', code='B', minus_tolerance='0.30', plus_tolerance='1.50'
+        )
+        payload = assert_new_version('rule saved')
+        b = payload['codes'].index('B')
+        assert payload['size_charts']['8/9']['minus'][b] == 0.3
+        assert payload['size_charts']['8/9']['plus'][b] == 1.5
+    finally:
+        if chart is not None:
+            StandardSizeChart.objects.filter(id=chart.id).delete()
+        if rule is not None:
+            ToleranceRule.objects.filter(id=rule.id).delete()
+        clear_products()
+
+    # No active session left
+    assert client.get(url).status_code == 404
+    print("✓ Each edit gives a new version; 304 while nothing changed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ OPERATOR BOOTSTRAP - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_bootstrap_payload()
+        test_bootstrap_version_changes()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • The payload has the session, PO, product and aligned per-size lists")
+        print("  • PO, product, chart and rule edits change the version; otherwise 304")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
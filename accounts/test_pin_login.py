@@ -0,0 +1,277 @@
+"""
+Test suite for keypad PIN login.
+Tests the keyed-hash PIN lookup, attempt throttling, the migration that
+hashed the plaintext PINs and the cached user backend.
+"""
+
+import time
+
+from magic_qc.testing import setup_test_database
+
+
+def create_user(username: str, pin: str, role: str = 'operator'):
+    from accounts.models import CustomUser
+    user = CustomUser.objects.create_user(username, password='unused', role=role)
+    user.set_pin(pin)
+    user.save()
+    return user
+
+
+def test_pin_backend_keyed_hash_lookup():
+    """Test PINs are stored as keyed hashes and looked up by hash."""
+    setup_test_database()
+    from django.contrib.auth import authenticate
+    from accounts.models import CustomUser, hash_pin
+
+    print("\n" + "="*70)
+    print("TEST 1: PIN Backend - Keyed Hash Lookup")
+    print("="*70)
+
+    user = create_user('pin_lookup', '4821')
+    stored = CustomUser.objects.values_list('pin_hash', flat=True).get(id=user.id)
+    print(f"Stored PIN: {stored}")
+
+    assert stored == hash_pin('4821') and '4821' not in stored
+    assert authenticate(None, pin='4821') == user
+    assert authenticate(None, pin='4822') is None
+    assert authenticate(None, pin='482') is None
+    assert authenticate(None, pin='48210') is None
+
+    user.is_active = False
+    user.save()
+    assert authenticate(None, pin='4821') is None
+
+    print("✓ Only the hash is stored, and only the exact PIN of an active user logs in")
+
+
+def test_pin_backend_rejects_shared_pin():
+    """Test a PIN held by two users logs in neither."""
+    setup_test_database()
+    from django.contrib.auth import authenticate
+
+    print("\n" + "="*70)
+    print("TEST 2: PIN Backend - Shared PIN")
+    print("="*70)
+
+    first = create_user('pin_shared_1', '7310')
+    create_user('pin_shared_2', '7310')
+    assert authenticate(None, pin='7310') is None
+
+    first.set_pin('7311')
+    first.save()
+    assert authenticate(None, pin='7311') == first
+    assert authenticate(None, pin='7310').username == 'pin_shared_2'
+
+    print("✓ A shared PIN identifies nobody until it is unique again")
+
+
+def test_pin_throttle_limits_and_window():
+    """Test failures are limited per station and per IP, and expire with their window."""
+    setup_test_database()
+    from django.test import RequestFactory
+    from accounts import throttle
+    from accounts.throttle import PinAttemptThrottle
+
+    print("\n" + "="*70)
+    print("TEST 3: PIN Throttle - Station and IP Limits")
+    print("="*70)
+
+    factory = RequestFactory()
+
+    def station_request(station, ip='10.0.0.1'):
+        return factory.post('/login/', REMOTE_ADDR=ip, HTTP_X_STATION_ID=station)
+
+    PinAttemptThrottle.reset()
+    request = station_request('line-1')
+    for _ in range(throttle.PIN_ATTEMPTS_PER_STATION - 1):
+        PinAttemptThrottle.record_failure(request)
+    assert PinAttemptThrottle.retry_after(request) == 0
+    PinAttemptThrottle.record_failure(request)
+    wait = PinAttemptThrottle.retry_after(request)
+    print(f"Station locked for {wait}s after {throttle.PIN_ATTEMPTS_PER_STATION} failures")
+    assert 0 < wait <= throttle.PIN_ATTEMPT_WINDOW + 1
+
+    # Other stations on the IP still have room, and a success clears the station
+    assert PinAttemptThrottle.retry_after(station_request('line-2')) == 0
+    PinAttemptThrottle.record_success(request)
+    assert PinAttemptThrottle.retry_after(request) == 0
+
+    # Changing the station header doesn't get past the IP's limit
+    PinAttemptThrottle.reset()
+    for i in range(throttle.PIN_ATTEMPTS_PER_IP):
+        PinAttemptThrottle.record_failure(station_request(f'spoofed-{i}'))
+    assert PinAttemptThrottle.retry_after(station_request('spoofed-new')) > 0
+    assert PinAttemptThrottle.retry_after(station_request('line-1', ip='10.0.0.2')) == 0
+
+    original_window = throttle.PIN_ATTEMPT_WINDOW
+    throttle.PIN_ATTEMPT_WINDOW = 0.2
+    try:
+        PinAttemptThrottle.reset()
+        for _ in range(throttle.PIN_ATTEMPTS_PER_STATION):
+            PinAttemptThrottle.record_failure(request)
+        assert PinAttemptThrottle.retry_after(request) > 0
+        time.sleep(0.3)
+        assert PinAttemptThrottle.retry_after(request) == 0
+
+        # The next failure starts a new window
+        PinAttemptThrottle.record_failure(request)
+        assert PinAttemptThrottle.retry_after(request) == 0
+    finally:
+        throttle.PIN_ATTEMPT_WINDOW = original_window
+        PinAttemptThrottle.reset()
+
+    print("✓ Limits apply per station and per IP, and lapse with the window")
+
+
+def test_login_view_answers_429():
+    """Test the keypad login turns a throttled station away with 429 and Retry-After."""
+    setup_test_database()
+    from django.test import Client
+    from django.urls import reverse
+    from accounts import throttle
+    from accounts.throttle import PinAttemptThrottle
+
+    print("\n" + "="*70)
+    print("TEST 4: Keypad Login - 429 When Throttled")
+    print("="*70)
+
+    create_user('pin_view', '5902')
+    login_url = reverse('unified_login')
+    client = Client(HTTP_X_REQUESTED_WITH='XMLHttpRequest', HTTP_X_STATION_ID='line-9')
+    PinAttemptThrottle.reset()
+    try:
+        for _ in range(throttle.PIN_ATTEMPTS_PER_STATION):
+            assert client.post(login_url, {'pin': '0000'}).status_code == 400
+
+        # Even the right PIN is turned away until the window is over
+        response = client.post(login_url, {'pin': '5902'})
+        print(f"Status: {response.status_code}, Retry-After: {response.get('Retry-After')}")
+        assert response.status_code == 429
+        assert int(response['Retry-After']) > 0
+        assert response.json()['success'] is False
+
+        other_station = Client(HTTP_X_REQUESTED_WITH='XMLHttpRequest', HTTP_X_STATION_ID='line-10')
+        response = other_station.post(login_url, {'pin': '5902'})
+        assert response.status_code == 200 and response.json()['username'] == 'pin_view'
+    finally:
+        PinAttemptThrottle.reset()
+
+    print("✓ A throttled station gets 429 with Retry-After, others still log in")
+
+
+def test_pin_hash_migration():
+    """Test migration 0002 hashes existing plaintext PINs and drops them."""
+    setup_test_database()
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+    from accounts.models import CustomUser, hash_pin
+
+    print("\n" + "="*70)
+    print("TEST 5: Migration 0002 - Hashing Plaintext PINs")
+    print("="*70)
+
+    before, after = [('accounts', '0001_initial')], [('accounts', '0002_customuser_pin_hash')]
+    executor = MigrationExecutor(connection)
+    executor.migrate(before)
+    try:
+        OldUser = executor.loader.project_state(before).apps.get_model('accounts', 'CustomUser')
+        OldUser.objects.create(username='legacy_pin', password='!', role='operator', numeric_password='2468')
+        OldUser.objects.create(username='legacy_no_pin', password='!', role='operator')
+    finally:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes('accounts'))
+    assert after[0] in MigrationExecutor(connection).loader.applied_migrations
+
+    hashes = dict(CustomUser.objects.filter(
+        username__in=['legacy_pin', 'legacy_no_pin']
+    ).values_list('username', 'pin_hash'))
+    print(f"Migrated hashes: {hashes}")
+
+    assert hashes == {'legacy_pin': hash_pin('2468'), 'legacy_no_pin': None}
+    assert 'numeric_password' not in {field.name for field in CustomUser._meta.get_fields()}
+
+    print("✓ Existing PINs are hashed and the plaintext column is gone")
+
+
+def test_user_cache_invalidation():
+    """Test cached users are dropped on save and on deactivation, and expire with the TTL."""
+    setup_test_database()
+    from accounts import backends
+    from accounts.backends import CachedUserBackend, UserCache
+    from accounts.models import CustomUser
+
+    print("\n" + "="*70)
+    print("TEST 6: User Cache - Invalidation")
+    print("="*70)
+
+    backend = CachedUserBackend()
+    user = create_user('cached_user', '6634')
+    UserCache.clear()
+
+    assert backend.get_user(user.id).role == 'operator'
+    assert UserCache.get(user.id) is not None
+
+    user.role = 'admin'
+    user.save()
+    assert UserCache.get(user.id) is None
+    assert backend.get_user(user.id).role == 'admin'
+
+    user.is_active = False
+    user.save()
+    assert backend.get_user(user.id) is None
+
+    # Edits that bypass save() (like another process's) show up once the entry expires
+    original_ttl = backends.USER_CACHE_TTL
+    backends.USER_CACHE_TTL = 0.2
+    try:
+        CustomUser.objects.filter(id=user.id).update(is_active=True)
+        UserCache.clear()
+        assert backend.get_user(user.id).role == 'admin'
+        CustomUser.objects.filter(id=user.id).update(role='operator')
+        assert backend.get_user(user.id).role == 'admin'
+        time.sleep(0.3)
+        assert backend.get_user(user.id).role == 'operator'
+    finally:
+        backends.USER_CACHE_TTL = original_ttl
+        UserCache.clear()
+
+    print("✓ Saves drop the cached user at once, other edits within USER_CACHE_TTL")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ PIN LOGIN - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_pin_backend_keyed_hash_lookup()
+        test_pin_backend_rejects_shared_pin()
+        test_pin_throttle_limits_and_window()
+        test_login_view_answers_429()
+        test_pin_hash_migration()
+        test_user_cache_invalidation()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • PINs are stored and looked up as keyed hashes")
+        print("  • A PIN shared by two users logs in neither")
+        print("  • Failed PINs are limited per station and per IP, per window")
+        print("  • Throttled logins get 429 with Retry-After")
+        print("  • Migration 0002 hashes existing PINs")
+        print("  • Cached users are dropped on save and expire with USER_CACHE_TTL")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
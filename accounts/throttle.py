@@ -0,0 +1,86 @@
+"""
+PIN attempt throttling.
+Counts failed keypad logins per station and per client IP in process memory,
+so a burst of guesses is turned away before it reaches the database. Counts
+expire with their window; a successful login clears the station's count.
+"""
+
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# Failed PINs allowed per window from one station, and from one IP across stations
+PIN_ATTEMPTS_PER_STATION = 5
+PIN_ATTEMPTS_PER_IP = 20
+
+# Seconds a window of failed attempts lasts, counted from its first failure
+PIN_ATTEMPT_WINDOW = 300
+
+# Counters kept before expired ones are swept out
+PIN_THROTTLE_MAX_KEYS = 10000
+
+
+def attempt_keys(request) -> Tuple[tuple, tuple]:
+    """(station key, IP key) a login request is counted under."""
+    ip = request.META.get('REMOTE_ADDR', '')
+    station = request.headers.get('X-Station-Id', '')[:64]
+    return ('station', station, ip), ('ip', ip)
+
+
+class PinAttemptThrottle:
+    """
+    Fixed-window failure counters, per process.
+
+    The station key is client supplied, so every station on an IP also counts
+    against that IP's higher limit; changing the header doesn't buy guesses.
+    """
+
+    _attempts: Dict[tuple, List] = {}  # key -> [failures, window expiry]
+    _lock = threading.Lock()
+
+    @classmethod
+    def _limit(cls, key: tuple) -> int:
+        return PIN_ATTEMPTS_PER_STATION if key[0] == 'station' else PIN_ATTEMPTS_PER_IP
+
+    @classmethod
+    def retry_after(cls, request) -> int:
+        """
+        Seconds until the request may try a PIN again.
+
+        Returns:
+            int: 0 if it isn't throttled
+        """
+        now = time.monotonic()
+        wait = 0.0
+        for key in attempt_keys(request):
+            entry = cls._attempts.get(key)
+            if entry and entry[1] > now and entry[0] >= cls._limit(key):
+                wait = max(wait, entry[1] - now)
+        return int(wait) + 1 if wait else 0
+
+    @classmethod
+    def record_failure(cls, request) -> None:
+        """Count a wrong PIN against the station and the IP."""
+        now = time.monotonic()
+        with cls._lock:
+            if len(cls._attempts) >= PIN_THROTTLE_MAX_KEYS:
+                cls._attempts = {key: entry for key, entry in cls._attempts.items() if entry[1] > now}
+            for key in attempt_keys(request):
+                entry = cls._attempts.get(key)
+                if entry is None or entry[1] <= now:
+                    cls._attempts[key] = [1, now + PIN_ATTEMPT_WINDOW]
+                else:
+                    entry[0] += 1
+
+    @classmethod
+    def record_success(cls, request) -> None:
+        """Clear the station's failures; the IP's count runs out with its window."""
+        station_key, _ = attempt_keys(request)
+        with cls._lock:
+            cls._attempts.pop(station_key, None)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget every counter."""
+        with cls._lock:
+            cls._attempts = {}
@@ -16,7 +16,9 @@ urlpatterns = [
     
     # Operator panel
     path('operator/panel/', views.operator_panel_view, name='operator_panel'),
+    path('operator/bootstrap/', views.operator_bootstrap, name='operator_bootstrap'),
     path('operator/products-by-brand/', views.get_products_by_brand, name='products_by_brand'),
+    path('operator/products/', views.search_products_view, name='search_products'),
     path('operator/available-sizes/', views.get_available_sizes, name='available_sizes'),
     path('operator/start-session/', views.start_measurement_session, name='start_session'),
     path('operator/end-session/<int:session_id>/', views.end_measurement_session, name='end_session'),
@@ -2,12 +2,22 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Max, Sum
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+import hashlib
 from .models import CustomUser, OperatorSession
+from .throttle import PinAttemptThrottle
 from .forms import AdminLoginForm, OperatorLoginForm, UserCreateForm, UserEditForm
+from measurements.utils import get_compiled_charts
+from products.catalog import CATALOG_MAX_PAGE_SIZE, CATALOG_PAGE_SIZE, ProductCatalog, search_products
+from products.charts import SizeChartRegistry
 from products.models import PurchaseOrder, Product
+from products.tolerances import ToleranceRuleRegistry
+
+ARTICLE_TYPE_NAMES = dict(PurchaseOrder.ARTICLE_TYPE_CHOICES)
 
 # Helper functions for role checking
 def is_admin(user):
@@ -18,7 +28,7 @@ def is_operator(user):
 
 # UNIFIED FRONT LOGIN VIEW
 def unified_login_view(request):
-    """Unified front login page with hexagonal keypad - Database-backed numeric password authentication"""
+    """Unified front login page with hexagonal keypad - PIN authentication via accounts.backends.PinBackend"""
     # If user is already authenticated, redirect to appropriate dashboard
     if request.user.is_authenticated:
         if request.user.role == 'admin':
@@ -29,34 +39,27 @@ def unified_login_view(request):
     # Handle POST request from keypad (AJAX or form submission)
     if request.method == 'POST':
         pin = request.POST.get('pin', '')
+        is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
         
-        try:
-            # Database lookup: Find user by numeric_password
-            user = CustomUser.objects.get(numeric_password=pin, is_active=True)
-            
-            # Log the user in without password verification (PIN already verified)
-            login(request, user, backend='django.contrib.auth.backends.ModelBackend')
-            
-            # Return JSON response for AJAX
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                redirect_url = 'dashboard' if user.role == 'admin' else 'operator_panel'
-                return JsonResponse({
-                    'success': True,
-                    'role': user.role,
-                    'redirect_url': redirect_url,
-                    'username': user.username
-                })
+        # Bursts of wrong PINs are turned away before any database lookup
+        retry_after = PinAttemptThrottle.retry_after(request)
+        if retry_after:
+            if is_ajax:
+                response = JsonResponse({
+                    'success': False,
+                    'error': f'Too many attempts. Try again in {retry_after} seconds.'
+                }, status=429)
+                response['Retry-After'] = str(retry_after)
+                return response
             
-            # Standard redirect for form submission
-            messages.success(request, f'Welcome, {user.username}!')
-            if user.role == 'admin':
-                return redirect('dashboard')
-            else:
-                return redirect('operator_panel')
-                
-        except CustomUser.DoesNotExist:
+            messages.error(request, f'Too many attempts. Try again in {retry_after} seconds.')
+            return redirect('unified_login')
+        
+        user = authenticate(request, pin=pin)
+        if user is None:
             # Invalid PIN
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            PinAttemptThrottle.record_failure(request)
+            if is_ajax:
                 return JsonResponse({
                     'success': False,
                     'error': 'Invalid access code'
@@ -64,6 +67,26 @@ def unified_login_view(request):
             
             messages.error(request, 'Invalid access code. Please try again.')
             return redirect('unified_login')
+        
+        PinAttemptThrottle.record_success(request)
+        login(request, user)
+        
+        # Return JSON response for AJAX
+        if is_ajax:
+            redirect_url = 'dashboard' if user.role == 'admin' else 'operator_panel'
+            return JsonResponse({
+                'success': True,
+                'role': user.role,
+                'redirect_url': redirect_url,
+                'username': user.username
+            })
+        
+        # Standard redirect for form submission
+        messages.success(request, f'Welcome, {user.username}!')
+        if user.role == 'admin':
+            return redirect('dashboard')
+        else:
+            return redirect('operator_panel')
     
     return render(request, 'accounts/unified_login.html')
 
@@ -211,31 +234,20 @@ def user_delete_view(request, user_id):
 @login_required
 @user_passes_test(is_operator, login_url='operator_login')
 def operator_panel_view(request):
-    """Main operator panel - single page interface"""
-    # Get all purchase orders with products
-    purchase_orders = PurchaseOrder.objects.all().prefetch_related('products').order_by('-created_at')
-    
-    # Get unique brands from POs
-    brands = purchase_orders.values_list('brand', flat=True).distinct()
+    """
+    Main operator panel - single page interface. Renders a light shell; POs
+    and products are fetched lazily through operator/products/ as the
+    operator filters.
+    """
+    # Brands that have POs: a distinct scan of the (brand, article_type) index
+    brands = PurchaseOrder.objects.order_by('brand').values_list('brand', flat=True).distinct()
     
     # Get article types
     article_types = PurchaseOrder.ARTICLE_TYPE_CHOICES
     
-    # Get available sizes
-    sizes = Product.SIZE_CHOICES
-    
-    # Get active session if exists
-    active_session = OperatorSession.objects.filter(
-        operator=request.user,
-        status='active'
-    ).first()
-    
     context = {
-        'purchase_orders': purchase_orders,
         'brands': brands,
         'article_types': article_types,
-        'sizes': sizes,
-        'active_session': active_session,
     }
     return render(request, 'accounts/operator_panel.html', context)
 
@@ -246,26 +258,30 @@ def get_products_by_brand(request):
     brand = request.GET.get('brand')
     article_type = request.GET.get('article_type')
     
-    query = PurchaseOrder.objects.filter(brand=brand)
-    if article_type:
-        query = query.filter(article_type=article_type)
-    
-    pos = query.prefetch_related('products')
-    
-    data = []
-    for po in pos:
-        for product in po.products.all():
-            data.append({
-                'po_id': po.id,
-                'po_number': po.po_number,
-                'product_id': product.id,
-                'size': product.size,
-                'color': product.color,
-                'quantity': product.quantity,
-                'article_type': po.get_article_type_display(),
-            })
-    
-    return JsonResponse({'products': data})
+    # Served pre-encoded from the catalog cache; JsonResponse would re-serialize every row
+    return HttpResponse(ProductCatalog.get_products_json(brand, article_type), content_type='application/json')
+
+@login_required
+@user_passes_test(is_operator, login_url='operator_login')
+def search_products_view(request):
+    """AJAX endpoint: one page of products matching the panel's filters and search box"""
+    try:
+        limit = min(int(request.GET.get('limit', CATALOG_PAGE_SIZE)), CATALOG_MAX_PAGE_SIZE)
+        before_id = int(request.GET['before']) if request.GET.get('before') else None
+    except ValueError:
+        return JsonResponse({'error': 'limit and before must be integers'}, status=400)
+    if limit < 1:
+        return JsonResponse({'error': 'limit must be positive'}, status=400)
+    
+    products, next_before = search_products(
+        query=request.GET.get('q', '').strip(),
+        brand=request.GET.get('brand'),
+        article_type=request.GET.get('article_type'),
+        size=request.GET.get('size'),
+        before_id=before_id,
+        limit=limit,
+    )
+    return JsonResponse({'products': products, 'next_before': next_before})
 
 @login_required
 @user_passes_test(is_operator, login_url='operator_login')
@@ -283,6 +299,114 @@ def get_available_sizes(request):
     
     return JsonResponse({'sizes': sizes})
 
+# Seconds a session's bootstrap payload is cached; chart or tolerance changes re-key it at once
+OPERATOR_BOOTSTRAP_CACHE_SECONDS = 300
+
+def build_operator_bootstrap(session_id):
+    """
+    Everything the station needs to measure for one session: the PO, the
+    product, every size chart of the article with tolerances, and the
+    measurement names. Per-size lists follow the order of `codes`.
+    """
+    session = OperatorSession.objects.filter(id=session_id).values(
+        'id', 'started_at',
+        'purchase_order_id', 'purchase_order__po_number', 'purchase_order__brand',
+        'purchase_order__article_type',
+        'product_id', 'product__size', 'product__color', 'product__quantity',
+    ).first()
+    if session is None:
+        return None
+    
+    article_type = session['purchase_order__article_type']
+    po_sizes = Product.objects.filter(purchase_order_id=session['purchase_order_id']).values('size').annotate(
+        quantity=Sum('quantity')
+    ).order_by('size')
+    
+    compiled = get_compiled_charts(article_type)
+    spec = compiled.spec if compiled is not None else None
+    return {
+        'session': {
+            'id': session['id'],
+            'started_at': session['started_at'].isoformat(),
+        },
+        'purchase_order': {
+            'id': session['purchase_order_id'],
+            'po_number': session['purchase_order__po_number'],
+            'brand': session['purchase_order__brand'],
+            'article_type': article_type,
+            'article_type_display': ARTICLE_TYPE_NAMES.get(article_type, article_type),
+            'sizes': {row['size']: row['quantity'] for row in po_sizes},
+        },
+        'product': {
+            'id': session['product_id'],
+            'size': session['product__size'],
+            'color': session['product__color'],
+            'quantity': session['product__quantity'],
+        },
+        'codes': list(spec.codes) if spec else [],
+        'names': [spec.names.get(code, code) for code in spec.codes] if spec else [],
+        'required_codes': sorted(spec.required_codes) if spec else [],
+        'size_charts': {
+            size: {
+                'standard': list(plan.standard_values),
+                'minus': list(plan.tolerances_minus),
+                'plus': list(plan.tolerances_plus),
+            }
+            for size, plan in sorted(compiled.plans.items())
+        } if compiled else {},
+    }
+
+@login_required
+@user_passes_test(is_operator, login_url='operator_login')
+def operator_bootstrap(request):
+    """
+    One-shot payload for the operator station's active session, so it can
+    validate locally instead of making several AJAX round trips. Cached per
+    version: the session and its product, the PO and its products' last
+    change, and the chart/tolerance versions. `version`
+    changes when the station should resync, and If-None-Match with it
+    answers 304.
+    """
+    # Everything the payload is built from, in one query: the session's
+    # product, and when its PO or any of the PO's products changed
+    session = OperatorSession.objects.filter(
+        operator=request.user,
+        status='active'
+    ).values(
+        'id', 'product_id', 'purchase_order__updated_at',
+    ).annotate(
+        product_count=Count('purchase_order__products'),
+        products_updated_at=Max('purchase_order__products__updated_at'),
+    ).order_by().first()
+    if session is None:
+        return JsonResponse({'success': False, 'message': 'No active measurement session'}, status=404)
+    session_id = session['id']
+    
+    data_version = hashlib.sha1('|'.join(str(part) for part in (
+        session['product_id'], session['purchase_order__updated_at'],
+        session['product_count'], session['products_updated_at'],
+        SizeChartRegistry.get_digest(), ToleranceRuleRegistry.get_version(),
+    )).encode('utf-8')).hexdigest()[:20]
+    version = f"{session_id}-{data_version}"
+    etag = f'"{version}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    
+    cache_key = f"operator-bootstrap:{version}"
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = build_operator_bootstrap(session_id)
+        if payload is None:
+            return JsonResponse({'success': False, 'message': 'No active measurement session'}, status=404)
+        payload = {'success': True, 'version': version, **payload}
+        cache.set(cache_key, payload, OPERATOR_BOOTSTRAP_CACHE_SECONDS)
+    
+    response = JsonResponse(payload)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
 @login_required
 @user_passes_test(is_operator, login_url='operator_login')
 @require_http_methods(["POST"])
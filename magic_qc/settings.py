@@ -34,6 +34,16 @@ INSTALLED_APPS = [
 # Custom user model
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
+# Keypad PIN login first, then username/password; both serve request.user from
+# a per-process cache (accounts.backends.UserCache). A save drops the user from
+# the cache of the process that made it; other workers keep serving their copy
+# for up to USER_CACHE_TTL (60 s), so a role change or deactivation can take
+# that long to reach every worker.
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.PinBackend',
+    'accounts.backends.CachedUserBackend',
+]
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = 'bootstrap5'
 CRISPY_TEMPLATE_PACK = 'bootstrap5'
 
@@ -74,9 +84,32 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Seconds a connection waits on a locked database before SQLITE_BUSY
+            'timeout': 5,
+        },
     }
 }
 
+# SQLite pragmas per deployment profile, applied to every connection
+# (measurements.sqlite). Set MAGIC_QC_DB_PROFILE=production on the servers:
+# WAL lets readers run alongside the writer, and with WAL synchronous=NORMAL
+# only fsyncs at checkpoints (results are also fsynced in the audit log).
+# The development default sets nothing, so the checked-in db.sqlite3 keeps
+# its rollback journal; journal_mode=WAL is persisted in the database file.
+SQLITE_PROFILES = {
+    'development': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,  # KiB
+        'temp_store': 'MEMORY',
+        'mmap_size': 67108864,
+    },
+}
+SQLITE_PROFILE = os.environ.get('MAGIC_QC_DB_PROFILE', 'development')
+SQLITE_PRAGMAS = SQLITE_PROFILES[SQLITE_PROFILE]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
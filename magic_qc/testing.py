@@ -0,0 +1,94 @@
+"""
+Test support.
+Configures Django and creates one throwaway test database per run for the
+test suites that need it, whether they run under pytest or from run_tests.py,
+and builds the measurement results those suites save.
+"""
+
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+_test_database = []
+
+
+def setup_django():
+    """Configure Django for tests that need settings."""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'magic_qc.settings')
+    django.setup()
+
+
+def setup_test_database():
+    """
+    Configure Django and create the test database, once per run.
+    Results saved by the tests are audited to a temporary file, not the real log,
+    and reports and charts are rendered into temporary directories, reports
+    only when requested.
+    """
+    setup_django()
+    if not _test_database:
+        from django.db import connection
+        from django.test.utils import setup_test_environment
+        from measurements import analytics_charts, audit, reports
+        setup_test_environment()
+        audit.AUDIT_LOG_PATH = Path(tempfile.mkdtemp()) / 'validation_results.jsonl'
+        reports.REPORT_CACHE_DIR = Path(tempfile.mkdtemp())
+        reports.REPORT_PRERENDER_DELAY = None
+        analytics_charts.CHART_CACHE_DIR = Path(tempfile.mkdtemp())
+        connection.creation.create_test_db(verbosity=0)
+        _test_database.append(connection)
+
+
+def measurement_file(size: str = '8/9', offsets: dict = None) -> bytes:
+    """Contents of a measurement file at the standard values, shifted by offsets {code: cm}."""
+    from measurements.utils import STANDARD_SIZE_CHART_SWEATSHIRT
+    offsets = offsets or {}
+    lines = [f"{code}: {value + offsets.get(code, 0):.1f}"
+             for code, value in STANDARD_SIZE_CHART_SWEATSHIRT[size].items()]
+    return ("\n".join(lines) + "\n").encode('utf-8')
+
+
+def validation_result(size: str = '8/9', offsets: dict = None, operator_id: str = 'op-1') -> dict:
+    """Validation engine result of a garment measured at the standard values plus offsets."""
+    from measurements.utils import MeasurementValidationEngine
+    return MeasurementValidationEngine.validate_bytes(
+        measurement_file(size, offsets), size, operator_id, str(uuid.uuid4())
+    )
+
+
+def save_result_at(session_id: str, size: str, result: dict, operator_id, validated_at, product_id=None):
+    """
+    Save a validation result as if it had been validated at validated_at.
+    The rollups aren't moved with it; call rebuild_rollups() after.
+    """
+    from measurements.models import MeasurementResult, MeasurementValue
+    from measurements.persistence import save_validation_results
+    saved, = save_validation_results([(session_id, size, result, operator_id)], product_id=product_id, audit=False)
+    MeasurementResult.objects.filter(id=saved.id).update(validation_timestamp=validated_at, created_at=validated_at)
+    MeasurementValue.objects.filter(result_id=saved.id).update(timestamp=validated_at)
+    return MeasurementResult.objects.get(id=saved.id)
+
+
+def clear_results():
+    """Delete every saved result and rollup, so a test counts only its own."""
+    from measurements.models import DailyQCCodeRollup, DailyQCRollup, MeasurementSession
+    MeasurementSession.objects.all().delete()
+    DailyQCRollup.objects.all().delete()
+    DailyQCCodeRollup.objects.all().delete()
+
+
+def clear_products():
+    """Delete every PO (and so every product)."""
+    from products.models import PurchaseOrder
+    PurchaseOrder.objects.all().delete()
+
+
+def create_size_chart(article_type: str, size: str, value: float = 10.0):
+    """Save a size chart with every measurement at value."""
+    from products.charts import CHART_FIELDS
+    from products.models import StandardSizeChart
+    return StandardSizeChart.objects.create(
+        article_type=article_type, size=size, **{field: value for _, field in CHART_FIELDS}
+    )
@@ -0,0 +1,195 @@
+"""
+Analytics charts.
+Renders pass-rate trend and per-code failure charts from the daily rollups as
+PNG images on the server, so line tablets download a small image instead of
+charting large JSON payloads themselves. Rendered images are kept in a
+fixed-size LRU cache on disk.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from measurements.models import DailyQCCodeRollup, DailyQCRollup
+from measurements.utils import MEASUREMENT_CODE_ORDER
+
+# Rendered PNGs: <sha1 of chart kind, parameters and data>.png
+CHART_CACHE_DIR = Path(settings.MEDIA_ROOT) / 'charts'
+
+# Images kept on disk; the least recently served are evicted first
+CHART_CACHE_MAX_FILES = 256
+
+CHART_KINDS = ('pass_rate', 'code_failures')
+
+# Days shown when the request doesn't say, and the most it may ask for
+CHART_DEFAULT_DAYS = 14
+CHART_MAX_DAYS = 90
+
+CHART_SIZE_INCHES = (6.4, 3.2)
+CHART_DPI = 100
+
+_evict_lock = threading.Lock()
+
+
+class ChartQuery(NamedTuple):
+    """What a chart shows: its kind, the days it covers and optional filters."""
+    kind: str
+    start_date: date
+    end_date: date
+    article_type: Optional[str] = None
+    size: Optional[str] = None
+
+
+def chart_query(kind: str, days: int, article_type: Optional[str] = None, size: Optional[str] = None) -> ChartQuery:
+    """
+    Build the query of a chart over the last `days` days, today included.
+
+    Raises:
+        ValueError: If the kind is unknown or days is out of range
+    """
+    if kind not in CHART_KINDS:
+        raise ValueError(f"Invalid chart '{kind}'. Valid charts: {', '.join(CHART_KINDS)}")
+    if not 1 <= days <= CHART_MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {CHART_MAX_DAYS}")
+    end_date = timezone.localdate()
+    return ChartQuery(kind, end_date - timedelta(days=days - 1), end_date, article_type or None, size or None)
+
+
+def _filter_rollups(queryset, query: ChartQuery):
+    queryset = queryset.filter(date__range=(query.start_date, query.end_date))
+    if query.article_type:
+        queryset = queryset.filter(article_type=query.article_type)
+    if query.size:
+        queryset = queryset.filter(size=query.size)
+    return queryset
+
+
+def pass_rate_series(query: ChartQuery) -> List[Tuple[str, int, int]]:
+    """[(date, passed, failed)] for every day of the query, zero where nothing was measured."""
+    counts = {
+        day: (passed, failed)
+        for day, passed, failed in _filter_rollups(DailyQCRollup.objects, query)
+        .values_list('date')
+        .annotate(passed=Sum('passed'), failed=Sum('failed'))
+        .order_by('date')
+    }
+    days = (query.end_date - query.start_date).days + 1
+    series = []
+    for offset in range(days):
+        day = query.start_date + timedelta(days=offset)
+        passed, failed = counts.get(day, (0, 0))
+        series.append((day.isoformat(), passed, failed))
+    return series
+
+
+def code_failure_series(query: ChartQuery) -> List[Tuple[str, int]]:
+    """[(code, failures)] in measurement code order, codes without failures left out."""
+    counts = dict(
+        _filter_rollups(DailyQCCodeRollup.objects, query)
+        .values_list('code')
+        .annotate(failures=Sum('failures'))
+        .order_by()
+    )
+    order = {code: index for index, code in enumerate(MEASUREMENT_CODE_ORDER)}
+    return sorted(counts.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+
+
+def chart_data(query: ChartQuery) -> list:
+    """The rollup data a chart is drawn from."""
+    if query.kind == 'pass_rate':
+        return pass_rate_series(query)
+    return code_failure_series(query)
+
+
+def chart_key(query: ChartQuery, data: list) -> str:
+    """Cache key of a chart: changes with its parameters or with the data behind it."""
+    payload = json.dumps([query.kind, query.start_date.isoformat(), query.end_date.isoformat(),
+                          query.article_type, query.size, data])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def render_chart(query: ChartQuery, data: list) -> bytes:
+    """Draw a chart as PNG bytes."""
+    # Figure without pyplot: no global state, safe on request threads
+    figure = Figure(figsize=CHART_SIZE_INCHES, dpi=CHART_DPI)
+    axes = figure.add_subplot()
+
+    if query.kind == 'pass_rate':
+        labels = [day[5:] for day, _, _ in data]  # MM-DD
+        rates = [
+            passed / (passed + failed) * 100 if passed + failed else float('nan')
+            for _, passed, failed in data
+        ]
+        axes.plot(labels, rates, marker='o', color='#16a34a')
+        axes.set_ylim(0, 105)
+        axes.set_ylabel('Pass rate (%)')
+        axes.set_title('QC pass rate')
+        step = max(1, -(-len(labels) // 7))  # at most 7 date labels
+        axes.set_xticks(range(0, len(labels), step), labels[::step])
+    else:
+        codes = [code for code, _ in data]
+        axes.bar(codes, [failures for _, failures in data], color='#dc2626')
+        axes.set_ylabel('Failures')
+        axes.set_title('Failures by measurement code')
+        if not data:
+            axes.text(0.5, 0.5, 'No failures', ha='center', va='center', transform=axes.transAxes)
+
+    axes.grid(axis='y', alpha=0.3)
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+def _evict_charts() -> None:
+    """Drop the least recently served images beyond CHART_CACHE_MAX_FILES."""
+    with _evict_lock:
+        entries = []
+        for path in CHART_CACHE_DIR.glob('*.png'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        if len(entries) <= CHART_CACHE_MAX_FILES:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - CHART_CACHE_MAX_FILES]:
+            path.unlink(missing_ok=True)
+
+
+def get_chart_png(query: ChartQuery, data: list, key: str) -> bytes:
+    """
+    Return the PNG of a chart, from the disk cache when it has this version.
+    `data` and `key` come from chart_data() and chart_key(), so a caller can
+    answer a matching ETag before any image is read or drawn.
+    """
+    path = CHART_CACHE_DIR / f"{key}.png"
+
+    try:
+        png = path.read_bytes()
+        # A hit makes the image the most recently used
+        os.utime(path)
+        return png
+    except FileNotFoundError:
+        pass
+
+    png = render_chart(query, data)
+    CHART_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(png)
+    os.replace(tmp_path, path)
+    _evict_charts()
+    return png
@@ -0,0 +1,23 @@
+from django.apps import AppConfig
+
+
+class MeasurementsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'measurements'
+    verbose_name = 'Measurements'
+
+    def ready(self):
+        from measurements import sqlite  # noqa: F401  (connection pragmas)
+        from measurements.utils import set_size_chart_source, set_tolerance_rule_source
+        from products.charts import SizeChartRegistry
+        from products.tolerances import ToleranceRuleRegistry
+
+        # Validate against the database chart and tolerance rule registries instead of the built-ins
+        set_size_chart_source(
+            loader=SizeChartRegistry.get_charts,
+            version=SizeChartRegistry.get_version,
+        )
+        set_tolerance_rule_source(
+            loader=ToleranceRuleRegistry.get_rules,
+            version=ToleranceRuleRegistry.get_version,
+        )
@@ -0,0 +1,200 @@
+"""
+Validation audit log.
+Every validation outcome that is saved is also appended to a JSONL file by a
+background writer thread. Records are written in groups and fsynced once per
+group, so the request path only queues them. A result that never reached the
+database can be re-ingested from the log with `manage.py replay_audit_log`.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from measurements.background import next_group
+from measurements.utils import DEFAULT_ARTICLE_TYPE
+
+# One JSON record per line, appended only
+AUDIT_LOG_PATH = Path(settings.BASE_DIR) / 'audit' / 'validation_results.jsonl'
+
+# A group is written and fsynced once it holds this many records, or once its
+# first record has waited this many seconds
+AUDIT_GROUP_RECORDS = 500
+AUDIT_GROUP_INTERVAL = 0.05
+
+# Records queued before writers block; only reached if the disk stalls
+AUDIT_QUEUE_MAX = 50000
+
+# Seconds a failed write waits before the group is retried
+AUDIT_RETRY_DELAY = 1.0
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def record_hash(record: Dict) -> str:
+    """sha256 of a record's canonical JSON, its 'hash' field left out."""
+    payload = {key: value for key, value in record.items() if key != 'hash'}
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def build_audit_record(
+    session_id: str,
+    size: str,
+    validation_result: Dict,
+    operator_id: Optional[str],
+    product_id: Optional[int] = None
+) -> Dict:
+    """
+    An audit record holding everything needed to save the result again.
+    Its 'hash' is added by the writer thread, off the request path.
+    """
+    return {
+        'session_id': session_id,
+        'operator_id': operator_id,
+        'size': size,
+        'article_type': validation_result.get('article_type', DEFAULT_ARTICLE_TYPE),
+        'product_id': product_id,
+        'passed': bool(validation_result.get('success', False)),
+        'recorded_at': timezone.now().isoformat(),
+        'measurements': validation_result.get('measurements', []),
+    }
+
+
+def encode_audit_record(record: Dict) -> bytes:
+    """The record's log line, with its content hash."""
+    record = {**record, 'hash': record_hash(record)}
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class AuditLogWriter:
+    """
+    Group-commit appender: one thread drains the queue, writes each group of
+    records with a single write and makes it durable with a single fsync.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or AUDIT_LOG_PATH)
+        self._queue = queue.Queue(maxsize=AUDIT_QUEUE_MAX)
+        self._thread = threading.Thread(target=self._run, name='measurements-audit', daemon=True)
+        self._thread.start()
+
+    def append(self, record: Dict) -> None:
+        """Queue a record; it is on disk within AUDIT_GROUP_INTERVAL."""
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every record queued so far is fsynced.
+
+        Returns:
+            bool: False if the timeout ran out first
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write out everything queued, then stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _write(self, lines: list) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            offset = os.lseek(fd, 0, os.SEEK_END)
+            try:
+                data = memoryview(b''.join(lines))
+                while data:
+                    data = data[os.write(fd, data):]
+                os.fsync(fd)
+            except OSError:
+                # Cut off what made it to disk, so the retry doesn't append it twice
+                os.ftruncate(fd, offset)
+                raise
+        finally:
+            os.close(fd)
+
+    def _run(self) -> None:
+        pending = []
+        while True:
+            group = next_group(self._queue, AUDIT_GROUP_RECORDS, AUDIT_GROUP_INTERVAL, _STOP)
+            waiters = []
+            stop = False
+            for item in group:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    pending.append(encode_audit_record(item))
+
+            # Failed groups stay pending and are retried with the next one
+            while pending:
+                try:
+                    self._write(pending)
+                    pending = []
+                except OSError:
+                    logger.exception("Audit log write error (%d records pending)", len(pending))
+                    if stop:
+                        break
+                    time.sleep(AUDIT_RETRY_DELAY)
+
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Return the process's audit log writer, starting it on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = AuditLogWriter()
+            # Records still queued at a graceful exit are written, not dropped
+            atexit.register(_writer.close)
+        return _writer
+
+
+def audit_results(entries: Iterable, product_id: Optional[int] = None) -> None:
+    """Queue an audit record per (session_id, size, validation_result, operator_id) entry."""
+    writer = get_audit_writer()
+    for session_id, size, validation_result, operator_id in entries:
+        writer.append(build_audit_record(session_id, size, validation_result, operator_id, product_id))
+
+
+def iter_audit_records(path: Optional[Path] = None) -> Iterator[Dict]:
+    """
+    Read back the log, skipping lines that don't parse or whose hash doesn't
+    match (such as a line cut short by a crash).
+    """
+    try:
+        f = open(path or AUDIT_LOG_PATH, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get('hash') == record_hash(record):
+                yield record
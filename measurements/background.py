@@ -0,0 +1,73 @@
+"""
+Background work for request handlers.
+Runs follow-up work, such as building and saving full audit reports, on a
+small thread pool so the request can answer first, and gathers queued items
+into groups for the single-thread writers (audit log, write-behind buffer).
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.db import connections
+
+# Threads in the shared background pool
+BACKGROUND_WORKERS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def get_background_executor() -> ThreadPoolExecutor:
+    """Return the shared background thread pool, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=BACKGROUND_WORKERS,
+                thread_name_prefix='measurements-background',
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task error in %s", getattr(func, '__name__', func))
+        raise
+    finally:
+        # Connections are per thread; don't leave this worker's open between tasks
+        connections.close_all()
+
+
+def submit_background(func, *args, **kwargs) -> Future:
+    """Run func(*args, **kwargs) on the background pool."""
+    return submit_to(get_background_executor(), func, *args, **kwargs)
+
+
+def submit_to(executor: ThreadPoolExecutor, func, *args, **kwargs) -> Future:
+    """Run func(*args, **kwargs) on a dedicated executor, as background pool tasks run."""
+    return executor.submit(_run, func, args, kwargs)
+
+
+def next_group(items: queue.Queue, max_items: int, interval: float, stop=None) -> list:
+    """
+    Block for one item, then gather more until the group holds max_items,
+    `interval` seconds have passed since the first, or `stop` is taken.
+    """
+    group = [items.get()]
+    deadline = time.monotonic() + interval
+    while len(group) < max_items and group[-1] is not stop:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            group.append(items.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return group
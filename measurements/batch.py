@@ -0,0 +1,217 @@
+"""
+Batch validation of measurement files.
+Reads .txt measurement files from ZIP archives or multipart uploads without
+extracting them to disk, and validates them across a process pool.
+"""
+
+import multiprocessing
+import os
+import threading
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from measurements.utils import (
+    ARTICLE_SPECS,
+    DEFAULT_ARTICLE_TYPE,
+    MeasurementValidationEngine,
+    get_compiled_charts,
+    get_size_chart_version,
+    get_tolerance_rule_version,
+    set_size_chart_source,
+    set_tolerance_rule_source,
+)
+
+# Limits per batch request
+BATCH_MAX_FILES = 2000
+BATCH_LIMIT_ERROR = 'Batch limit of {} files reached; this and the remaining files were not validated'
+
+# Raised reading a ZIP member: encrypted, unsupported compression, bad CRC or corrupt data
+ZIP_MEMBER_ERRORS = (RuntimeError, NotImplementedError, zipfile.BadZipFile, zlib.error, EOFError)
+BATCH_MAX_FILE_SIZE = 256 * 1024  # bytes per measurement file
+
+# Worker processes in the shared validation pool
+BATCH_WORKERS = os.cpu_count() or 1
+
+# Below this many files the pool's IPC costs more than it saves
+BATCH_PARALLEL_MIN_FILES = 16
+
+_executor = None
+_executor_chart_version = None
+_executor_lock = threading.Lock()
+
+
+def _install_size_charts(
+    charts: Dict[str, Dict[str, Dict[str, float]]],
+    tolerance_rules: Dict[str, Dict],
+    tolerance_rule_version: Optional[str]
+) -> None:
+    """Pool initializer: validate against the charts and tolerances the web process uses."""
+    set_size_chart_source(lambda article_type: charts.get(article_type, {}))
+    if tolerance_rule_version is not None:
+        set_tolerance_rule_source(
+            lambda article_type: tolerance_rules.get(article_type, {}),
+            lambda: tolerance_rule_version,
+        )
+
+
+def _size_chart_snapshot(tolerance_rule_version: Optional[str]) -> Tuple:
+    """Charts and tolerance rules of every article, as plain data for the pool initializer."""
+    charts, tolerance_rules = {}, {}
+    for article_type in ARTICLE_SPECS:
+        compiled = get_compiled_charts(article_type)
+        charts[article_type] = compiled.charts
+        # Rules as compiled: (size, code) -> (minus, plus) for every code of every size
+        tolerance_rules[article_type] = {
+            (size, code): (minus, plus)
+            for size, plan in compiled.plans.items()
+            for code, minus, plus in zip(plan.codes, plan.tolerances_minus, plan.tolerances_plus)
+        }
+    return charts, tolerance_rules, tolerance_rule_version
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared validation process pool, starting it on first use."""
+    global _executor, _executor_chart_version
+    chart_version = (get_size_chart_version(), get_tolerance_rule_version())
+    with _executor_lock:
+        # Workers hold a snapshot of the size charts and tolerances; restart them when either changes
+        if _executor is not None and _executor_chart_version != chart_version:
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _executor is None:
+            # spawn: workers only import measurements.utils, never a forked copy
+            # of the web server's threads and DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_install_size_charts,
+                initargs=_size_chart_snapshot(chart_version[1]),
+            )
+            _executor_chart_version = chart_version
+        return _executor
+
+
+def _reset_executor() -> None:
+    """Drop a broken pool so the next batch starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def iter_measurement_files(uploaded_files: Iterable) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Yield (file_name, contents, error) for every measurement file in the upload.
+
+    ZIP archives are read member by member straight from the uploaded file
+    (in memory or spooled), nothing is extracted to disk. Entries that are
+    not .txt files, are too large or can't be read are yielded with an error
+    instead of contents. Past BATCH_MAX_FILES one last entry names the
+    truncation and the rest of the upload is skipped.
+    """
+    count = 0
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name.lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(uploaded_file)
+            except zipfile.BadZipFile:
+                yield uploaded_file.name, None, 'Not a valid ZIP archive'
+                continue
+
+            with archive:
+                for info in archive.infolist():
+                    base_name = os.path.basename(info.filename)
+                    # Skip directories and OS metadata (__MACOSX/, ._files)
+                    if info.is_dir() or not base_name or base_name.startswith('.') or info.filename.startswith('__MACOSX/'):
+                        continue
+                    count += 1
+                    if count > BATCH_MAX_FILES:
+                        yield info.filename, None, BATCH_LIMIT_ERROR.format(BATCH_MAX_FILES)
+                        return
+                    if not base_name.lower().endswith('.txt'):
+                        yield info.filename, None, 'Only .txt files are supported'
+                    elif info.file_size > BATCH_MAX_FILE_SIZE:
+                        yield info.filename, None, f'File exceeds {BATCH_MAX_FILE_SIZE} bytes'
+                    else:
+                        try:
+                            with archive.open(info) as member:
+                                data = member.read(BATCH_MAX_FILE_SIZE + 1)
+                        except ZIP_MEMBER_ERRORS as e:
+                            yield info.filename, None, f'Cannot read file from archive: {e}'
+                            continue
+                        if len(data) > BATCH_MAX_FILE_SIZE:
+                            yield info.filename, None, f'File exceeds {BATCH_MAX_FILE_SIZE} bytes'
+                        else:
+                            yield info.filename, data, None
+            continue
+
+        count += 1
+        if count > BATCH_MAX_FILES:
+            yield uploaded_file.name, None, BATCH_LIMIT_ERROR.format(BATCH_MAX_FILES)
+            return
+        if not uploaded_file.name.lower().endswith('.txt'):
+            yield uploaded_file.name, None, 'Only .txt and .zip files are supported'
+        elif uploaded_file.size > BATCH_MAX_FILE_SIZE:
+            yield uploaded_file.name, None, f'File exceeds {BATCH_MAX_FILE_SIZE} bytes'
+        else:
+            yield uploaded_file.name, uploaded_file.read(), None
+
+
+def validate_measurement_files(
+    files: Iterable[Tuple[str, Optional[bytes], Optional[str]]],
+    size: str,
+    operator_id: Optional[str] = None,
+    article_type: str = DEFAULT_ARTICLE_TYPE
+) -> List[Dict]:
+    """
+    Validate every readable file, in parallel when the batch is large enough.
+
+    Returns:
+        List[Dict]: One outcome per file with file_name, session_id, error and
+        validation_result (None when the file could not be read)
+    """
+    outcomes = []
+    for file_name, data, error in files:
+        outcomes.append({
+            'file_name': file_name,
+            'session_id': str(uuid.uuid4()) if error is None else None,
+            'data': data,
+            'error': error,
+            'validation_result': None,
+        })
+
+    pending = [outcome for outcome in outcomes if outcome['error'] is None]
+    datas = [outcome['data'] for outcome in pending]
+    session_ids = [outcome['session_id'] for outcome in pending]
+    sizes = [size] * len(pending)
+    operators = [operator_id] * len(pending)
+    article_types = [article_type] * len(pending)
+
+    results = None
+    if len(pending) >= BATCH_PARALLEL_MIN_FILES:
+        try:
+            results = list(get_executor().map(
+                MeasurementValidationEngine.validate_bytes,
+                datas, sizes, operators, session_ids, article_types,
+                chunksize=max(1, len(pending) // (BATCH_WORKERS * 4)),
+            ))
+        except BrokenProcessPool:
+            _reset_executor()
+
+    if results is None:
+        results = list(map(
+            MeasurementValidationEngine.validate_bytes, datas, sizes, operators, session_ids, article_types
+        ))
+
+    for outcome, validation_result in zip(pending, results):
+        outcome['validation_result'] = validation_result
+
+    for outcome in outcomes:
+        del outcome['data']
+
+    return outcomes
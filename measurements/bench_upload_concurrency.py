@@ -0,0 +1,120 @@
+"""
+Concurrency benchmark for the upload save path.
+Drives BENCH_THREADS threads of uploads (validation, then persistence) against
+a throwaway SQLite file, once as uploads were saved before (rollback journal,
+one transaction per upload on the request thread) and once with the
+production profile (WAL pragmas, single write-behind writer), and reports
+throughput and error counts; run with `python run_benchmarks.py --concurrency`.
+"""
+
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import override_settings
+
+from measurements import audit
+from measurements.bench_validation_engine import make_measurement_file
+from measurements.models import MeasurementResult
+from measurements.persistence import save_validation_results
+from measurements.utils import MeasurementValidationEngine
+from measurements.write_behind import get_result_buffer
+
+BENCH_THREADS = 32
+BENCH_UPLOADS_PER_THREAD = 50
+
+
+@contextmanager
+def benchmark_database(path: Path, pragmas: dict):
+    """A migrated SQLite database at path, opened with the given pragmas."""
+    connection = connections['default']
+    connection.settings_dict['TEST']['NAME'] = str(path)
+    with override_settings(SQLITE_PRAGMAS=pragmas):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def direct_save(entries):
+    """The save step as it was: one transaction per upload, on the request thread."""
+    save_validation_results(entries)
+
+
+def write_behind_save(entries):
+    """The save step now: queued for the single writer thread."""
+    get_result_buffer().submit(entries)
+
+
+def drive_uploads(save, threads: int, uploads_per_thread: int) -> dict:
+    """Run uploads from many threads at once; time until every result is committed."""
+    data = make_measurement_file('8/9')
+    errors = []
+    errors_lock = threading.Lock()
+    start_barrier = threading.Barrier(threads + 1)
+
+    def station():
+        start_barrier.wait()
+        try:
+            for _ in range(uploads_per_thread):
+                session_id = str(uuid.uuid4())
+                try:
+                    validation_result = MeasurementValidationEngine.validate_bytes(data, '8/9', 'bench', session_id)
+                    save([(session_id, '8/9', validation_result, 'bench')])
+                except Exception as e:
+                    with errors_lock:
+                        errors.append(str(e))
+        finally:
+            connections.close_all()
+
+    workers = [threading.Thread(target=station) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    get_result_buffer().flush()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'elapsed': elapsed,
+        'saved': MeasurementResult.objects.count(),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+    }
+
+
+def report_run(label: str, run: dict, attempted: int) -> None:
+    print(f"  {label}")
+    print(f"    saved:      {run['saved']:6d} / {attempted}")
+    print(f"    errors:     {run['errors']:6d}" + (f"  ({run['first_error']})" if run['first_error'] else ''))
+    print(f"    throughput: {run['saved'] / run['elapsed']:9.1f} results/s")
+
+
+def run_upload_concurrency_benchmark(threads: int = BENCH_THREADS, uploads_per_thread: int = BENCH_UPLOADS_PER_THREAD):
+    """Before/after comparison of concurrent uploads."""
+    print("\n" + "="*70)
+    print(f"BENCH: Upload saves - {threads} threads x {uploads_per_thread} uploads on SQLite")
+    print("="*70)
+
+    attempted = threads * uploads_per_thread
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep benchmark results out of the real audit log (and out of its replays)
+        audit.AUDIT_LOG_PATH = Path(tmp) / 'audit.jsonl'
+
+        with benchmark_database(Path(tmp) / 'before.sqlite3', {}):
+            before = drive_uploads(direct_save, threads, uploads_per_thread)
+        with benchmark_database(Path(tmp) / 'after.sqlite3', settings.SQLITE_PROFILES['production']):
+            after = drive_uploads(write_behind_save, threads, uploads_per_thread)
+            get_result_buffer().close()
+        audit.get_audit_writer().close()
+
+    report_run("before: rollback journal, transaction per upload", before, attempted)
+    report_run("after:  WAL profile, single write-behind writer", after, attempted)
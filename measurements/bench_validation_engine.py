@@ -0,0 +1,267 @@
+"""
+Benchmarks for the measurement validation engine.
+Compares hot paths of the upload workflow; run with run_benchmarks.py.
+"""
+
+import io
+import os
+import tempfile
+import time
+import numpy as np
+from datetime import datetime
+from measurements.utils import (
+    ALL_VALID_CODES,
+    DEFAULT_TOLERANCE,
+    MeasurementFileParser,
+    MeasurementValidationEngine,
+    MeasurementValidator,
+    MEASUREMENT_NAMES,
+    OPTIONAL_MEASUREMENT_CODES,
+    REQUIRED_MEASUREMENT_CODES,
+    STANDARD_SIZE_CHART_SWEATSHIRT,
+    TOLERANCE_RULES,
+)
+
+
+def make_measurement_file(size: str = '8/9') -> bytes:
+    """Build the contents of a complete measurement file for a size."""
+    lines = [f"# Measurement file for size {size}"]
+    for code, value in STANDARD_SIZE_CHART_SWEATSHIRT[size].items():
+        lines.append(f"{code}: {value}")
+    return ("\n".join(lines) + "\n").encode('utf-8')
+
+
+def time_per_call(func, iterations: int) -> float:
+    """Return the mean wall time of func() in microseconds."""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def report(label: str, baseline_us: float, candidate_us: float) -> None:
+    """Print a baseline/candidate comparison line."""
+    print(f"  {label}")
+    print(f"    before: {baseline_us:9.1f} us/call")
+    print(f"    after:  {candidate_us:9.1f} us/call  ({baseline_us / candidate_us:.2f}x)")
+
+
+def bench_upload_parsing(iterations: int = 2000):
+    """Temp-file upload path vs. parsing the UploadedFile in place."""
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    print("\n" + "="*70)
+    print("BENCH 1: Upload parsing - temp file vs. in-memory stream")
+    print("="*70)
+
+    data = make_measurement_file('8/9')
+    uploaded_file = SimpleUploadedFile('garment.txt', data, content_type='text/plain')
+
+    def temp_file_path():
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as tmp_file:
+            for chunk in uploaded_file.chunks():
+                tmp_file.write(chunk)
+            temp_file_path = tmp_file.name
+        try:
+            return MeasurementValidationEngine.validate_file(temp_file_path, '8/9')
+        finally:
+            os.unlink(temp_file_path)
+
+    def stream_path():
+        return MeasurementValidationEngine.validate_stream(uploaded_file, '8/9')
+
+    before, after = temp_file_path(), stream_path()
+    assert before['measurements'] == after['measurements']
+    assert before['parse_errors'] == after['parse_errors']
+
+    report(
+        "upload -> validation result",
+        time_per_call(temp_file_path, iterations),
+        time_per_call(stream_path, iterations),
+    )
+
+
+def bench_parser_fast_path(iterations: int = 5000):
+    """General matcher on every line vs. detected-format fast path."""
+    print("\n" + "="*70)
+    print("BENCH 2: Parser - general matcher vs. format fast path")
+    print("="*70)
+
+    data = make_measurement_file('8/9')
+
+    def general_only():
+        measured_values, errors = {}, []
+        for line_num, line in enumerate(io.StringIO(data.decode('utf-8'), newline=None), 1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                MeasurementFileParser._parse_line_general(line, line_num, measured_values, errors)
+        return measured_values, errors
+
+    def fast_path():
+        return MeasurementFileParser.parse_bytes(data)
+
+    assert general_only() == fast_path()
+
+    report(
+        "parse 21-line file",
+        time_per_call(general_only, iterations),
+        time_per_call(fast_path, iterations),
+    )
+
+
+def bench_batch_validation(garments: int = 5000, iterations: int = 5):
+    """Per-garment validate_measurements loop vs. one validate_batch call."""
+    print("\n" + "="*70)
+    print(f"BENCH 3: Validation - {garments} garments, per-garment vs. batch")
+    print("="*70)
+
+    rng = np.random.default_rng(0)
+    sizes = list(STANDARD_SIZE_CHART_SWEATSHIRT)
+    row_sizes = [sizes[i] for i in rng.integers(0, len(sizes), garments)]
+    rows = [
+        {
+            code: round(value + float(rng.uniform(-1.2, 1.2)), 1)
+            for code, value in STANDARD_SIZE_CHART_SWEATSHIRT[size].items()
+        }
+        for size in row_sizes
+    ]
+    matrix = MeasurementValidator.to_batch_matrix(rows)
+
+    def per_garment():
+        return [
+            MeasurementValidator.validate_measurements(measured, size)["success"]
+            for measured, size in zip(rows, row_sizes)
+        ]
+
+    def batch():
+        return MeasurementValidator.validate_batch(matrix, row_sizes)["passed"]
+
+    assert per_garment() == batch().tolist()
+
+    report(
+        f"{garments} garments (per batch)",
+        time_per_call(per_garment, iterations),
+        time_per_call(batch, iterations),
+    )
+
+
+def rebuilt_names():
+    """Names dict rebuilt on every lookup, as get_measurement_name used to."""
+    return dict(MEASUREMENT_NAMES)
+
+
+def validate_without_plan(measured_values, size):
+    """Per-call derivation used before compiled plans (reference for BENCH 4)."""
+    result = {
+        "success": False, "size": size, "timestamp": datetime.now().isoformat(),
+        "operator_id": None, "session_id": None, "measurements": [],
+        "overall_result": "FAIL", "error_messages": [],
+        "summary": {
+            "total_measurements": 0, "passed_measurements": 0, "failed_measurements": 0,
+            "tolerance_default": DEFAULT_TOLERANCE, "tolerance_special": TOLERANCE_RULES,
+        },
+    }
+    standard_values = STANDARD_SIZE_CHART_SWEATSHIRT[size]
+    if REQUIRED_MEASUREMENT_CODES - set(measured_values.keys()):
+        return result
+    if set(measured_values.keys()) - ALL_VALID_CODES:
+        return result
+    overall_pass = True
+    for code in sorted(REQUIRED_MEASUREMENT_CODES | OPTIONAL_MEASUREMENT_CODES):
+        if code not in measured_values:
+            continue
+        measured_value = measured_values[code]
+        standard_value = standard_values.get(code)
+        deviation = abs(measured_value - standard_value)
+        tolerance = MeasurementValidator.get_tolerance(code)
+        measurement_pass = deviation <= tolerance
+        if not measurement_pass:
+            overall_pass = False
+        result["measurements"].append({
+            "code": code,
+            "measurement_name": rebuilt_names().get(code, code),
+            "measured_value": measured_value,
+            "standard_value": standard_value,
+            "deviation": round(deviation, 2),
+            "tolerance": tolerance,
+            "status": "PASS" if measurement_pass else "FAIL",
+        })
+        result["summary"]["total_measurements"] += 1
+        if measurement_pass:
+            result["summary"]["passed_measurements"] += 1
+        else:
+            result["summary"]["failed_measurements"] += 1
+    result["overall_result"] = "PASS" if overall_pass else "FAIL"
+    result["success"] = overall_pass
+    return result
+
+
+def bench_compiled_plans(iterations: int = 20000):
+    """Per-call derivation of static data vs. compiled per-size plans."""
+    print("\n" + "="*70)
+    print("BENCH 4: Validation - per-call derivation vs. compiled plan")
+    print("="*70)
+
+    measured = dict(STANDARD_SIZE_CHART_SWEATSHIRT['8/9'])
+    measured['B'] += 1.5
+
+    def without_plan():
+        return validate_without_plan(measured, '8/9')
+
+    def with_plan():
+        return MeasurementValidator.validate_measurements(measured, '8/9')
+
+    assert [
+        (m['code'], m['deviation'], m['status']) for m in without_plan()['measurements']
+    ] == [
+        (m['code'], m['deviation'], m['status']) for m in with_plan()['measurements']
+    ]
+
+    report(
+        "validate_measurements (one garment)",
+        time_per_call(without_plan, iterations),
+        time_per_call(with_plan, iterations),
+    )
+
+
+def bench_gate_mode(iterations: int = 5000):
+    """Full report vs. fail-fast gate verdict for a failing garment."""
+    print("\n" + "="*70)
+    print("BENCH 5: Upload verdict - full report vs. gate mode")
+    print("="*70)
+    
+    measured = dict(STANDARD_SIZE_CHART_SWEATSHIRT['8/9'])
+    measured['B'] += 1.5
+    data = ("\n".join(f"{code}: {value}" for code, value in measured.items()) + "\n").encode('utf-8')
+    
+    def full():
+        return MeasurementValidationEngine.validate_bytes(data, '8/9')
+    
+    def gate():
+        return MeasurementValidationEngine.validate_bytes(data, '8/9', mode='gate')
+    
+    assert full()['success'] == gate()['success']
+    
+    report(
+        "file -> PASS/FAIL (fails on B)",
+        time_per_call(full, iterations),
+        time_per_call(gate, iterations),
+    )
+
+
+def run_all_benchmarks():
+    """Run all benchmarks."""
+    print("\n" + "█"*70)
+    print("█ MEASUREMENT VALIDATION ENGINE - BENCHMARKS")
+    print("█"*70)
+
+    bench_upload_parsing()
+    bench_parser_fast_path()
+    bench_batch_validation()
+    bench_compiled_plans()
+    bench_gate_mode()
+
+
+if __name__ == '__main__':
+    run_all_benchmarks()
@@ -0,0 +1,10 @@
+# management/commands/rebuild_qc_rollups.py
+from django.core.management.base import BaseCommand
+from measurements.rollups import rebuild_rollups
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily QC rollups from the saved measurement results'
+    
+    def handle(self, *args, **options):
+        count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} daily QC rollup rows'))
@@ -0,0 +1,86 @@
+# management/commands/replay_audit_log.py
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from measurements.audit import AUDIT_LOG_PATH, iter_audit_records
+from measurements.models import MeasurementSession, MeasurementResult, MeasurementValue
+from measurements.persistence import save_validation_results
+from measurements.rollups import rebuild_rollups
+from products.models import Product
+
+# Audit records checked against the database per query
+REPLAY_BATCH_SIZE = 500
+
+class Command(BaseCommand):
+    help = 'Re-ingest validation results that are in the audit log but missing from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help=f'Audit log file to replay (default: {AUDIT_LOG_PATH})')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the missing results')
+
+    def handle(self, *args, **options):
+        records = iter_audit_records(options['path'])
+        seen = set()
+        checked = missing = 0
+
+        while True:
+            chunk = list(islice(records, REPLAY_BATCH_SIZE))
+            if not chunk:
+                break
+            # A session logged twice is saved once, from its first record
+            by_session = {}
+            for record in chunk:
+                if record['session_id'] not in seen:
+                    by_session.setdefault(record['session_id'], record)
+            batch = list(by_session.values())
+            checked += len(batch)
+            seen.update(by_session)
+
+            # Sessions and results are saved together, so a known session means a saved result
+            existing = set(MeasurementSession.objects.filter(
+                session_id__in=[r['session_id'] for r in batch]
+            ).values_list('session_id', flat=True))
+            batch = [r for r in batch if r['session_id'] not in existing]
+            missing += len(batch)
+            if batch and not options['dry_run']:
+                self.replay(batch)
+
+        if missing and not options['dry_run']:
+            rebuild_rollups()
+
+        verb = 'missing' if options['dry_run'] else 'replayed'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} audit records: {missing} {verb}'
+        ))
+
+    def replay(self, records):
+        """Save records, keeping the time they were originally validated"""
+        # Results of products deleted since are kept, unlinked
+        products = set(Product.objects.filter(
+            id__in={r['product_id'] for r in records if r['product_id']}
+        ).values_list('id', flat=True))
+        by_product = defaultdict(list)
+        for record in records:
+            by_product[record['product_id'] if record['product_id'] in products else None].append(record)
+
+        with transaction.atomic():
+            for product_id, product_records in by_product.items():
+                results = save_validation_results([
+                    (r['session_id'], r['size'], {
+                        'measurements': r['measurements'],
+                        'article_type': r['article_type'],
+                        'success': r['passed'],
+                    }, r['operator_id'])
+                    for r in product_records
+                ], product_id=product_id, audit=False)
+
+                # auto_now_add stamped them with the current time
+                for result, record in zip(results, product_records):
+                    validated_at = datetime.fromisoformat(record['recorded_at'])
+                    MeasurementResult.objects.filter(id=result.id).update(
+                        validation_timestamp=validated_at, created_at=validated_at
+                    )
+                    MeasurementValue.objects.filter(result_id=result.id).update(timestamp=validated_at)
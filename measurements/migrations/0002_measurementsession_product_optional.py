@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('measurements', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='measurementsession',
+            name='product',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='products.product'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0002_measurementsession_product_optional'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeasurementValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.CharField(max_length=20)),
+                ('code', models.CharField(max_length=30)),
+                ('measured_value', models.FloatField()),
+                ('standard_value', models.FloatField(blank=True, null=True)),
+                ('deviation', models.FloatField()),
+                ('tolerance', models.FloatField()),
+                ('passed', models.BooleanField()),
+                ('timestamp', models.DateTimeField()),
+                ('result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='values', to='measurements.measurementresult')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['size', 'code', 'timestamp'], name='measurement_size_924bcd_idx'), models.Index(fields=['passed', 'timestamp'], name='measurement_passed_c25a44_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:44
+
+from django.db import migrations
+
+# Results read (and their values inserted) per batch
+BACKFILL_BATCH_SIZE = 500
+
+
+def measurement_values(MeasurementValue, result_id, size, details, timestamp):
+    """Build MeasurementValue rows from a result's measurement_details JSON."""
+    if not isinstance(details, list):
+        return
+    for detail in details:
+        if not isinstance(detail, dict) or detail.get('code') is None or detail.get('measured_value') is None:
+            continue
+        measured_value = float(detail['measured_value'])
+        standard_value = detail.get('standard_value')
+        standard_value = float(standard_value) if standard_value is not None else None
+        deviation = detail.get('deviation')
+        if deviation is None:
+            if standard_value is None:
+                continue
+            deviation = round(abs(measured_value - standard_value), 2)
+        yield MeasurementValue(
+            result_id=result_id,
+            size=size,
+            code=detail['code'],
+            measured_value=measured_value,
+            standard_value=standard_value,
+            deviation=float(deviation),
+            tolerance=float(detail.get('tolerance', 1.0)),
+            passed=detail.get('status') == 'PASS',
+            timestamp=timestamp,
+        )
+
+
+def backfill_measurement_values(apps, schema_editor):
+    MeasurementResult = apps.get_model('measurements', 'MeasurementResult')
+    MeasurementValue = apps.get_model('measurements', 'MeasurementValue')
+
+    last_id = 0
+    while True:
+        batch = list(
+            MeasurementResult.objects.filter(id__gt=last_id).order_by('id').values_list(
+                'id', 'size', 'measurement_details', 'validation_timestamp'
+            )[:BACKFILL_BATCH_SIZE]
+        )
+        if not batch:
+            return
+        last_id = batch[-1][0]
+
+        done = set(MeasurementValue.objects.filter(
+            result_id__in=[result_id for result_id, _, _, _ in batch]
+        ).values_list('result_id', flat=True).distinct())
+
+        values = []
+        for result_id, size, details, timestamp in batch:
+            if result_id not in done:
+                values.extend(measurement_values(MeasurementValue, result_id, size, details, timestamp))
+        MeasurementValue.objects.bulk_create(values, batch_size=BACKFILL_BATCH_SIZE)
+
+
+def remove_measurement_values(apps, schema_editor):
+    apps.get_model('measurements', 'MeasurementValue').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0003_measurementvalue'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_measurement_values, remove_measurement_values),
+    ]
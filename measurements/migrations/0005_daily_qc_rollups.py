@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+def build_rollups(apps, schema_editor):
+    """Count the results saved before the rollups existed."""
+    from measurements.rollups import rebuild_rollups
+    rebuild_rollups(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0004_backfill_measurementvalue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measurementresult',
+            name='article_type',
+            field=models.CharField(default='sweat_shirt', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='DailyQCRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('size', models.CharField(max_length=20)),
+                ('article_type', models.CharField(max_length=20)),
+                ('operator_id', models.CharField(blank=True, default='', max_length=100)),
+                ('passed', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('date', 'size', 'article_type', 'operator_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyQCCodeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('size', models.CharField(max_length=20)),
+                ('article_type', models.CharField(max_length=20)),
+                ('operator_id', models.CharField(blank=True, default='', max_length=100)),
+                ('code', models.CharField(max_length=30)),
+                ('failures', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('date', 'size', 'article_type', 'operator_id', 'code')},
+            },
+        ),
+        # The tables are dropped when migrating back, so there is nothing to undo
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
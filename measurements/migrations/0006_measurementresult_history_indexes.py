@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0005_daily_qc_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='measurementresult',
+            index=models.Index(fields=['created_at', 'id'], name='measurement_created_a886f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='measurementresult',
+            index=models.Index(fields=['size', 'created_at', 'id'], name='measurement_size_70d362_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='measurementresult',
+            index=models.Index(fields=['operator_id', 'created_at', 'id'], name='measurement_operato_5f32b7_idx'),
+        ),
+    ]
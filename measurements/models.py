@@ -9,7 +9,7 @@ class MeasurementSession(models.Model):
         ('failed', 'Failed'),
     ]
     
-    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, null=True, blank=True)
     session_id = models.CharField(max_length=100, unique=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -55,6 +55,7 @@ class MeasurementResult(models.Model):
     """Stores validated measurement results"""
     session = models.OneToOneField(MeasurementSession, on_delete=models.CASCADE, related_name='measurement_result')
     size = models.CharField(max_length=20, default='UNKNOWN')
+    article_type = models.CharField(max_length=20, default='sweat_shirt')
     measured_values = models.JSONField(default=dict)  # Store all measured values
     standard_values = models.JSONField(default=dict)  # Store standard values for comparison
     deviations = models.JSONField(default=dict)  # Store per-measurement deviations
@@ -70,7 +71,74 @@ class MeasurementResult(models.Model):
         indexes = [
             models.Index(fields=['passed']),
             models.Index(fields=['validation_timestamp']),
+            # Keyset pagination of the history API walks (created_at, id)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['size', 'created_at', 'id']),
+            models.Index(fields=['operator_id', 'created_at', 'id']),
         ]
     
     def __str__(self):
-        return f"Measurement Result - {self.size} - {'PASS' if self.passed else 'FAIL'}"
\ No newline at end of file
+        return f"Measurement Result - {self.size} - {'PASS' if self.passed else 'FAIL'}"
+
+class MeasurementValue(models.Model):
+    """
+    One measured code of a MeasurementResult, normalized for analytics.
+    size and timestamp are copied from the result so QC queries filter and
+    aggregate on this table alone.
+    """
+    result = models.ForeignKey(MeasurementResult, on_delete=models.CASCADE, related_name='values')
+    size = models.CharField(max_length=20)
+    code = models.CharField(max_length=30)
+    measured_value = models.FloatField()
+    standard_value = models.FloatField(null=True, blank=True)
+    deviation = models.FloatField()
+    tolerance = models.FloatField()
+    passed = models.BooleanField()
+    timestamp = models.DateTimeField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['size', 'code', 'timestamp']),
+            models.Index(fields=['passed', 'timestamp']),
+        ]
+    
+    @property
+    def status(self):
+        return 'PASS' if self.passed else 'FAIL'
+    
+    def __str__(self):
+        return f"{self.code} - {self.size} - {self.status}"
+
+class DailyQCRollup(models.Model):
+    """
+    Pass/fail counts per day, size, article type and operator.
+    Incremented in the same transaction as the results (see measurements.rollups);
+    rebuild with `manage.py rebuild_qc_rollups`.
+    """
+    date = models.DateField()
+    size = models.CharField(max_length=20)
+    article_type = models.CharField(max_length=20)
+    operator_id = models.CharField(max_length=100, blank=True, default='')
+    passed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = [('date', 'size', 'article_type', 'operator_id')]
+    
+    def __str__(self):
+        return f"{self.date} {self.size} {self.article_type} {self.operator_id or '-'}: {self.passed}/{self.failed}"
+
+class DailyQCCodeRollup(models.Model):
+    """Failure count of one measurement code, per DailyQCRollup key"""
+    date = models.DateField()
+    size = models.CharField(max_length=20)
+    article_type = models.CharField(max_length=20)
+    operator_id = models.CharField(max_length=100, blank=True, default='')
+    code = models.CharField(max_length=30)
+    failures = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = [('date', 'size', 'article_type', 'operator_id', 'code')]
+    
+    def __str__(self):
+        return f"{self.date} {self.size} {self.article_type} {self.operator_id or '-'} {self.code}: {self.failures}"
@@ -0,0 +1,103 @@
+"""
+Persistence of validated measurement results.
+Turns validation engine results into MeasurementSession/MeasurementResult rows,
+plus one MeasurementValue row per measured code, and saves them in a single
+transaction together with the daily QC rollup increments. Each result is
+queued to the audit log first, so it is on record even if the save fails.
+Once the save is committed, the reports of the days it touched are scheduled
+to be rendered again.
+"""
+
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from measurements.audit import audit_results
+from measurements.models import MeasurementSession, MeasurementResult, MeasurementValue
+from measurements.reports import schedule_report_renders
+from measurements.rollups import record_results
+from measurements.utils import DEFAULT_ARTICLE_TYPE, MeasurementValidationEngine
+
+# (session_id, size, validation_result, operator_id)
+ResultEntry = Tuple[str, str, Dict, Optional[str]]
+
+
+def build_result_record(
+    session: MeasurementSession,
+    size: str,
+    validation_result: Dict,
+    operator_id: Optional[str]
+) -> MeasurementResult:
+    """Build an unsaved MeasurementResult from a validation result."""
+    measurements = validation_result.get('measurements', [])
+    return MeasurementResult(
+        session=session,
+        size=size,
+        article_type=validation_result.get('article_type', DEFAULT_ARTICLE_TYPE),
+        measured_values=measurements,
+        standard_values=MeasurementValidationEngine.get_size_chart(
+            size, validation_result.get('article_type', DEFAULT_ARTICLE_TYPE)
+        ),
+        deviations={m['code']: m['deviation'] for m in measurements},
+        measurement_details=measurements,
+        passed=validation_result.get('success', False),
+        operator_id=operator_id,
+    )
+
+
+def build_value_records(result: MeasurementResult) -> List[MeasurementValue]:
+    """Build unsaved MeasurementValue rows for a saved result's measurements."""
+    return [
+        MeasurementValue(
+            result=result,
+            size=result.size,
+            code=m['code'],
+            measured_value=m['measured_value'],
+            standard_value=m['standard_value'],
+            deviation=m['deviation'],
+            tolerance=m['tolerance'],
+            passed=m['status'] == 'PASS',
+            timestamp=result.validation_timestamp,
+        )
+        for m in result.measurement_details
+    ]
+
+
+def save_validation_results(
+    entries: Iterable[ResultEntry],
+    product_id: Optional[int] = None,
+    audit: bool = True
+) -> List[MeasurementResult]:
+    """
+    Save validation results with one bulk insert per table in one transaction.
+    With audit=False (replaying the audit log) no audit records are written.
+
+    Returns:
+        List[MeasurementResult]: The saved result records, in entry order
+    """
+    entries = list(entries)
+    if not entries:
+        return []
+
+    if audit:
+        audit_results(entries, product_id)
+
+    with transaction.atomic():
+        sessions = MeasurementSession.objects.bulk_create([
+            MeasurementSession(session_id=session_id, product_id=product_id, status='completed')
+            for session_id, _, _, _ in entries
+        ])
+        results = MeasurementResult.objects.bulk_create([
+            build_result_record(session, size, validation_result, operator_id)
+            for session, (_, size, validation_result, operator_id) in zip(sessions, entries)
+        ])
+        MeasurementValue.objects.bulk_create([
+            value for result in results for value in build_value_records(result)
+        ])
+        # bulk_create sends no post_save signals, so the rollups are updated here
+        record_results(results)
+        report_dates = {timezone.localdate(result.validation_timestamp) for result in results}
+        transaction.on_commit(partial(schedule_report_renders, report_dates))
+        return results
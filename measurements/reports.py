@@ -0,0 +1,353 @@
+"""
+Daily QC reports.
+Builds report rows straight from the database with chunked iterators, so a
+report over any number of results streams with flat memory. Finished daily
+reports are kept as files and rendered again on a dedicated report thread,
+shortly after new results for that day are saved or when a request finds the
+products changed; until then requests get the last complete file.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from measurements.background import submit_to
+from measurements.models import DailyQCRollup, MeasurementResult, MeasurementValue
+from measurements.utils import MeasurementValidator, ReportStreamWriter
+from products.models import Product, PurchaseOrder
+
+# Rows fetched from the database per round trip while streaming
+REPORT_CHUNK_ROWS = 2000
+
+# Rendered daily reports: <date>_<format>_<last result id>_<product version>.<extension>
+REPORT_CACHE_DIR = Path(settings.MEDIA_ROOT) / 'reports'
+
+# Report format -> (content type, file extension); 'pdf' is the plain text version
+REPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'pdf': ('text/plain', 'txt'),
+}
+
+# Seconds a request waits for a report being rendered when there is no earlier one to serve
+REPORT_RENDER_TIMEOUT = 120
+
+# Seconds after results are saved before that day's reports are rendered again,
+# so a burst of saves costs one render; None renders only when a report is requested
+REPORT_PRERENDER_DELAY = 5
+
+ARTICLE_TYPE_NAMES = dict(PurchaseOrder.ARTICLE_TYPE_CHOICES)
+
+
+def report_period(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """[start, end) datetimes covering start_date to end_date inclusive, in the current time zone."""
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start_date, time.min), tz),
+        timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz),
+    )
+
+
+def iter_product_rows() -> Iterator[list]:
+    """Products summary section."""
+    yield ['PRODUCTS SUMMARY']
+    yield ['PO Number', 'Brand', 'Article Type', 'Size', 'Color', 'Quantity']
+    products = Product.objects.values_list(
+        'purchase_order__po_number', 'purchase_order__brand', 'purchase_order__article_type',
+        'size', 'color', 'quantity',
+    ).order_by('id')
+    for po_number, brand, article_type, size, color, quantity in products.iterator(chunk_size=REPORT_CHUNK_ROWS):
+        yield [po_number, brand, ARTICLE_TYPE_NAMES.get(article_type, article_type), size, color, quantity]
+    yield []
+
+
+def qc_summary_by_size(start_date: date, end_date: date) -> list:
+    """[(size, passed, failed)] over the period, from the daily rollups."""
+    return list(
+        DailyQCRollup.objects.filter(date__range=(start_date, end_date))
+        .values_list('size')
+        .annotate(passed=Sum('passed'), failed=Sum('failed'))
+        .order_by('size')
+    )
+
+
+def format_pass_rate(passed: int, failed: int) -> str:
+    """Pass rate as a percentage string, '-' when nothing was measured."""
+    total = passed + failed
+    return f"{passed / total * 100:.1f}%" if total else '-'
+
+
+def iter_qc_summary_rows(start_date: date, end_date: date) -> Iterator[list]:
+    """Pass/fail per size over the period."""
+    yield ['QUALITY CONTROL SUMMARY']
+    yield ['Size', 'Passed', 'Failed', 'Pass Rate']
+    summary = qc_summary_by_size(start_date, end_date)
+    for size, passed, failed in summary:
+        yield [size, passed, failed, format_pass_rate(passed, failed)]
+    total_passed = sum(passed for _, passed, _ in summary)
+    total_failed = sum(failed for _, _, failed in summary)
+    yield ['Total', total_passed, total_failed, format_pass_rate(total_passed, total_failed)]
+    yield []
+
+
+def iter_measurement_rows(start_date: date, end_date: date) -> Iterator[list]:
+    """One row per measured code of every result validated in the period."""
+    yield ['MEASUREMENTS']
+    yield [
+        'Timestamp', 'Session ID', 'Operator', 'Article Type', 'Size', 'Code', 'Measurement',
+        'Measured', 'Standard', 'Deviation', 'Tolerance', 'Status', 'Garment Result',
+    ]
+    start, end = report_period(start_date, end_date)
+    values = MeasurementValue.objects.filter(timestamp__gte=start, timestamp__lt=end).values_list(
+        'timestamp', 'result__session__session_id', 'result__operator_id', 'result__article_type',
+        'size', 'code', 'measured_value', 'standard_value', 'deviation', 'tolerance', 'passed',
+        'result__passed',
+    ).order_by('id')
+    for (timestamp, session_id, operator_id, article_type, size, code, measured, standard,
+         deviation, tolerance, passed, garment_passed) in values.iterator(chunk_size=REPORT_CHUNK_ROWS):
+        yield [
+            timezone.localtime(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            session_id,
+            operator_id or '',
+            article_type,
+            size,
+            code,
+            MeasurementValidator.get_measurement_name(code, article_type),
+            measured,
+            '' if standard is None else standard,
+            deviation,
+            tolerance,
+            'PASS' if passed else 'FAIL',
+            'PASS' if garment_passed else 'FAIL',
+        ]
+
+
+def iter_daily_csv_report(start_date: date, end_date: date) -> Iterable[str]:
+    """
+    CSV chunks of the daily report for start_date to end_date.
+    The title block is yielded before any query runs, so the first bytes
+    reach the client right away.
+    """
+    title = [
+        ['Magic QC - Daily Measurement Report'],
+        ['Report Period', start_date.isoformat(), end_date.isoformat()],
+        ['Generated', timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')],
+        [],
+    ]
+    return chain(
+        ReportStreamWriter.iter_csv(title),
+        ReportStreamWriter.iter_csv(chain(
+            iter_product_rows(),
+            iter_qc_summary_rows(start_date, end_date),
+            iter_measurement_rows(start_date, end_date),
+        )),
+    )
+
+
+def iter_daily_text_lines(report_date: date) -> Iterator[str]:
+    """Lines of the plain text daily report."""
+    yield "MAGIC QC - DAILY MEASUREMENT REPORT"
+    yield "=" * 60
+    yield f"Report Date: {report_date.isoformat()}"
+    yield f"Generated: {timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')}"
+    yield ""
+    
+    # Products Summary
+    yield "PRODUCTS IN SYSTEM"
+    yield "-" * 30
+    total_products = 0
+    products = Product.objects.values_list('purchase_order__po_number', 'size', 'color', 'quantity').order_by('id')
+    for po_number, size, color, quantity in products.iterator(chunk_size=REPORT_CHUNK_ROWS):
+        total_products += 1
+        yield f"PO-{po_number}: {size} {color} - Qty: {quantity}"
+    yield ""
+    yield f"Total Products: {total_products}"
+    yield ""
+    
+    # QC Summary
+    yield "QUALITY CONTROL SUMMARY"
+    yield "-" * 30
+    yield "Size   Passed  Failed  Pass Rate"
+    yield "----   ------  ------  ---------"
+    summary = qc_summary_by_size(report_date, report_date)
+    for size, passed, failed in summary:
+        yield f"{size:<6} {passed:>6}  {failed:>6}  {format_pass_rate(passed, failed):>9}"
+    total_passed = sum(passed for _, passed, _ in summary)
+    total_failed = sum(failed for _, _, failed in summary)
+    yield "----   ------  ------  ---------"
+    yield f"{'Total':<6} {total_passed:>6}  {total_failed:>6}  {format_pass_rate(total_passed, total_failed):>9}"
+
+
+class ReportArtifact(NamedTuple):
+    """A rendered daily report file, keyed by (date, format, last result id, product version)."""
+    report_date: date
+    report_format: str
+    last_result_id: int
+    product_version: str
+    path: Path
+    etag: str
+    content_type: str
+    filename: str
+
+
+def build_report_artifact(
+    report_date: date, report_format: str, last_result_id: int, product_version: str
+) -> ReportArtifact:
+    """The report file and ETag of a key."""
+    content_type, extension = REPORT_FORMATS[report_format]
+    day = report_date.strftime('%Y%m%d')
+    return ReportArtifact(
+        report_date=report_date,
+        report_format=report_format,
+        last_result_id=last_result_id,
+        product_version=product_version,
+        path=REPORT_CACHE_DIR / f"{day}_{report_format}_{last_result_id}_{product_version}.{extension}",
+        etag=f'"{day}-{report_format}-{last_result_id}-{product_version}"',
+        content_type=content_type,
+        filename=f"magic_qc_daily_report_{day}.{extension}",
+    )
+
+
+def get_report_artifact(report_date: date, report_format: str) -> ReportArtifact:
+    """
+    Describe the current daily report of a format; the file may not be rendered yet.
+    The key changes, and the report is rendered again, only when results arrive for
+    that day or a product or PO in the products summary is added, edited or deleted.
+    """
+    start, end = report_period(report_date, report_date)
+    last_result_id = MeasurementResult.objects.filter(
+        validation_timestamp__gte=start, validation_timestamp__lt=end
+    ).aggregate(last_id=Max('id'))['last_id'] or 0
+    products = Product.objects.aggregate(
+        count=Count('id'), updated_at=Max('updated_at'), po_updated_at=Max('purchase_order__updated_at'),
+    )
+    product_version = hashlib.sha1(
+        f"{products['count']}|{products['updated_at']}|{products['po_updated_at']}".encode()
+    ).hexdigest()[:8]
+    return build_report_artifact(report_date, report_format, last_result_id, product_version)
+
+
+def rendered_at(path: Path) -> float:
+    """Modification time of a rendered report, 0 if a newer render just removed it."""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0
+
+
+def latest_report_artifact(report_date: date, report_format: str) -> Optional[ReportArtifact]:
+    """The most recently rendered complete report of a day and format, if any."""
+    prefix = f"{report_date.strftime('%Y%m%d')}_{report_format}_"
+    rendered = [path for path in REPORT_CACHE_DIR.glob(f"{prefix}*") if not path.name.endswith('.tmp')]
+    if not rendered:
+        return None
+    latest = max(rendered, key=rendered_at)
+    last_result_id, product_version = latest.name[len(prefix):].split('.')[0].split('_')
+    return build_report_artifact(report_date, report_format, int(last_result_id), product_version)
+
+
+def render_report_artifact(artifact: ReportArtifact) -> Path:
+    """Write the report file, then drop older renders of the same day and format."""
+    REPORT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = artifact.path.with_name(f"{artifact.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        if artifact.report_format == 'csv':
+            for chunk in iter_daily_csv_report(artifact.report_date, artifact.report_date):
+                f.write(chunk)
+        else:
+            for line in iter_daily_text_lines(artifact.report_date):
+                f.write(line + "\n")
+    # Atomic: readers see either no file or the complete report
+    os.replace(tmp_path, artifact.path)
+    
+    prefix = f"{artifact.report_date.strftime('%Y%m%d')}_{artifact.report_format}_"
+    for stale in REPORT_CACHE_DIR.glob(f"{prefix}*"):
+        if stale != artifact.path and not stale.name.endswith('.tmp'):
+            stale.unlink(missing_ok=True)
+    return artifact.path
+
+
+_report_executor = None
+_scheduled_dates: Set[date] = set()
+_report_lock = threading.Lock()
+
+
+def get_report_executor() -> ThreadPoolExecutor:
+    """
+    Return the report thread, starting it on first use.
+    Reports render one at a time, apart from the shared background pool, so a
+    render never queues behind (or holds up) other background work, and two
+    requests for the same report can't render it twice.
+    """
+    global _report_executor
+    with _report_lock:
+        if _report_executor is None:
+            _report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='measurements-reports')
+        return _report_executor
+
+
+def ensure_report_rendered(artifact: ReportArtifact) -> Path:
+    """Render the report unless an earlier task on the report thread already did."""
+    if artifact.path.exists():
+        return artifact.path
+    return render_report_artifact(artifact)
+
+
+def render_day_reports(report_date: date):
+    """Render the day's reports in every format that is out of date."""
+    with _report_lock:
+        # Results saved from here on schedule another render
+        _scheduled_dates.discard(report_date)
+    for report_format in REPORT_FORMATS:
+        ensure_report_rendered(get_report_artifact(report_date, report_format))
+
+
+def schedule_report_renders(report_dates: Iterable[date]):
+    """
+    Render the reports of these days on the report thread REPORT_PRERENDER_DELAY
+    seconds from now, unless a render of the day is already scheduled.
+    """
+    if REPORT_PRERENDER_DELAY is None:
+        return
+    for report_date in report_dates:
+        with _report_lock:
+            if report_date in _scheduled_dates:
+                continue
+            _scheduled_dates.add(report_date)
+        timer = threading.Timer(
+            REPORT_PRERENDER_DELAY, submit_to, (get_report_executor(), render_day_reports, report_date)
+        )
+        timer.daemon = True
+        timer.start()
+
+
+def open_daily_report(report_date: date, report_format: str) -> Tuple[ReportArtifact, BinaryIO]:
+    """
+    Open the current daily report of a format if it is rendered. Otherwise start
+    rendering it on the report thread and open the last complete report in the
+    meantime; only when there is none, wait for the render.
+    """
+    artifact = get_report_artifact(report_date, report_format)
+    try:
+        return artifact, open(artifact.path, 'rb')
+    except FileNotFoundError:
+        pass
+    
+    previous = latest_report_artifact(report_date, report_format)
+    render = submit_to(get_report_executor(), ensure_report_rendered, artifact)
+    if previous is not None:
+        try:
+            return previous, open(previous.path, 'rb')
+        except FileNotFoundError:
+            # Replaced by a render that just finished
+            pass
+    return artifact, open(render.result(timeout=REPORT_RENDER_TIMEOUT), 'rb')
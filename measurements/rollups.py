@@ -0,0 +1,146 @@
+"""
+Daily QC rollups.
+Pass/fail counts per (date, size, article type, operator) and failure counts
+per measurement code, kept up to date as results are saved so the analytics
+dashboard reads a handful of rollup rows instead of scanning every result.
+"""
+
+from collections import Counter
+from typing import Iterable
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from measurements.models import DailyQCCodeRollup, DailyQCRollup, MeasurementResult, MeasurementValue
+
+ROLLUP_KEY_FIELDS = ('date', 'size', 'article_type', 'operator_id')
+
+
+def rollup_key(result: MeasurementResult) -> tuple:
+    """(date, size, article_type, operator_id) a result is counted under."""
+    return (
+        timezone.localdate(result.validation_timestamp),
+        result.size,
+        result.article_type,
+        result.operator_id or '',
+    )
+
+
+def record_results(results: Iterable[MeasurementResult]) -> None:
+    """
+    Add saved results to the daily rollups.
+
+    Counts are aggregated per key first, then each rollup row is incremented
+    with a single F() update, so concurrent writers never lose counts.
+    Call inside the transaction that saved the results.
+    """
+    passed, failed, code_failures = Counter(), Counter(), Counter()
+    for result in results:
+        key = rollup_key(result)
+        if result.passed:
+            passed[key] += 1
+        else:
+            failed[key] += 1
+        for m in result.measurement_details:
+            if m.get('status') == 'FAIL':
+                code_failures[key + (m['code'],)] += 1
+
+    keys = set(passed) | set(failed)
+    if not keys:
+        return
+
+    with transaction.atomic():
+        # Create missing rows at zero, then increment every row in place
+        DailyQCRollup.objects.bulk_create(
+            [DailyQCRollup(**dict(zip(ROLLUP_KEY_FIELDS, key))) for key in keys],
+            ignore_conflicts=True,
+        )
+        for key in keys:
+            DailyQCRollup.objects.filter(**dict(zip(ROLLUP_KEY_FIELDS, key))).update(
+                passed=F('passed') + passed[key],
+                failed=F('failed') + failed[key],
+            )
+
+        code_fields = ROLLUP_KEY_FIELDS + ('code',)
+        DailyQCCodeRollup.objects.bulk_create(
+            [DailyQCCodeRollup(**dict(zip(code_fields, key))) for key in code_failures],
+            ignore_conflicts=True,
+        )
+        for key, failures in code_failures.items():
+            DailyQCCodeRollup.objects.filter(**dict(zip(code_fields, key))).update(
+                failures=F('failures') + failures,
+            )
+
+
+def rebuild_rollups(apps=None) -> int:
+    """
+    Recompute every rollup row from MeasurementResult and MeasurementValue.
+
+    Args:
+        apps: App registry to take the models from; migrations pass their
+            historical one
+
+    Returns:
+        int: Number of DailyQCRollup rows written
+    """
+    if apps is None:
+        apps = django_apps
+    MeasurementResult = apps.get_model('measurements', 'MeasurementResult')
+    MeasurementValue = apps.get_model('measurements', 'MeasurementValue')
+    DailyQCRollup = apps.get_model('measurements', 'DailyQCRollup')
+    DailyQCCodeRollup = apps.get_model('measurements', 'DailyQCCodeRollup')
+
+    with transaction.atomic():
+        DailyQCRollup.objects.all().delete()
+        DailyQCCodeRollup.objects.all().delete()
+
+        rollups = (
+            MeasurementResult.objects
+            .annotate(date=TruncDate('validation_timestamp'), operator=Coalesce('operator_id', Value('')))
+            .values('date', 'size', 'article_type', 'operator')
+            .annotate(
+                passed_count=Count('id', filter=Q(passed=True)),
+                failed_count=Count('id', filter=Q(passed=False)),
+            )
+            .order_by()
+        )
+        rows = DailyQCRollup.objects.bulk_create([
+            DailyQCRollup(
+                date=row['date'],
+                size=row['size'],
+                article_type=row['article_type'],
+                operator_id=row['operator'],
+                passed=row['passed_count'],
+                failed=row['failed_count'],
+            )
+            for row in rollups.iterator()
+        ], batch_size=500)
+
+        code_rollups = (
+            MeasurementValue.objects
+            .filter(passed=False)
+            .annotate(
+                date=TruncDate('timestamp'),
+                article_type=F('result__article_type'),
+                operator=Coalesce('result__operator_id', Value('')),
+            )
+            .values('date', 'size', 'article_type', 'operator', 'code')
+            .annotate(failure_count=Count('id'))
+            .order_by()
+        )
+        DailyQCCodeRollup.objects.bulk_create([
+            DailyQCCodeRollup(
+                date=row['date'],
+                size=row['size'],
+                article_type=row['article_type'],
+                operator_id=row['operator'],
+                code=row['code'],
+                failures=row['failure_count'],
+            )
+            for row in code_rollups.iterator()
+        ], batch_size=500)
+
+        return len(rows)
@@ -0,0 +1,56 @@
+"""
+SQLite production profile.
+Applies the pragmas of the configured profile, settings.SQLITE_PRAGMAS (in
+production: WAL journal, relaxed fsync, larger page cache), to every new
+SQLite connection, and retries writes that hit SQLITE_BUSY with jittered
+exponential backoff.
+"""
+
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Attempts at a write while the database is locked, and the backoff bounds in seconds
+SQLITE_BUSY_RETRIES = 6
+SQLITE_BUSY_BASE_DELAY = 0.05
+SQLITE_BUSY_MAX_DELAY = 2.0
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Set the configured pragmas on a new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+def is_busy_error(error: Exception) -> bool:
+    """True for SQLITE_BUSY / SQLITE_LOCKED ('database is locked')."""
+    message = str(error).lower()
+    return isinstance(error, OperationalError) and ('locked' in message or 'busy' in message)
+
+
+def run_with_busy_retry(func, *args, **kwargs):
+    """
+    Call func(*args, **kwargs), retrying while the database is busy.
+
+    Sleeps a random time up to a doubling bound between attempts, so writers
+    that collided don't collide again. Call it outside any transaction:
+    func has to be able to run again from the start.
+
+    Raises:
+        OperationalError: If the database is still busy after SQLITE_BUSY_RETRIES attempts
+    """
+    for attempt in range(SQLITE_BUSY_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except OperationalError as e:
+            if not is_busy_error(e) or attempt == SQLITE_BUSY_RETRIES - 1:
+                raise
+            time.sleep(random.uniform(0, min(SQLITE_BUSY_MAX_DELAY, SQLITE_BUSY_BASE_DELAY * 2 ** attempt)))
@@ -0,0 +1,158 @@
+"""
+Test suite for analytics charts.
+Tests the chart endpoint's ETags and the LRU cache of rendered images.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from magic_qc.testing import clear_results, setup_test_database, validation_result
+
+
+def chart_client():
+    """Test client logged in as a QC user."""
+    from django.test import Client
+    from accounts.models import CustomUser
+    user, _ = CustomUser.objects.get_or_create(username='chart_viewer', defaults={'role': 'admin'})
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def save_results(*entries):
+    """Save (session_id, size, offsets) results validated now."""
+    from measurements.persistence import save_validation_results
+    save_validation_results(
+        [(session_id, size, validation_result(size, offsets), 'op-1') for session_id, size, offsets in entries],
+        audit=False,
+    )
+
+
+def test_chart_etag_follows_rollups():
+    """Test a matching ETag gets 304, and new rollup data gives a new one."""
+    setup_test_database()
+    from django.urls import reverse
+
+    print("\n" + "="*70)
+    print("TEST 1: Analytics Chart - ETag and 304")
+    print("="*70)
+
+    clear_results()
+    client = chart_client()
+    save_results(('chart-pass', '8/9', None))
+
+    for kind in ('pass_rate', 'code_failures'):
+        url = reverse('analytics_chart', args=[kind]) + '?days=7'
+        response = client.get(url)
+        etag = response['ETag']
+        assert response.status_code == 200 and response['Content-Type'] == 'image/png'
+        assert response.content.startswith(b'\x89PNG')
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        save_results((f'chart-fail-{kind}', '8/9', {'A': 3.0}))
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        print(f"{kind}: {etag} -> {response['ETag']}")
+        assert response.status_code == 200 and response['ETag'] != etag
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+
+    # Filters are part of the key
+    url = reverse('analytics_chart', args=['pass_rate'])
+    assert client.get(url + '?days=7')['ETag'] != client.get(url + '?days=7&size=9/10')['ETag']
+    assert client.get(reverse('analytics_chart', args=['unknown'])).status_code == 400
+
+    clear_results()
+    print("✓ 304 while the rollups are unchanged, a new ETag once they change")
+
+
+def test_chart_cache_lru_eviction():
+    """Test the cache keeps CHART_CACHE_MAX_FILES images, evicting the least recently served."""
+    setup_test_database()
+    from django.urls import reverse
+    from measurements import analytics_charts
+    from measurements.analytics_charts import chart_data, chart_key, chart_query
+
+    print("\n" + "="*70)
+    print("TEST 2: Analytics Chart - LRU Eviction")
+    print("="*70)
+
+    clear_results()
+    client = chart_client()
+    save_results(('chart-lru', '8/9', None))
+
+    def cached_name(days):
+        query = chart_query('pass_rate', days)
+        return f"{chart_key(query, chart_data(query))}.png"
+
+    def get_chart(days):
+        assert client.get(reverse('analytics_chart', args=['pass_rate']) + f'?days={days}').status_code == 200
+        # Distinct modification times, so the LRU order is unambiguous
+        time.sleep(0.02)
+
+    renders = []
+    original_render = analytics_charts.render_chart
+
+    def counted_render(query, data):
+        renders.append(query)
+        return original_render(query, data)
+
+    original_cache_dir = analytics_charts.CHART_CACHE_DIR
+    original_max_files = analytics_charts.CHART_CACHE_MAX_FILES
+    analytics_charts.CHART_CACHE_DIR = Path(tempfile.mkdtemp())
+    analytics_charts.CHART_CACHE_MAX_FILES = 3
+    analytics_charts.render_chart = counted_render
+    try:
+        for days in (1, 2, 3):
+            get_chart(days)
+        # Serving days=1 from the cache makes it the most recently used
+        get_chart(1)
+        assert len(renders) == 3
+        get_chart(4)
+
+        cached = {path.name for path in analytics_charts.CHART_CACHE_DIR.glob('*.png')}
+        print(f"Renders: {len(renders)}, cached: {len(cached)}")
+        assert cached == {cached_name(1), cached_name(3), cached_name(4)}
+        assert len(renders) == 4
+
+        # The evicted chart is drawn again
+        get_chart(2)
+        assert len(renders) == 5
+        assert (analytics_charts.CHART_CACHE_DIR / cached_name(2)).exists()
+    finally:
+        analytics_charts.render_chart = original_render
+        analytics_charts.CHART_CACHE_MAX_FILES = original_max_files
+        analytics_charts.CHART_CACHE_DIR = original_cache_dir
+
+    clear_results()
+    print("✓ The least recently served image is evicted, cache hits skip drawing")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ ANALYTICS CHARTS - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_chart_etag_follows_rollups()
+        test_chart_cache_lru_eviction()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • Chart ETags answer 304 until the rollups change")
+        print("  • The image cache evicts the least recently served beyond CHART_CACHE_MAX_FILES")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,315 @@
+"""
+Test suite for reports.
+Tests the daily CSV report streamed from the database, and the rendered
+daily report files: their ETags, serving the last complete file while a newer
+one renders, and rendering after result saves.
+"""
+
+import csv
+import io
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from magic_qc.testing import (
+    clear_products,
+    clear_results,
+    save_result_at,
+    setup_test_database,
+    validation_result,
+)
+
+
+def at(*args) -> datetime:
+    """Aware datetime in the current time zone."""
+    from django.utils import timezone
+    return timezone.make_aware(datetime(*args), timezone.get_current_timezone())
+
+
+def csv_sections(content: str) -> dict:
+    """Rows of each report section, by section title."""
+    sections, rows = {}, None
+    for row in csv.reader(io.StringIO(content)):
+        if len(row) == 1 and row[0].isupper():
+            rows = sections.setdefault(row[0], [])
+        elif row and rows is not None:
+            rows.append(row)
+    return sections
+
+
+def test_daily_csv_report_from_database():
+    """Test the CSV report streams products, rollups and value rows of the period only."""
+    setup_test_database()
+    from measurements import reports
+    from measurements.models import MeasurementValue
+    from measurements.reports import iter_daily_csv_report
+    from measurements.rollups import rebuild_rollups
+    from products.models import Product, PurchaseOrder
+
+    print("\n" + "="*70)
+    print("TEST 1: Daily CSV Report - Streamed From the Database")
+    print("="*70)
+
+    clear_results()
+    clear_products()
+    order = PurchaseOrder.objects.create(
+        po_number='PO-REPORT', date=date(2026, 3, 1), brand='ZARA',
+        origin_country='Portugal', article_type='sweat_shirt',
+    )
+    Product.objects.create(purchase_order=order, size='8/9', quantity=120, color='Navy')
+    Product.objects.create(purchase_order=order, size='9/10', quantity=80, color='Grey')
+
+    passed = save_result_at('report-pass', '8/9', validation_result('8/9'), 'op-1', at(2026, 3, 2, 10, 0))
+    failed = save_result_at('report-fail', '9/10', validation_result('9/10', {'A': 3.0}, 'op-2'), 'op-2',
+                            at(2026, 3, 3, 15, 0))
+    save_result_at('report-before', '8/9', validation_result('8/9'), 'op-1', at(2026, 3, 1, 23, 0))
+    save_result_at('report-after', '9/10', validation_result('9/10'), 'op-1', at(2026, 3, 4, 0, 30))
+    rebuild_rollups()
+    in_range = MeasurementValue.objects.filter(result_id__in=[passed.id, failed.id]).count()
+
+    # A small chunk size makes the value rows span several round trips
+    original_chunk_rows = reports.REPORT_CHUNK_ROWS
+    reports.REPORT_CHUNK_ROWS = 7
+    try:
+        content = ''.join(iter_daily_csv_report(date(2026, 3, 2), date(2026, 3, 3)))
+    finally:
+        reports.REPORT_CHUNK_ROWS = original_chunk_rows
+    sections = csv_sections(content)
+
+    assert 'Report Period,2026-03-02,2026-03-03' in content
+    assert sections['PRODUCTS SUMMARY'][1:] == [
+        ['PO-REPORT', 'ZARA', 'Sweat Shirt', '8/9', 'Navy', '120'],
+        ['PO-REPORT', 'ZARA', 'Sweat Shirt', '9/10', 'Grey', '80'],
+    ]
+    print(f"QC summary: {sections['QUALITY CONTROL SUMMARY'][1:]}")
+    assert sections['QUALITY CONTROL SUMMARY'][1:] == [
+        ['8/9', '1', '0', '100.0%'],
+        ['9/10', '0', '1', '0.0%'],
+        ['Total', '1', '1', '50.0%'],
+    ]
+
+    header, *rows = sections['MEASUREMENTS']
+    print(f"Measurement rows: {len(rows)} (expected {in_range})")
+    assert len(rows) == in_range
+    assert {row[1] for row in rows} == {'report-pass', 'report-fail'}
+    by_key = {(row[1], row[5]): dict(zip(header, row)) for row in rows}
+    assert len(by_key) == len(rows)
+
+    length = by_key[('report-fail', 'A')]
+    assert length['Timestamp'] == '2026-03-03 15:00:00' and length['Operator'] == 'op-2'
+    assert length['Size'] == '9/10' and length['Status'] == 'FAIL' and length['Garment Result'] == 'FAIL'
+    assert float(length['Deviation']) == 3.0
+    assert by_key[('report-fail', 'B')]['Status'] == 'PASS'
+    assert all(by_key[('report-pass', code)]['Garment Result'] == 'PASS'
+               for session_id, code in by_key if session_id == 'report-pass')
+
+    clear_results()
+    clear_products()
+    print("✓ Products, per-size rollups and per-code values of the period only, across chunks")
+
+
+def report_client():
+    """Test client logged in as a QC user."""
+    from django.test import Client
+    from accounts.models import CustomUser
+    user, _ = CustomUser.objects.get_or_create(username='report_viewer', defaults={'role': 'admin'})
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def wait_for_report_thread():
+    """Wait until the report thread has finished everything submitted so far."""
+    from measurements.reports import get_report_executor
+    get_report_executor().submit(lambda: None).result(timeout=10)
+
+
+def test_daily_report_etag_and_stale_file():
+    """Test a new result changes the ETag, and the last file is served until the new one renders."""
+    setup_test_database()
+    from django.urls import reverse
+    from measurements import reports
+    from measurements.reports import get_report_artifact
+
+    print("\n" + "="*70)
+    print("TEST 2: Daily Report - ETag, 304 and Last Complete File")
+    print("="*70)
+
+    clear_results()
+    client = report_client()
+    url = reverse('generate_daily_report') + '?type=csv&start=2026-03-05'
+    save_result_at('etag-first', '8/9', validation_result('8/9'), 'op-1', at(2026, 3, 5, 9, 0))
+
+    response = client.get(url)
+    first_etag = response['ETag']
+    assert response.status_code == 200 and b'etag-first' in b''.join(response.streaming_content)
+    assert client.get(url, HTTP_IF_NONE_MATCH=first_etag).status_code == 304
+
+    save_result_at('etag-second', '8/9', validation_result('8/9'), 'op-1', at(2026, 3, 5, 11, 0))
+    new_etag = get_report_artifact(date(2026, 3, 5), 'csv').etag
+    print(f"ETag: {first_etag} -> {new_etag}")
+    assert new_etag != first_etag
+
+    # The new report renders on the report thread; meanwhile the last one still answers 304
+    rendering = threading.Event()
+    original_render = reports.render_report_artifact
+
+    def held_render(artifact):
+        rendering.wait(timeout=10)
+        return original_render(artifact)
+
+    reports.render_report_artifact = held_render
+    try:
+        assert client.get(url, HTTP_IF_NONE_MATCH=first_etag).status_code == 304
+        response = client.get(url, HTTP_IF_NONE_MATCH=new_etag)
+        assert response.status_code == 200 and response['ETag'] == first_etag
+        assert b'etag-second' not in b''.join(response.streaming_content)
+    finally:
+        rendering.set()
+        wait_for_report_thread()
+        reports.render_report_artifact = original_render
+    response = client.get(url, HTTP_IF_NONE_MATCH=first_etag)
+    assert response.status_code == 200 and response['ETag'] == new_etag
+    assert b'etag-second' in b''.join(response.streaming_content)
+    assert client.get(url, HTTP_IF_NONE_MATCH=new_etag).status_code == 304
+
+    clear_results()
+    print("✓ New results change the ETag; the previous file is served until the new one is ready")
+
+
+def test_concurrent_requests_share_render():
+    """Test requests for a report that isn't rendered yet wait for one render."""
+    setup_test_database()
+    from measurements import reports
+    from measurements.reports import open_daily_report
+    from measurements.rollups import rebuild_rollups
+
+    print("\n" + "="*70)
+    print("TEST 3: Daily Report - Concurrent Requests Share One Render")
+    print("="*70)
+
+    clear_results()
+    save_result_at('shared-render', '8/9', validation_result('8/9'), 'op-1', at(2026, 3, 6, 9, 0))
+    rebuild_rollups()
+    renders = []
+    original_render = reports.render_report_artifact
+
+    def slow_render(artifact):
+        renders.append(artifact.path)
+        time.sleep(0.2)
+        return original_render(artifact)
+
+    original_cache_dir = reports.REPORT_CACHE_DIR
+    reports.REPORT_CACHE_DIR = Path(tempfile.mkdtemp())
+    reports.render_report_artifact = slow_render
+    etags = []
+    try:
+        def request_report():
+            artifact, report_file = open_daily_report(date(2026, 3, 6), 'pdf')
+            with report_file:
+                assert b'8/9' in report_file.read()
+            etags.append(artifact.etag)
+
+        threads = [threading.Thread(target=request_report) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        reports.render_report_artifact = original_render
+        reports.REPORT_CACHE_DIR = original_cache_dir
+
+    print(f"Renders: {len(renders)}, responses: {len(etags)}")
+    assert len(renders) == 1
+    assert len(etags) == 5 and len(set(etags)) == 1
+
+    clear_results()
+    print("✓ Five concurrent requests got the same file from a single render")
+
+
+def test_reports_render_after_saves():
+    """Test a burst of saves renders the day's reports once, off the request path."""
+    setup_test_database()
+    from django.utils import timezone
+    from measurements import reports
+    from measurements.persistence import save_validation_results
+    from measurements.reports import get_report_artifact, open_daily_report
+
+    print("\n" + "="*70)
+    print("TEST 4: Daily Report - Rendered After Result Saves")
+    print("="*70)
+
+    clear_results()
+    renders = []
+    original_render = reports.render_report_artifact
+
+    def counted_render(artifact):
+        renders.append(artifact.report_format)
+        return original_render(artifact)
+
+    original_cache_dir = reports.REPORT_CACHE_DIR
+    original_delay = reports.REPORT_PRERENDER_DELAY
+    reports.REPORT_CACHE_DIR = Path(tempfile.mkdtemp())
+    reports.REPORT_PRERENDER_DELAY = 0.2
+    reports.render_report_artifact = counted_render
+    try:
+        for i in range(3):
+            save_validation_results([(f'prerender-{i}', '8/9', validation_result('8/9'), 'op-1')], audit=False)
+        today = timezone.localdate()
+        artifacts = [get_report_artifact(today, report_format) for report_format in reports.REPORT_FORMATS]
+        assert not renders
+
+        deadline = time.monotonic() + 5
+        while not all(artifact.path.exists() for artifact in artifacts) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        wait_for_report_thread()
+        print(f"Renders after 3 saves: {renders}")
+        assert sorted(renders) == sorted(reports.REPORT_FORMATS)
+
+        artifact, report_file = open_daily_report(today, 'csv')
+        report_file.close()
+        assert artifact == artifacts[0] and len(renders) == 2
+    finally:
+        reports.render_report_artifact = original_render
+        reports.REPORT_PRERENDER_DELAY = original_delay
+        reports.REPORT_CACHE_DIR = original_cache_dir
+
+    clear_results()
+    print("✓ The saves were debounced into one render per format, ready before any request")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ REPORTS - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_daily_csv_report_from_database()
+        test_daily_report_etag_and_stale_file()
+        test_concurrent_requests_share_render()
+        test_reports_render_after_saves()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • The CSV report streams products, rollups and values of its period")
+        print("  • New results change the report ETag; the last file serves until the new one renders")
+        print("  • Concurrent requests share a single render")
+        print("  • Saves are debounced into one render per format")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,486 @@
+"""
+Test suite for result storage.
+Tests the validation audit log, replaying it into the database, how the
+upload endpoint answers when result storage is busy, the per-code value rows
+and the daily QC rollups.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from magic_qc.testing import (
+    clear_results,
+    measurement_file,
+    setup_django,
+    setup_test_database,
+    validation_result,
+)
+
+
+def test_audit_log_group_commit():
+    """Test queued records are written and fsynced as one group."""
+    setup_django()
+    from measurements import audit
+
+    print("\n" + "="*70)
+    print("TEST 1: Audit Log - Group Commit")
+    print("="*70)
+
+    path = Path(tempfile.mkdtemp()) / 'audit.jsonl'
+    original_interval = audit.AUDIT_GROUP_INTERVAL
+    audit.AUDIT_GROUP_INTERVAL = 0.2
+    writer = audit.AuditLogWriter(path)
+    writes = []
+    write = writer._write
+    writer._write = lambda lines: (writes.append(len(lines)), write(lines))
+    try:
+        for i in range(50):
+            writer.append(audit.build_audit_record(f'group-{i}', '8/9', validation_result(), 'op-1'))
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close(timeout=5)
+        audit.AUDIT_GROUP_INTERVAL = original_interval
+
+    records = list(audit.iter_audit_records(path))
+    print(f"Writes: {writes}, records read back: {len(records)}")
+
+    assert writes == [50]
+    assert [r['session_id'] for r in records] == [f'group-{i}' for i in range(50)]
+    assert all(r['passed'] and len(r['measurements']) == 20 for r in records)
+
+    print("✓ 50 records written with one write and one fsync")
+
+
+def test_audit_log_failed_write_not_duplicated():
+    """Test a write whose fsync fails is cut off the file before it is retried."""
+    setup_django()
+    from measurements import audit
+
+    print("\n" + "="*70)
+    print("TEST 2: Audit Log - Failed Write Is Retried Once")
+    print("="*70)
+
+    path = Path(tempfile.mkdtemp()) / 'audit.jsonl'
+    original_delay, original_fsync = audit.AUDIT_RETRY_DELAY, audit.os.fsync
+    failures = [1]
+
+    def failing_fsync(fd):
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError('No space left on device')
+        return original_fsync(fd)
+
+    audit.AUDIT_RETRY_DELAY = 0.01
+    audit.os.fsync = failing_fsync
+    writer = audit.AuditLogWriter(path)
+    try:
+        for i in range(3):
+            writer.append(audit.build_audit_record(f'retry-{i}', '8/9', validation_result(), 'op-1'))
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close(timeout=5)
+        audit.os.fsync = original_fsync
+        audit.AUDIT_RETRY_DELAY = original_delay
+
+    lines = path.read_bytes().splitlines()
+    print(f"Lines on disk after one failed write: {len(lines)}")
+
+    assert failures == [0]
+    assert len(lines) == 3
+    assert [r['session_id'] for r in audit.iter_audit_records(path)] == ['retry-0', 'retry-1', 'retry-2']
+
+    print("✓ The failed group is on disk once, not twice")
+
+
+def test_audit_log_hash_check():
+    """Test reading the log back skips unparsable, tampered and cut-off lines."""
+    setup_django()
+    from measurements import audit
+
+    print("\n" + "="*70)
+    print("TEST 3: Audit Log - Hash Check on Read")
+    print("="*70)
+
+    good = audit.encode_audit_record(audit.build_audit_record('good', '8/9', validation_result(), 'op-1'))
+    tampered = json.loads(audit.encode_audit_record(
+        audit.build_audit_record('tampered', '8/9', validation_result(), 'op-1')
+    ))
+    tampered['passed'] = not tampered['passed']
+    cut_off = audit.encode_audit_record(audit.build_audit_record('cut', '8/9', validation_result(), 'op-1'))
+
+    path = Path(tempfile.mkdtemp()) / 'audit.jsonl'
+    path.write_bytes(b''.join([
+        good,
+        (json.dumps(tampered) + '\n').encode('utf-8'),
+        b'not json\n',
+        b'[1, 2, 3]\n',
+        cut_off[:len(cut_off) // 2],
+    ]))
+
+    records = list(audit.iter_audit_records(path))
+    print(f"Records kept: {[r['session_id'] for r in records]}")
+
+    assert [r['session_id'] for r in records] == ['good']
+    assert list(audit.iter_audit_records(Path(tempfile.mkdtemp()) / 'missing.jsonl')) == []
+
+    print("✓ Only lines whose hash matches are read back")
+
+
+def test_replay_audit_log():
+    """Test replay saves missing results once, at their original time, and --dry-run saves nothing."""
+    setup_test_database()
+    from datetime import datetime, timedelta, timezone as dt_timezone
+    from io import StringIO
+    from django.core.management import call_command
+    from measurements import audit
+    from measurements.models import DailyQCRollup, MeasurementResult, MeasurementValue
+    from measurements.persistence import save_validation_results
+    import measurements.management.commands.replay_audit_log as replay_command
+
+    print("\n" + "="*70)
+    print("TEST 4: Replay Audit Log - Dedupe, Timestamps, Dry Run")
+    print("="*70)
+
+    clear_results()
+    recorded_at = datetime(2026, 3, 2, 9, 30, tzinfo=dt_timezone.utc)
+    saved = validation_result()
+    save_validation_results([('replay-saved', '8/9', saved, 'op-1')], audit=False)
+
+    def line(session_id, result):
+        record = audit.build_audit_record(session_id, '8/9', result, 'op-1')
+        record['recorded_at'] = recorded_at.isoformat()
+        return audit.encode_audit_record(record)
+
+    passed, failed = validation_result(), validation_result(offsets={'A': 5})
+    path = Path(tempfile.mkdtemp()) / 'audit.jsonl'
+    # replay-1 is logged twice within a batch, replay-2 across batches
+    path.write_bytes(b''.join([
+        line('replay-1', passed), line('replay-1', passed), line('replay-2', failed),
+        line('replay-saved', saved), line('replay-2', failed),
+    ]))
+
+    original_batch = replay_command.REPLAY_BATCH_SIZE
+    replay_command.REPLAY_BATCH_SIZE = 3
+    try:
+        out = StringIO()
+        call_command('replay_audit_log', path=str(path), dry_run=True, stdout=out)
+        print(out.getvalue().strip())
+        assert 'Checked 3 audit records: 2 missing' in out.getvalue()
+        assert MeasurementResult.objects.count() == 1
+
+        out = StringIO()
+        call_command('replay_audit_log', path=str(path), stdout=out)
+        print(out.getvalue().strip())
+        assert 'Checked 3 audit records: 2 replayed' in out.getvalue()
+    finally:
+        replay_command.REPLAY_BATCH_SIZE = original_batch
+
+    replayed = {r.session.session_id: r for r in MeasurementResult.objects.select_related('session')}
+    assert sorted(replayed) == ['replay-1', 'replay-2', 'replay-saved']
+    assert replayed['replay-1'].passed and not replayed['replay-2'].passed
+    for session_id in ('replay-1', 'replay-2'):
+        result = replayed[session_id]
+        assert result.validation_timestamp == recorded_at and result.created_at == recorded_at
+        values = MeasurementValue.objects.filter(result=result)
+        assert values.count() == 20
+        assert set(values.values_list('timestamp', flat=True)) == {recorded_at}
+    assert replayed['replay-saved'].validation_timestamp > recorded_at + timedelta(days=1)
+
+    # Rollups were rebuilt, so the replayed day is counted
+    day = DailyQCRollup.objects.get(date=recorded_at.date())
+    assert (day.passed, day.failed) == (1, 1)
+
+    # Replaying again finds nothing missing
+    out = StringIO()
+    call_command('replay_audit_log', path=str(path), stdout=out)
+    assert '0 replayed' in out.getvalue()
+
+    print("✓ Each missing session is saved once, with its original timestamps")
+
+
+def test_upload_busy_answers_503():
+    """Test an upload the write-behind queue has no room for gets 503 with Retry-After."""
+    setup_test_database()
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test import Client
+    from django.urls import reverse
+    from accounts.models import CustomUser
+    from measurements import views
+    from measurements.write_behind import WriteBehindFull
+
+    print("\n" + "="*70)
+    print("TEST 5: Upload - Busy Result Storage")
+    print("="*70)
+
+    class FullBuffer:
+        def submit(self, entries, product_id=None):
+            raise WriteBehindFull('Result storage is busy, please try again')
+
+    user = CustomUser.objects.create_user('upload_busy', password='unused', role='operator')
+    client = Client()
+    client.force_login(user)
+
+    get_result_buffer = views.get_result_buffer
+    views.get_result_buffer = lambda: FullBuffer()
+    try:
+        response = client.post(reverse('upload_analyze'), {
+            'measurement_file': SimpleUploadedFile('garment.txt', measurement_file()),
+            'size': '8/9',
+        })
+    finally:
+        views.get_result_buffer = get_result_buffer
+
+    print(f"Status: {response.status_code}, Retry-After: {response.get('Retry-After')}")
+    assert response.status_code == 503
+    assert int(response['Retry-After']) > 0
+    assert response.json() == {'status': 'error', 'message': 'Result storage is busy, please try again'}
+
+    print("✓ A full queue is answered with 503, not a generic error")
+
+
+def rollup_counts():
+    """({rollup key: (passed, failed)}, {rollup key + code: failures}) of every rollup row."""
+    from measurements.models import DailyQCCodeRollup, DailyQCRollup
+    counts = {
+        (r.date, r.size, r.article_type, r.operator_id): (r.passed, r.failed)
+        for r in DailyQCRollup.objects.all()
+    }
+    failures = {
+        (r.date, r.size, r.article_type, r.operator_id, r.code): r.failures
+        for r in DailyQCCodeRollup.objects.all()
+    }
+    return counts, failures
+
+
+def test_rollups_count_saved_results():
+    """Test saved results are counted per day, size, article and operator, and per failing code."""
+    setup_test_database()
+    from django.utils import timezone
+    from measurements.persistence import save_validation_results
+    from measurements.rollups import rebuild_rollups
+
+    print("\n" + "="*70)
+    print("TEST 6: Daily QC Rollups - Counts From Saved Results")
+    print("="*70)
+
+    clear_results()
+    save_validation_results([
+        ('roll-1', '8/9', validation_result('8/9'), 'op-1'),
+        ('roll-2', '8/9', validation_result('8/9', {'A': 5}), 'op-1'),
+        ('roll-3', '9/10', validation_result('9/10'), 'op-2'),
+    ], audit=False)
+    # A second save increments the rows the first one created
+    save_validation_results([
+        ('roll-4', '8/9', validation_result('8/9', {'A': 5, 'B': -5}), 'op-1'),
+        ('roll-5', '9/10', validation_result('9/10', {'B': 5}), None),
+    ], audit=False)
+
+    today = timezone.localdate()
+    expected_counts = {
+        (today, '8/9', 'sweat_shirt', 'op-1'): (1, 2),
+        (today, '9/10', 'sweat_shirt', 'op-2'): (1, 0),
+        (today, '9/10', 'sweat_shirt', ''): (0, 1),
+    }
+    expected_failures = {
+        (today, '8/9', 'sweat_shirt', 'op-1', 'A'): 2,
+        (today, '8/9', 'sweat_shirt', 'op-1', 'B'): 1,
+        (today, '9/10', 'sweat_shirt', '', 'B'): 1,
+    }
+
+    counts, failures = rollup_counts()
+    print(f"Rollups: {counts}")
+    print(f"Code failures: {failures}")
+    assert counts == expected_counts
+    assert failures == expected_failures
+
+    # Rebuilding from the results gives the same rows
+    assert rebuild_rollups() == 3
+    assert rollup_counts() == (expected_counts, expected_failures)
+
+    print("✓ Incremental and rebuilt rollups agree")
+
+
+def test_rollup_migration_counts_existing_results():
+    """Test migration 0005 rolls up the results saved before it."""
+    setup_test_database()
+    from datetime import datetime, timezone as dt_timezone
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+
+    print("\n" + "="*70)
+    print("TEST 7: Migration 0005 - Rolling Up Existing Results")
+    print("="*70)
+
+    clear_results()
+    before = [('measurements', '0004_backfill_measurementvalue')]
+    executor = MigrationExecutor(connection)
+    executor.migrate(before)
+    try:
+        old_apps = executor.loader.project_state(before).apps
+        Session = old_apps.get_model('measurements', 'MeasurementSession')
+        Result = old_apps.get_model('measurements', 'MeasurementResult')
+        Value = old_apps.get_model('measurements', 'MeasurementValue')
+        validated_at = datetime(2026, 2, 10, 14, 0, tzinfo=dt_timezone.utc)
+        for session_id, offsets in (('legacy-1', {}), ('legacy-2', {'C': 5})):
+            details = validation_result('8/9', offsets)['measurements']
+            result = Result.objects.create(
+                session=Session.objects.create(session_id=session_id, status='completed'),
+                size='8/9', measurement_details=details, passed=not offsets, operator_id='op-9',
+            )
+            Result.objects.filter(id=result.id).update(validation_timestamp=validated_at)
+            Value.objects.bulk_create([
+                Value(result_id=result.id, size='8/9', code=m['code'], measured_value=m['measured_value'],
+                      standard_value=m['standard_value'], deviation=m['deviation'], tolerance=m['tolerance'],
+                      passed=m['status'] == 'PASS', timestamp=validated_at)
+                for m in details
+            ])
+    finally:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes('measurements'))
+
+    counts, failures = rollup_counts()
+    print(f"Rollups after migrating: {counts}, {failures}")
+    day = validated_at.date()
+    assert counts == {(day, '8/9', 'sweat_shirt', 'op-9'): (1, 1)}
+    assert failures == {(day, '8/9', 'sweat_shirt', 'op-9', 'C'): 1}
+
+    print("✓ History from before the rollups is counted by the migration")
+
+
+def test_saved_result_values():
+    """Test saving a result writes one MeasurementValue per measured code."""
+    setup_test_database()
+    from measurements.models import MeasurementResult, MeasurementValue
+    from measurements.persistence import save_validation_results
+
+    print("\n" + "="*70)
+    print("TEST 8: Result Storage - One Value Row per Code")
+    print("="*70)
+
+    clear_results()
+    result = validation_result('8/9', {'A': 0.4, 'B': -2, 'H': 0.6})
+    saved, = save_validation_results([('values-1', '8/9', result, 'op-1')], audit=False)
+
+    values = {v.code: v for v in MeasurementValue.objects.filter(result=saved)}
+    print(f"Value rows: {len(values)}")
+    for code in ('A', 'B', 'H'):
+        v = values[code]
+        print(f"  {code}: measured {v.measured_value} standard {v.standard_value} "
+              f"deviation {v.deviation} tolerance {v.tolerance} {v.status}")
+
+    assert sorted(values) == sorted(m['code'] for m in result['measurements']) and len(values) == 20
+    a, b, h = values['A'], values['B'], values['H']
+    assert (a.measured_value, a.standard_value, a.deviation, a.tolerance, a.passed) == (56.9, 56.5, 0.4, 1.0, True)
+    assert (b.measured_value, b.standard_value, b.deviation, b.tolerance, b.passed) == (47.2, 49.2, 2.0, 1.0, False)
+    assert (h.deviation, h.tolerance, h.passed) == (0.6, 0.5, False)
+    stored = MeasurementResult.objects.get(id=saved.id)
+    assert all(v.size == '8/9' and v.timestamp == stored.validation_timestamp for v in values.values())
+    assert sum(v.passed for v in values.values()) == 18 and not stored.passed
+
+    print("✓ Every measured code is stored with its deviation, tolerance and verdict")
+
+
+def test_value_backfill_migration():
+    """Test migration 0004 converts existing measurement_details and skips malformed entries."""
+    setup_test_database()
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+    from measurements.models import MeasurementValue
+
+    print("\n" + "="*70)
+    print("TEST 9: Migration 0004 - Backfilling Value Rows")
+    print("="*70)
+
+    clear_results()
+    before = [('measurements', '0003_measurementvalue')]
+    details = {
+        'legacy-full': [
+            {'code': 'A', 'measured_value': 56.9, 'standard_value': 56.5, 'deviation': 0.4,
+             'tolerance': 1.0, 'status': 'PASS'},
+            {'code': 'H', 'measured_value': 18.9, 'standard_value': 18.3, 'deviation': 0.6,
+             'tolerance': 0.5, 'status': 'FAIL'},
+        ],
+        'legacy-partial': [
+            # No deviation (worked out from the standard) and no tolerance (1 cm)
+            {'code': 'B', 'measured_value': '47.2', 'standard_value': '49.2', 'status': 'FAIL'},
+            'not a measurement',
+            {'measured_value': 50.0, 'status': 'PASS'},
+            {'code': 'C', 'status': 'PASS'},
+            {'code': 'D', 'measured_value': 40.0, 'standard_value': None, 'status': 'PASS'},
+        ],
+        'legacy-not-a-list': {'A': 56.9},
+    }
+    executor = MigrationExecutor(connection)
+    executor.migrate(before)
+    try:
+        old_apps = executor.loader.project_state(before).apps
+        Session = old_apps.get_model('measurements', 'MeasurementSession')
+        Result = old_apps.get_model('measurements', 'MeasurementResult')
+        for session_id, measurement_details in details.items():
+            Result.objects.create(
+                session=Session.objects.create(session_id=session_id, status='completed'),
+                size='8/9', measurement_details=measurement_details, operator_id='op-1',
+            )
+    finally:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes('measurements'))
+
+    values = {
+        (v.result.session.session_id, v.code): v
+        for v in MeasurementValue.objects.select_related('result__session')
+    }
+    print(f"Backfilled: {sorted(values)}")
+
+    assert sorted(values) == [('legacy-full', 'A'), ('legacy-full', 'H'), ('legacy-partial', 'B')]
+    h, b = values['legacy-full', 'H'], values['legacy-partial', 'B']
+    assert (h.measured_value, h.deviation, h.tolerance, h.passed) == (18.9, 0.6, 0.5, False)
+    assert (b.measured_value, b.standard_value, b.deviation, b.tolerance, b.passed) == (47.2, 49.2, 2.0, 1.0, False)
+    assert all(v.size == '8/9' and v.timestamp == v.result.validation_timestamp for v in values.values())
+
+    print("✓ Well-formed details become value rows, malformed ones are skipped")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ RESULT STORAGE - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_audit_log_group_commit()
+        test_audit_log_failed_write_not_duplicated()
+        test_audit_log_hash_check()
+        test_replay_audit_log()
+        test_upload_busy_answers_503()
+        test_rollups_count_saved_results()
+        test_rollup_migration_counts_existing_results()
+        test_saved_result_values()
+        test_value_backfill_migration()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • Audit records are written and fsynced in groups")
+        print("  • A failed audit write is retried without duplicating lines")
+        print("  • Lines whose hash doesn't match are skipped on read")
+        print("  • Replay saves each missing session once, at its original time")
+        print("  • A busy result store answers uploads with 503")
+        print("  • Saved results are counted in the daily rollups, per failing code too")
+        print("  • Migration 0005 rolls up results saved before it")
+        print("  • Each saved result has one value row per measured code")
+        print("  • Migration 0004 backfills value rows and skips malformed details")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,185 @@
+"""
+Test suite for the results history API.
+Tests the keyset pagination walk, the filters and malformed requests.
+"""
+
+import base64
+from datetime import datetime
+
+from magic_qc.testing import clear_results, save_result_at, setup_test_database, validation_result
+
+
+def at(*args) -> datetime:
+    """Aware datetime in the current time zone."""
+    from django.utils import timezone
+    return timezone.make_aware(datetime(*args), timezone.get_current_timezone())
+
+
+def history_client():
+    """Test client logged in as a QC user."""
+    from django.test import Client
+    from accounts.models import CustomUser
+    user, _ = CustomUser.objects.get_or_create(username='history_viewer', defaults={'role': 'admin'})
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def save_history():
+    """
+    Save twelve results, several sharing a created_at, and return them newest first.
+    Sizes alternate 8/9 and 9/10, every third fails, operators alternate op-1 and op-2.
+    """
+    timestamps = [at(2026, 4, 1, 9, 0)] * 5 + [at(2026, 4, 2, 9, 0)] * 4 + [at(2026, 4, 3, 9, 0)] * 3
+    saved = []
+    for i, validated_at in enumerate(timestamps):
+        size = '8/9' if i % 2 == 0 else '9/10'
+        offsets = {'A': 3.0} if i % 3 == 0 else None
+        operator_id = f'op-{i % 2 + 1}'
+        saved.append(save_result_at(
+            f'history-{i}', size, validation_result(size, offsets, operator_id), operator_id, validated_at
+        ))
+    return sorted(saved, key=lambda result: (result.created_at, result.id), reverse=True)
+
+
+def walk(client, query: str, limit: int) -> list:
+    """Ids of every page of a history query, following next_cursor to the end."""
+    from django.urls import reverse
+    url = f"{reverse('results_history')}?limit={limit}{query}"
+    ids, cursor, pages = [], None, 0
+    while True:
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        payload = response.json()
+        assert len(payload['results']) <= limit
+        ids.extend(row['id'] for row in payload['results'])
+        pages += 1
+        cursor = payload['next_cursor']
+        if cursor is None:
+            return ids
+        assert pages < 100
+
+
+def test_keyset_walk_across_equal_timestamps():
+    """Test paging through results that share created_at neither repeats nor skips any."""
+    setup_test_database()
+
+    print("\n" + "="*70)
+    print("TEST 1: Results History - Keyset Walk")
+    print("="*70)
+
+    clear_results()
+    client = history_client()
+    expected = [result.id for result in save_history()]
+
+    for limit in (1, 2, 4, 5, 12, 50):
+        ids = walk(client, '', limit)
+        print(f"limit={limit}: {len(ids)} results")
+        assert ids == expected, f"limit={limit}"
+
+    clear_results()
+    print("✓ Every page size walks all results once, newest first, ties broken by id")
+
+
+def test_history_filters():
+    """Test the size, result, operator and date range filters, alone and combined."""
+    setup_test_database()
+
+    print("\n" + "="*70)
+    print("TEST 2: Results History - Filters")
+    print("="*70)
+
+    clear_results()
+    client = history_client()
+    saved = save_history()
+
+    def expected(predicate):
+        return [result.id for result in saved if predicate(result)]
+
+    cases = [
+        ('&size=9/10', lambda r: r.size == '9/10'),
+        ('&result=pass', lambda r: r.passed),
+        ('&result=FAIL', lambda r: not r.passed),
+        ('&operator=op-2', lambda r: r.operator_id == 'op-2'),
+        ('&start=2026-04-02', lambda r: r.created_at >= at(2026, 4, 2)),
+        ('&end=2026-04-01', lambda r: r.created_at < at(2026, 4, 2)),
+        ('&start=2026-04-02&end=2026-04-02', lambda r: at(2026, 4, 2) <= r.created_at < at(2026, 4, 3)),
+        ('&size=8/9&result=fail&start=2026-04-01&end=2026-04-02',
+         lambda r: r.size == '8/9' and not r.passed and r.created_at < at(2026, 4, 3)),
+    ]
+    for query, predicate in cases:
+        ids = walk(client, query, 2)
+        print(f"{query}: {len(ids)} results")
+        assert ids and ids == expected(predicate), query
+
+    assert walk(client, '&operator=op-9', 2) == []
+
+    clear_results()
+    print("✓ Each filter, and their combination, pages through exactly the matching results")
+
+
+def test_history_bad_requests():
+    """Test malformed cursors and parameters are answered with 400."""
+    setup_test_database()
+    from django.urls import reverse
+
+    print("\n" + "="*70)
+    print("TEST 3: Results History - Bad Requests")
+    print("="*70)
+
+    client = history_client()
+    url = reverse('results_history')
+
+    def encoded(text):
+        return base64.urlsafe_b64encode(text.encode()).decode()
+
+    bad_queries = [
+        'cursor=not-a-cursor',
+        f"cursor={encoded('no separator')}",
+        f"cursor={encoded('2026-04-01T09:00:00+00:00|abc')}",
+        f"cursor={encoded('yesterday|12')}",
+        'limit=0',
+        'limit=ten',
+        'result=maybe',
+        'start=04/01/2026',
+    ]
+    for query in bad_queries:
+        response = client.get(f'{url}?{query}')
+        print(f"{query}: {response.status_code}")
+        assert response.status_code == 400, query
+        assert response.json()['status'] == 'error'
+
+    print("✓ Malformed cursors, limits, result filters and dates get 400")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ RESULTS HISTORY - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_keyset_walk_across_equal_timestamps()
+        test_history_filters()
+        test_history_bad_requests()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • The keyset walk returns every result once across equal timestamps")
+        print("  • Size, result, operator and date filters select exactly the matching results")
+        print("  • Malformed cursors and parameters get 400")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,130 @@
+"""
+Test suite for the size chart endpoints.
+Tests the ETags of the size list and size chart, and that answering them
+needs no operator session query.
+"""
+
+from magic_qc.testing import create_size_chart, setup_test_database
+
+
+def chart_client():
+    """Test client logged in as an operator."""
+    from django.test import Client
+    from accounts.models import CustomUser
+    user, _ = CustomUser.objects.get_or_create(username='size_chart_viewer', defaults={'role': 'operator'})
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def session_queries(queries) -> list:
+    """The captured queries that read operator sessions."""
+    from accounts.models import OperatorSession
+    return [query['sql'] for query in queries if OperatorSession._meta.db_table in query['sql']]
+
+
+def test_size_list_etag():
+    """Test the size list answers 304 without a session query, and a chart save changes its ETag."""
+    setup_test_database()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from products.models import StandardSizeChart
+
+    print("\n" + "="*70)
+    print("TEST 1: Size List - ETag and 304")
+    print("="*70)
+
+    client = chart_client()
+    url = reverse('get_available_sizes') + '?article_type=pants'
+    response = client.get(url)
+    etag = response['ETag']
+    assert response.status_code == 200 and response.json()['article_type'] == 'pants'
+    assert 'XL' not in response.json()['sizes']
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert not session_queries(queries.captured_queries)
+
+    # The list without article_type follows the operator's session, so it has no ETag
+    response = client.get(reverse('get_available_sizes'))
+    assert response.status_code == 200 and not response.has_header('ETag')
+
+    chart = create_size_chart('pants', 'XL')
+    try:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        print(f"ETag: {etag} -> {response['ETag']}")
+        assert response.status_code == 200 and response['ETag'] != etag
+        assert 'XL' in response.json()['sizes']
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+    finally:
+        StandardSizeChart.objects.filter(id=chart.id).delete()
+
+    print("✓ 304 with no session query; saving a chart changes the ETag")
+
+
+def test_size_chart_etag():
+    """Test one size chart answers 304 until that chart is edited."""
+    setup_test_database()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from products.models import StandardSizeChart
+
+    print("\n" + "="*70)
+    print("TEST 2: Size Chart - ETag and 304")
+    print("="*70)
+
+    client = chart_client()
+    url = reverse('get_size_chart') + '?article_type=pants&size=XL'
+    chart = create_size_chart('pants', 'XL', 20.0)
+    try:
+        response = client.get(url)
+        etag = response['ETag']
+        assert response.status_code == 200 and response.json()['chart']['A'] == 20.0
+
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert not session_queries(queries.captured_queries)
+
+        chart.A_length_from_shoulder = 21
+        chart.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        print(f"ETag: {etag} -> {response['ETag']}")
+        assert response.status_code == 200 and response['ETag'] != etag
+        assert response.json()['chart']['A'] == 21.0
+    finally:
+        StandardSizeChart.objects.filter(id=chart.id).delete()
+
+    print("✓ 304 with no session query; editing the chart changes the ETag")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ SIZE CHART ENDPOINTS - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_size_list_etag()
+        test_size_chart_etag()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • The size list answers 304 without a session query, until a chart is saved")
+        print("  • A size chart answers 304 without a session query, until it is edited")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
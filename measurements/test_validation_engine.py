@@ -3,14 +3,30 @@ Test suite for measurement validation engine.
 Tests the complete workflow: parsing, validation, and results.
 """
 
+import io
 import os
+import random
 import tempfile
+import threading
+import time
+import tracemalloc
+from measurements import utils
 from measurements.utils import (
+    REPORT_STREAM_BUFFER,
     MeasurementFileParser,
     MeasurementValidator,
     MeasurementValidationEngine,
+    ReportStreamWriter,
     STANDARD_SIZE_CHART_SWEATSHIRT,
+    set_size_chart_source,
+    set_tolerance_rule_source,
 )
+from magic_qc.testing import setup_django
+
+
+def restore_source(set_source, source):
+    """Re-register a size chart or tolerance rule source saved before a test replaced it."""
+    set_source(*(source or (None,)))
 
 
 def create_test_file(content: str) -> str:
@@ -330,6 +346,659 @@ T: 3.0
         os.unlink(file_path)
 
 
+def test_parser_stream_matches_file():
+    """Test in-memory parsing gives the same output as the temp-file path."""
+    print("\n" + "="*70)
+    print("TEST 8: Parser - Stream/Bytes Match File Parsing")
+    print("="*70)
+    
+    test_content = "A: 50.1\r\nB = 48.3\rC: 44.0 cm\nD: 0\nE: 40.7x 2\nbad line\n"
+    
+    file_path = create_test_file(test_content)
+    try:
+        expected = MeasurementFileParser.parse_file(file_path)
+    finally:
+        os.unlink(file_path)
+    
+    data = test_content.encode('utf-8')
+    from_bytes = MeasurementFileParser.parse_bytes(data)
+    from_text_stream = MeasurementFileParser.parse_stream(io.StringIO(test_content, newline=None))
+    
+    print(f"File:   {expected}")
+    print(f"Bytes:  {from_bytes}")
+    
+    assert from_bytes == expected
+    assert from_text_stream == expected
+    assert MeasurementFileParser.parse_bytes(b'') == ({}, ["Error: File is empty"])
+    assert MeasurementFileParser.parse_bytes(b'A: 50.1\n\xff\n') == ({}, ["Error: File is not UTF-8 encoded"])
+    
+    print("✓ In-memory parsing matches file parsing")
+
+
+def test_parser_format_fallback_matches_general():
+    """Test lines that break the detected format keep the general parser's output."""
+    print("\n" + "="*70)
+    print("TEST 9: Parser - Format Detection and Fallback")
+    print("="*70)
+    
+    test_content = """A: 50.1
+B = 0
+A = 50.3
+Chest Width (1/2 Armhole) (C): 39.0
+Chest: 44
+D: 46.0x 2
+E: -5.0
+"""
+    
+    measured_values, errors = MeasurementFileParser.parse_bytes(test_content.encode('utf-8'))
+    
+    print(f"Detected format: {MeasurementFileParser.detect_line_format(['A: 50.1', 'B = 0', 'A = 50.3'])}")
+    print(f"Parsed values: {measured_values}")
+    print(f"Parse errors: {errors}")
+    
+    assert MeasurementFileParser.detect_line_format(['A: 50.1', 'B = 0', 'A = 50.3']) == 'code_value'
+    assert MeasurementFileParser.detect_line_format(['Chest Width (B): 44.0']) == 'description_with_code'
+    assert measured_values == {'A': 50.1, 'C': 39.0, 'T': 44.0, 'D': 46.0}
+    assert errors == [
+        "Line 2: Measurement B must be positive, got 0.0",
+        "Line 2: Measurement B must be positive, got 0.0",
+        "Line 2: Could not parse line format: 'B = 0'",
+        "Line 3: Duplicate measurement code 'A'",
+        "Line 3: Duplicate measurement code 'A'",
+        "Line 3: Could not parse line format: 'A = 50.3'",
+        "Line 7: Could not parse line format: 'E: -5.0'",
+    ]
+    
+    print("✓ Fallback lines produce the same values and errors")
+
+
+def test_batch_validator_matches_per_garment():
+    """Test vectorized batch validation matches the per-garment engine row by row."""
+    print("\n" + "="*70)
+    print("TEST 10: Batch Validator - Matches Per-Garment Results")
+    print("="*70)
+    
+    rng = random.Random(42)
+    sizes = sorted(STANDARD_SIZE_CHART_SWEATSHIRT.keys()) + ['XXL']
+    rows, row_sizes = [], []
+    for _ in range(300):
+        size = rng.choice(sizes)
+        chart = STANDARD_SIZE_CHART_SWEATSHIRT.get(size, STANDARD_SIZE_CHART_SWEATSHIRT['6/7'])
+        measured = {
+            code: round(value + rng.uniform(-1.5, 1.5), 1)
+            for code, value in chart.items()
+            if code != 'PRINT_PLACEMENT_FROM_CF' or rng.random() < 0.5
+        }
+        if rng.random() < 0.05:
+            del measured[rng.choice('ABCDEFGHIJKLMNOPQRST')]
+        rows.append(measured)
+        row_sizes.append(size)
+    
+    batch = MeasurementValidator.validate_batch(MeasurementValidator.to_batch_matrix(rows), row_sizes)
+    
+    print(f"Garments: {len(rows)}, passed: {int(batch['passed'].sum())}, invalid: {int((~batch['valid']).sum())}")
+    
+    for row, (measured, size) in enumerate(zip(rows, row_sizes)):
+        expected = MeasurementValidator.validate_measurements(measured, size)
+        actual = MeasurementValidator.batch_row_result(batch, row)
+        expected.pop('timestamp')
+        actual.pop('timestamp')
+        assert actual == expected, f"Row {row} ({size}) differs"
+        assert bool(batch['passed'][row]) == expected['success']
+    
+    print("✓ Batch results match the per-garment engine for every row")
+
+
+def test_table_parser_chunks_and_errors():
+    """Test CSV/TSV tables validate row by row in chunks with text parser messages."""
+    print("\n" + "="*70)
+    print("TEST 11: Table Parser - Chunked CSV/TSV Validation")
+    print("="*70)
+    
+    codes = 'ABCDEFGHIJKLMNOPQRST'
+    chart = STANDARD_SIZE_CHART_SWEATSHIRT['8/9']
+    good = '\t'.join(str(chart[code]) for code in codes)
+    bad_b = good.replace(str(chart['B']), 'x', 1)
+    negative_d = good.replace(str(chart['D']), '-5.0', 1)
+    failing_a = good.replace(str(chart['A']), str(chart['A'] + 2), 1)
+    
+    test_content = "\n".join([
+        "garment\tsize\t" + "\t".join(codes),
+        f"g1\t8/9\t{good}",
+        f"g2\t8/9\t{bad_b}",
+        "",
+        f"g3\tXXL\t{good}",
+        f"g4\t8/9\t{negative_d}",
+        f"g5\t8/9\t{failing_a}",
+    ]) + "\n"
+    
+    chunks = list(MeasurementValidationEngine.validate_table(io.StringIO(test_content), chunk_rows=2))
+    labels = [label for chunk in chunks for label in chunk['labels']]
+    errors = [errors for chunk in chunks for errors in chunk['row_errors']]
+    valid = [bool(v) for chunk in chunks for v in chunk['batch']['valid']]
+    passed = [bool(p) for chunk in chunks for p in chunk['batch']['passed']]
+    
+    print(f"Chunks: {len(chunks)}, rows: {labels}")
+    print(f"Row errors: {errors}")
+    
+    assert labels == ['g1', 'g2', 'g3', 'g4', 'g5']
+    assert valid == [True, False, False, False, True]
+    assert passed == [True, False, False, False, False]
+    assert errors[0] == [] and errors[4] == []
+    assert errors[1] == [
+        "Line 3: Invalid numeric value 'x' for code B",
+        "Line 3: Missing required measurement(s): B",
+    ]
+    assert errors[2][0].startswith("Line 5: Invalid size 'XXL'")
+    assert errors[3][0] == "Line 6: Measurement D must be positive, got -5.0"
+    
+    print("✓ Table rows validated in chunks with per-row errors")
+
+
+def test_size_chart_source_recompiles_on_version_change():
+    """Test a registered size chart source is used and recompiled when its version changes."""
+    print("\n" + "="*70)
+    print("TEST 12: Size Chart Source - Recompile on Version Change")
+    print("="*70)
+    
+    charts = {'8/9': dict(STANDARD_SIZE_CHART_SWEATSHIRT['8/9'])}
+    version = [1]
+    measured = dict(STANDARD_SIZE_CHART_SWEATSHIRT['8/9'])
+    
+    original_source = utils._size_chart_source
+    set_size_chart_source(lambda article_type: charts, lambda: version[0])
+    try:
+        assert MeasurementValidationEngine.get_available_sizes() == ['8/9']
+        assert MeasurementValidator.validate_measurements(measured, '8/9')['success']
+        
+        # Same version: the compiled charts are reused
+        charts['8/9'] = dict(charts['8/9'], A=charts['8/9']['A'] + 5)
+        assert MeasurementValidator.validate_measurements(measured, '8/9')['success']
+        
+        version[0] += 1
+        result = MeasurementValidator.validate_measurements(measured, '8/9')
+        print(f"After version bump: {result['overall_result']}")
+        assert not result['success']
+        assert MeasurementValidationEngine.get_size_chart('8/9')['A'] == measured['A'] + 5
+    finally:
+        restore_source(set_size_chart_source, original_source)
+    
+    assert MeasurementValidator.validate_measurements(measured, '8/9')['success']
+    print("✓ Size chart source changes take effect on version bump")
+
+
+def test_article_type_engines():
+    """Test each article type validates against its own code set, chart and tolerances."""
+    print("\n" + "="*70)
+    print("TEST 13: Article Types - Per-Article Code Sets and Tolerances")
+    print("="*70)
+    
+    pants_chart = {"A": 30.0, "B": 40.0, "C": 20.0, "D": 28.0, "E": 60.0,
+                   "F": 85.0, "G": 24.0, "H": 18.0, "I": 14.0, "J": 3.5}
+    tshirt_chart = {code: value for code, value in STANDARD_SIZE_CHART_SWEATSHIRT['8/9'].items()
+                    if code not in {"M", "S"}}
+    charts = {'pants': {'8/9': pants_chart}, 'tshirt': {'8/9': tshirt_chart}}
+    original_source = utils._size_chart_source
+    set_size_chart_source(lambda article_type: charts.get(article_type, {}))
+    try:
+        # Pants: own codes, stricter rise tolerance
+        measured = dict(pants_chart, C=20.7)
+        result = MeasurementValidator.validate_measurements(measured, '8/9', article_type='pants')
+        print(f"Pants with C off by 0.7: {result['overall_result']}")
+        assert not result['success']
+        assert [m['code'] for m in result['measurements'] if m['status'] == 'FAIL'] == ['C']
+        assert result['measurements'][0]['measurement_name'] == 'Waist (Relaxed)'
+        
+        # A sweatshirt code is unknown on pants
+        content = "\n".join(f"{code}: {value}" for code, value in dict(pants_chart, K=12.0).items())
+        test_file = create_test_file(content)
+        try:
+            file_result = MeasurementValidationEngine.validate_file(test_file, '8/9', article_type='pants')
+        finally:
+            os.unlink(test_file)
+        assert not file_result['file_parsed']
+        assert "Invalid measurement code(s): K" in file_result['parse_errors']
+        
+        # T-shirt: no cuff/waistband codes required
+        result = MeasurementValidator.validate_measurements(dict(tshirt_chart), '8/9', article_type='tshirt')
+        assert result['success'], result['error_messages']
+        
+        # Batch path agrees with the per-garment path
+        rows = [measured, pants_chart, dict(pants_chart, K=1.0)]
+        batch = MeasurementValidator.validate_batch(
+            MeasurementValidator.to_batch_matrix(rows), ['8/9'] * 3, article_type='pants'
+        )
+        assert batch['passed'].tolist() == [False, True, False]
+        assert batch['valid'].tolist() == [True, True, False]
+        
+        # Sweatshirt engine unaffected, unknown article reported
+        assert MeasurementValidationEngine.get_available_sizes('hoodie') == []
+        result = MeasurementValidator.validate_measurements(pants_chart, '8/9', article_type='jacket')
+        assert result['error_messages'][0].startswith("Invalid article type 'jacket'")
+    finally:
+        restore_source(set_size_chart_source, original_source)
+    
+    print("✓ Each article type uses its own codes, chart and tolerances")
+
+
+def test_tolerance_rules_per_size_and_asymmetric():
+    """Test DB-style tolerance rules: per-size, asymmetric limits and the reported rule version."""
+    print("\n" + "="*70)
+    print("TEST 14: Tolerance Rules - Per-Size Asymmetric Limits")
+    print("="*70)
+    
+    chart = STANDARD_SIZE_CHART_SWEATSHIRT['8/9']
+    rules = {
+        (None, 'B'): (0.5, 2.0),    # All sizes: -0.5 / +2.0
+        ('8/9', 'B'): (0.3, 1.5),   # Size 8/9 overrides the all-sizes rule
+        (None, 'H'): (0.2, 0.8),
+    }
+    original_source = utils._tolerance_rule_source
+    set_tolerance_rule_source(lambda article_type: rules, lambda: 'rules-v1')
+    try:
+        rows = [
+            dict(chart, B=chart['B'] + 1.4),   # within +1.5
+            dict(chart, B=chart['B'] - 0.4),   # beyond -0.3
+            dict(chart, H=chart['H'] + 0.7),   # within +0.8 (default would fail)
+            dict(chart, H=chart['H'] - 0.3),   # beyond -0.2
+        ]
+        results = [MeasurementValidator.validate_measurements(row, '8/9') for row in rows]
+        print(f"Results: {[r['overall_result'] for r in results]}")
+        assert [r['success'] for r in results] == [True, False, True, False]
+        assert all(r['summary']['tolerance_rule_version'] == 'rules-v1' for r in results)
+        
+        b_result = next(m for m in results[1]['measurements'] if m['code'] == 'B')
+        assert (b_result['tolerance_minus'], b_result['tolerance_plus']) == (0.3, 1.5)
+        assert b_result['tolerance'] == 0.3
+        
+        # The all-sizes rule applies to other sizes
+        other = dict(STANDARD_SIZE_CHART_SWEATSHIRT['9/10'])
+        other['B'] += 1.9
+        assert MeasurementValidator.validate_measurements(other, '9/10')['success']
+        
+        # Batch path uses the same bounds
+        batch = MeasurementValidator.validate_batch(MeasurementValidator.to_batch_matrix(rows), ['8/9'] * 4)
+        assert batch['passed'].tolist() == [True, False, True, False]
+        for row, expected in enumerate(results):
+            actual = MeasurementValidator.batch_row_result(batch, row)
+            expected.pop('timestamp')
+            actual.pop('timestamp')
+            assert actual == expected, f"Row {row} differs"
+    finally:
+        restore_source(set_tolerance_rule_source, original_source)
+    
+    result = MeasurementValidator.validate_measurements(rows[2], '8/9')
+    assert not result['success'] and result['summary']['tolerance_rule_version'] != 'rules-v1'
+    print("✓ Per-size asymmetric limits applied and rule version reported")
+
+
+def test_gate_mode_matches_full_verdict():
+    """Test gate mode gives the full workflow's verdict and its first failing code."""
+    print("\n" + "="*70)
+    print("TEST 15: Gate Mode - Fail-Fast Verdict Matches Full Report")
+    print("="*70)
+    
+    rng = random.Random(7)
+    sizes = sorted(STANDARD_SIZE_CHART_SWEATSHIRT.keys()) + ['XXL']
+    for _ in range(200):
+        size = rng.choice(sizes)
+        chart = STANDARD_SIZE_CHART_SWEATSHIRT.get(size, STANDARD_SIZE_CHART_SWEATSHIRT['6/7'])
+        measured = {code: round(value + rng.uniform(-1.2, 1.2), 1) for code, value in chart.items()}
+        if rng.random() < 0.1:
+            del measured[rng.choice('ABCDEFGHIJKLMNOPQRST')]
+        data = "\n".join(f"{code}: {value}" for code, value in measured.items()).encode('utf-8')
+        
+        full = MeasurementValidationEngine.validate_bytes(data, size)
+        gate = MeasurementValidationEngine.validate_bytes(data, size, mode='gate')
+        failed_codes = [m['code'] for m in full['measurements'] if m['status'] == 'FAIL']
+        
+        assert gate['success'] == full['success']
+        assert gate['file_parsed'] == full['file_parsed']
+        assert gate['failed_code'] == (failed_codes[0] if failed_codes else None)
+        assert 'measurements' not in gate
+    
+    test_file = create_test_file("A: 99.0\nB: 49.2\n")
+    try:
+        verdict = MeasurementValidationEngine.validate_file(test_file, '8/9', mode='gate')
+    finally:
+        os.unlink(test_file)
+    print(f"Incomplete file verdict: {verdict['overall_result']}, errors: {verdict['errors']}")
+    assert not verdict['file_parsed'] and verdict['errors'][0].startswith("Missing required measurement(s)")
+    
+    print("✓ Gate verdicts match the full report")
+
+
+def test_report_stream_memory_is_flat():
+    """Test streaming 1M report rows keeps memory under a fixed ceiling."""
+    print("\n" + "="*70)
+    print("TEST 16: Report Streaming - 1M Rows Under a Memory Ceiling")
+    print("="*70)
+    
+    total_rows = 1_000_000
+    memory_ceiling = 4 * 1024 * 1024  # bytes
+    consumed = [0]
+    
+    def synthetic_rows():
+        for i in range(total_rows):
+            consumed[0] += 1
+            yield ['2024-01-15 10:30:00', f'session-{i}', 'op', 'sweat_shirt', '8/9',
+                   'B', 'Chest Width', 49.2, 48.7, 0.5, 1.0, 'PASS', 'PASS']
+    
+    tracemalloc.start()
+    try:
+        rows = chunks = 0
+        rows_at_first_chunk = None
+        for chunk in ReportStreamWriter.iter_csv(synthetic_rows()):
+            if rows_at_first_chunk is None:
+                rows_at_first_chunk = consumed[0]
+            assert len(chunk) < REPORT_STREAM_BUFFER * 2
+            rows += chunk.count('\n')
+            chunks += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    print(f"Rows: {rows}, chunks: {chunks}, first chunk after {rows_at_first_chunk} rows, peak: {peak / 1024:.0f} KiB")
+    assert rows == total_rows
+    assert rows_at_first_chunk < total_rows
+    assert peak < memory_ceiling
+    
+    print("✓ Report streams in bounded chunks with flat memory")
+
+
+def test_busy_retry_only_retries_locked_database():
+    """Test SQLITE_BUSY writes are retried and other errors are raised at once."""
+    from django.db import OperationalError
+    from measurements.sqlite import SQLITE_BUSY_RETRIES, run_with_busy_retry
+    
+    print("\n" + "="*70)
+    print("TEST 17: SQLite Busy Retry")
+    print("="*70)
+    
+    calls = [0]
+    
+    def locked_twice():
+        calls[0] += 1
+        if calls[0] <= 2:
+            raise OperationalError('database is locked')
+        return 'saved'
+    
+    assert run_with_busy_retry(locked_twice) == 'saved'
+    assert calls[0] == 3
+    
+    calls[0] = 0
+    
+    def no_such_table():
+        calls[0] += 1
+        raise OperationalError('no such table: measurements_measurementresult')
+    
+    try:
+        run_with_busy_retry(no_such_table)
+        assert False, "Non-busy error was swallowed"
+    except OperationalError:
+        pass
+    assert calls[0] == 1
+    
+    calls[0] = 0
+    
+    def always_locked():
+        calls[0] += 1
+        raise OperationalError('database is locked')
+    
+    try:
+        run_with_busy_retry(always_locked)
+        assert False, "Busy error was swallowed"
+    except OperationalError:
+        pass
+    assert calls[0] == SQLITE_BUSY_RETRIES
+    
+    print(f"Retried locked writes, gave up after {SQLITE_BUSY_RETRIES} attempts")
+    print("✓ Only busy errors are retried")
+
+
+def test_batch_archive_bad_members_and_limit():
+    """Test unreadable ZIP members and the file limit give per-file errors."""
+    import zipfile
+    from measurements import batch
+    
+    print("\n" + "="*70)
+    print("TEST 18: Batch Archives - Unreadable Members and File Limit")
+    print("="*70)
+    
+    good = b"A: 55.0\nB: 48.0\n"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        archive.writestr('good.txt', good)
+        archive.writestr('corrupt.txt', good)
+        archive.writestr('locked.txt', good)
+        archive.writestr('later.txt', good)
+    raw = bytearray(buffer.getvalue())
+    
+    # Corrupt the stored data of corrupt.txt (bad CRC) and mark locked.txt encrypted
+    with zipfile.ZipFile(io.BytesIO(bytes(raw))) as archive:
+        corrupt, locked = archive.getinfo('corrupt.txt'), archive.getinfo('locked.txt')
+    raw[corrupt.header_offset + 30 + len(corrupt.filename)] ^= 0xFF
+    central = raw.find(b'PK\x01\x02')
+    while raw[central + 46:central + 46 + len(locked.filename)] != b'locked.txt':
+        central = raw.find(b'PK\x01\x02', central + 4)
+    raw[central + 8] |= 0x01
+    
+    upload = io.BytesIO(bytes(raw))
+    upload.name = 'batch.zip'
+    results = {name: (data, error) for name, data, error in batch.iter_measurement_files([upload])}
+    for name, (data, error) in results.items():
+        print(f"  {name}: {error or 'ok'}")
+    
+    assert results['good.txt'] == (good, None)
+    assert results['later.txt'] == (good, None)
+    assert results['corrupt.txt'][0] is None and 'Cannot read file' in results['corrupt.txt'][1]
+    assert results['locked.txt'][0] is None and 'Cannot read file' in results['locked.txt'][1]
+    
+    original_limit = batch.BATCH_MAX_FILES
+    batch.BATCH_MAX_FILES = 2
+    try:
+        upload.seek(0)
+        files = list(batch.iter_measurement_files([upload]))
+    finally:
+        batch.BATCH_MAX_FILES = original_limit
+    
+    assert len(files) == 3
+    assert files[-1][1] is None and 'Batch limit of 2 files' in files[-1][2]
+    
+    print(f"Limit entry: {files[-1][0]}: {files[-1][2]}")
+    print("✓ Bad members and the file limit are reported per file")
+
+
+class RecordingWriteBuffer:
+    """
+    Patches the write-behind buffer so batches are recorded instead of saved
+    and nothing is audited; a save can be held back with `release`.
+    """
+    
+    def __init__(self, **settings):
+        from measurements import write_behind
+        self.module = write_behind
+        self.settings = settings
+        self.batches = []
+        self.audited = []
+        self.release = threading.Event()
+        self.release.set()
+    
+    def __enter__(self):
+        module = self.module
+        self.saved = {name: getattr(module, name) for name in self.settings}
+        self.saved_save = module.ResultWriteBuffer._save
+        self.saved_audit = module.audit_results
+        for name, value in self.settings.items():
+            setattr(module, name, value)
+        
+        def record(buffer, items):
+            self.release.wait(5)
+            self.batches.append([entries[0][0] for entries, _, _ in items])
+        
+        module.ResultWriteBuffer._save = record
+        module.audit_results = lambda entries, product_id=None: self.audited.extend(e[0] for e in entries)
+        return self
+    
+    def __exit__(self, *exc):
+        module = self.module
+        self.release.set()
+        for name, value in self.saved.items():
+            setattr(module, name, value)
+        module.ResultWriteBuffer._save = self.saved_save
+        module.audit_results = self.saved_audit
+
+
+def result_entry(session_id: str) -> tuple:
+    return (session_id, '8/9', {'success': True, 'measurements': []}, 'test')
+
+
+def test_write_behind_batches_and_flush():
+    """Test queued results are saved in bounded batches and flush() waits for them."""
+    setup_django()
+    
+    print("\n" + "="*70)
+    print("TEST 19: Write-Behind - Batching and Flush")
+    print("="*70)
+    
+    with RecordingWriteBuffer(WRITE_BEHIND_BATCH=3, WRITE_BEHIND_INTERVAL=0.5) as recorder:
+        buffer = recorder.module.ResultWriteBuffer()
+        # Hold the first batch so the rest pile up in the queue
+        recorder.release.clear()
+        sessions = [f's{i}' for i in range(8)]
+        for session_id in sessions:
+            buffer.submit([result_entry(session_id)])
+        recorder.release.set()
+        
+        assert buffer.flush(timeout=5)
+        saved = [session_id for batch in recorder.batches for session_id in batch]
+        print(f"Batches: {recorder.batches}")
+        
+        assert saved == sessions
+        assert recorder.audited == sessions
+        assert all(len(batch) <= 3 for batch in recorder.batches)
+        assert max(len(batch) for batch in recorder.batches) == 3
+        
+        assert buffer.save([result_entry('s8')]) == 1
+        assert recorder.batches[-1] == ['s8']
+        buffer.close(timeout=5)
+    
+    print("✓ Results are saved in batches of at most WRITE_BEHIND_BATCH, flush() waits for them")
+
+
+def test_write_behind_full_queue_raises():
+    """Test a full queue makes submitters wait, then raise WriteBehindFull without auditing."""
+    setup_django()
+    
+    print("\n" + "="*70)
+    print("TEST 20: Write-Behind - Backpressure")
+    print("="*70)
+    
+    with RecordingWriteBuffer(
+        WRITE_BEHIND_BATCH=1, WRITE_BEHIND_QUEUE_MAX=2, WRITE_BEHIND_SUBMIT_TIMEOUT=0.1
+    ) as recorder:
+        buffer = recorder.module.ResultWriteBuffer()
+        recorder.release.clear()
+        # One taken by the (held) writer, two fill the queue
+        buffer.submit([result_entry('s0')])
+        time.sleep(0.1)
+        buffer.submit([result_entry('s1')])
+        buffer.submit([result_entry('s2')])
+        
+        start = time.perf_counter()
+        try:
+            buffer.submit([result_entry('s3')])
+            assert False, "Submit to a full queue didn't raise"
+        except recorder.module.WriteBehindFull as e:
+            print(f"Rejected after {time.perf_counter() - start:.2f}s: {e}")
+        assert time.perf_counter() - start >= 0.1
+        assert 's3' not in recorder.audited
+        
+        recorder.release.set()
+        assert buffer.flush(timeout=5)
+        assert [batch[0] for batch in recorder.batches] == ['s0', 's1', 's2']
+        buffer.close(timeout=5)
+    
+    print("✓ Submitters wait for room, then get WriteBehindFull and nothing is queued")
+
+
+def test_write_behind_exit_drains_queue():
+    """Test the atexit hook saves what is queued and gives up on a stuck save."""
+    import atexit
+    setup_django()
+    
+    print("\n" + "="*70)
+    print("TEST 21: Write-Behind - Draining at Exit")
+    print("="*70)
+    
+    with RecordingWriteBuffer(WRITE_BEHIND_EXIT_TIMEOUT=0.2, _buffer=None) as recorder:
+        module = recorder.module
+        registered = []
+        register = atexit.register
+        module.atexit.register = lambda func, *args: registered.append((func, args))
+        try:
+            buffer = module.get_result_buffer()
+        finally:
+            module.atexit.register = register
+        assert module.get_result_buffer() is buffer and len(registered) == 1
+        exit_hook, exit_args = registered[0]
+        
+        for session_id in ('s0', 's1', 's2'):
+            buffer.submit([result_entry(session_id)])
+        exit_hook(*exit_args)
+        assert not buffer._thread.is_alive()
+        assert [session_id for batch in recorder.batches for session_id in batch] == ['s0', 's1', 's2']
+        
+        # A save that never finishes doesn't hold up the exit
+        stuck = module.ResultWriteBuffer()
+        recorder.release.clear()
+        stuck.submit([result_entry('s3')])
+        start = time.perf_counter()
+        stuck.close(*exit_args)
+        elapsed = time.perf_counter() - start
+        print(f"Exit with a stuck save returned after {elapsed:.2f}s")
+        assert elapsed < 2 and stuck._thread.is_alive()
+        recorder.release.set()
+        stuck.close(timeout=5)
+    
+    print("✓ Queued results are saved at exit, within WRITE_BEHIND_EXIT_TIMEOUT")
+
+
+def test_write_behind_exit_with_full_queue():
+    """Test flush() and close() give up on time when a stuck save leaves the queue full."""
+    setup_django()
+    
+    print("\n" + "="*70)
+    print("TEST 22: Write-Behind - Exit With a Full Queue")
+    print("="*70)
+    
+    with RecordingWriteBuffer(WRITE_BEHIND_BATCH=1, WRITE_BEHIND_QUEUE_MAX=2) as recorder:
+        buffer = recorder.module.ResultWriteBuffer()
+        recorder.release.clear()
+        # One taken by the stuck writer, two fill the queue
+        buffer.submit([result_entry('s0')])
+        time.sleep(0.1)
+        buffer.submit([result_entry('s1')])
+        buffer.submit([result_entry('s2')])
+        assert buffer._queue.full()
+        
+        start = time.perf_counter()
+        assert buffer.flush(timeout=0.2) is False
+        buffer.close(timeout=0.2)
+        elapsed = time.perf_counter() - start
+        print(f"flush() and close() returned after {elapsed:.2f}s")
+        assert elapsed < 2 and buffer._thread.is_alive()
+        
+        # Once the save comes unstuck everything queued is still saved
+        recorder.release.set()
+        assert buffer.flush(timeout=5)
+        assert [batch[0] for batch in recorder.batches] == ['s0', 's1', 's2']
+        buffer.close(timeout=5)
+        assert not buffer._thread.is_alive()
+    
+    print("✓ A full queue doesn't hold up flush() or close() past their timeout")
+
+
 def run_all_tests():
     """Run all tests."""
     print("\n" + "█"*70)
@@ -344,6 +1013,21 @@ def run_all_tests():
         test_validator_fail()
         test_validator_neck_width_special_tolerance()
         test_complete_workflow()
+        test_parser_stream_matches_file()
+        test_parser_format_fallback_matches_general()
+        test_batch_validator_matches_per_garment()
+        test_table_parser_chunks_and_errors()
+        test_size_chart_source_recompiles_on_version_change()
+        test_article_type_engines()
+        test_tolerance_rules_per_size_and_asymmetric()
+        test_gate_mode_matches_full_verdict()
+        test_report_stream_memory_is_flat()
+        test_busy_retry_only_retries_locked_database()
+        test_batch_archive_bad_members_and_limit()
+        test_write_behind_batches_and_flush()
+        test_write_behind_full_queue_raises()
+        test_write_behind_exit_drains_queue()
+        test_write_behind_exit_with_full_queue()
         
         print("\n" + "█"*70)
         print("█ ALL TESTS PASSED ✓")
@@ -356,6 +1040,21 @@ def run_all_tests():
         print("  • Measurements outside tolerance fail validation")
         print("  • Special tolerance (H: ±0.5cm) is applied correctly")
         print("  • Complete workflow produces correct results")
+        print("  • In-memory parsing matches file parsing")
+        print("  • Format fast path falls back without changing output")
+        print("  • Batch validation matches per-garment validation")
+        print("  • CSV/TSV tables are validated in chunks with per-row errors")
+        print("  • Size chart source changes are picked up on version bump")
+        print("  • Each article type has its own codes, chart and tolerances")
+        print("  • Per-size asymmetric tolerance rules are applied and versioned")
+        print("  • Gate mode verdicts match the full report")
+        print("  • Reports stream in bounded chunks with flat memory")
+        print("  • Locked SQLite writes are retried with backoff, other errors are not")
+        print("  • Unreadable archive members and the file limit are reported per file")
+        print("  • Write-behind results are saved in bounded batches and flushed")
+        print("  • A full write-behind queue pushes back with WriteBehindFull")
+        print("  • Queued results are saved at exit without hanging on a stuck save")
+        print("  • flush() and close() time out even while the queue is full")
         
     except AssertionError as e:
         print(f"\n✗ TEST FAILED: {e}")
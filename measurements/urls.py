@@ -4,9 +4,13 @@ from . import views
 urlpatterns = [
     path('', views.measurement_dashboard, name='measurement_dashboard'),
     path('upload-and-analyze/', views.upload_and_analyze, name='upload_analyze'),
+    path('upload-batch/', views.upload_batch_and_analyze, name='upload_batch_analyze'),
+    path('upload-table/', views.upload_table_and_analyze, name='upload_table_analyze'),
     path('save-qc-result/', views.save_qc_result, name='save_qc_result'),
     path('get-available-sizes/', views.get_available_sizes, name='get_available_sizes'),
     path('get-size-chart/', views.get_size_chart, name='get_size_chart'),
+    path('history/', views.results_history, name='results_history'),
     path('analytics/', views.analytics_dashboard, name='analytics_dashboard'),
+    path('analytics/charts/<str:kind>.png', views.analytics_chart, name='analytics_chart'),
     path('generate-daily-report/', views.generate_daily_report, name='generate_daily_report'),
 ]
\ No newline at end of file
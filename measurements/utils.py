@@ -1,14 +1,22 @@
 """
 MEASUREMENT VALIDATION ENGINE - Industrial Grade QC System
 Validates garment measurements against standard size charts with strict audit-safe rules.
-Sweatshirt measurement validation for sizes 6/7 to 13/14 years.
+Sweatshirt measurement validation for sizes 6/7 to 13/14 years; hoodie, T-shirt
+and pants are validated against their own code sets and tolerance tables.
 """
 
+import csv
+import io
+import math
 import re
 import json
+import threading
+from itertools import chain, islice
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Optional
+
+import numpy as np
 
 
 # ============================================================================
@@ -174,11 +182,441 @@ TOLERANCE_RULES = {
 }
 DEFAULT_TOLERANCE = 1.0  # For all other measurements
 
+# Human-readable measurement names
+MEASUREMENT_NAMES = {
+    "A": "Length from shoulder",
+    "B": "Chest Width",
+    "C": "Chest Width (1/2 Armhole)",
+    "D": "Bottom width (Above Waistband)",
+    "E": "Hem Width",
+    "F": "Back Width",
+    "G": "Back Width (1/2 Armhole)",
+    "H": "Neck Width (Seam to Seam)",
+    "I": "Sleeve Length",
+    "J": "Sleeve Width",
+    "K": "Sleeve Width (Above Cuff)",
+    "L": "Sleeve Opening",
+    "M": "Cuff Length",
+    "N": "Armhole",
+    "O": "Back Neck Drop",
+    "P": "Front Neck Drop",
+    "Q": "Collar Width",
+    "R": "Shoulder Drop",
+    "S": "Waistband Length",
+    "T": "Forward Shoulder Seam",
+    "PRINT_PLACEMENT_FROM_CF": "Print Placement From CF",
+}
+
+# Column order of batch measurement matrices (same order as per-garment results)
+MEASUREMENT_CODE_ORDER = tuple(sorted(ALL_VALID_CODES))
+
+
+# ----------------------------------------------------------------------------
+# Article types
+# ----------------------------------------------------------------------------
+# Each PurchaseOrder.article_type has its own code set, names and tolerance
+# table. Codes are the letters of the article's measurement sheet, so the same
+# letter can mean a different point of measure on another article.
+
+DEFAULT_ARTICLE_TYPE = "sweat_shirt"
+
+HOODIE_MEASUREMENT_NAMES = dict(MEASUREMENT_NAMES, Q="Hood Height")
+
+TSHIRT_REQUIRED_MEASUREMENT_CODES = REQUIRED_MEASUREMENT_CODES - {"M", "S"}  # No cuff or waistband
+TSHIRT_MEASUREMENT_NAMES = dict(
+    {code: name for code, name in MEASUREMENT_NAMES.items() if code not in {"M", "S"}},
+    Q="Neck Rib Width",
+)
+
+PANTS_MEASUREMENT_NAMES = {
+    "A": "Waist (Relaxed)",
+    "B": "Hip",
+    "C": "Front Rise",
+    "D": "Back Rise",
+    "E": "Inseam",
+    "F": "Outseam",
+    "G": "Thigh",
+    "H": "Knee",
+    "I": "Leg Opening",
+    "J": "Waistband Height",
+}
+PANTS_REQUIRED_MEASUREMENT_CODES = set(PANTS_MEASUREMENT_NAMES)
+PANTS_TOLERANCE_RULES = {
+    "C": 0.5,  # Front Rise
+    "D": 0.5,  # Back Rise
+    "J": 0.5,  # Waistband Height
+}
+
+
+class ArticleSpec(NamedTuple):
+    """
+    Measurement definition of one article type, compiled once at import.
+    Array fields have one entry per column of MEASUREMENT_CODE_ORDER.
+    """
+    article_type: str
+    required_codes: frozenset
+    valid_codes: frozenset
+    codes: Tuple[str, ...]  # valid codes in MEASUREMENT_CODE_ORDER
+    names: Dict[str, str]
+    tolerance_rules: Dict[str, float]
+    default_tolerance: float
+    required_mask: np.ndarray
+    valid_mask: np.ndarray
+    valid_codes_text: str
+    charts: Dict[str, Dict[str, float]]  # built-in size charts ({} if charts come from the database)
+
+
+def compile_article_spec(
+    article_type: str,
+    required_codes: Iterable[str],
+    optional_codes: Iterable[str],
+    names: Dict[str, str],
+    tolerance_rules: Dict[str, float],
+    default_tolerance: float = DEFAULT_TOLERANCE,
+    charts: Optional[Dict[str, Dict[str, float]]] = None
+) -> ArticleSpec:
+    """Compile the code set and default tolerance table of one article type."""
+    required_codes = frozenset(required_codes)
+    valid_codes = required_codes | frozenset(optional_codes)
+    unknown_codes = valid_codes - ALL_VALID_CODES
+    if unknown_codes:
+        raise ValueError(
+            f"Article '{article_type}' uses unknown measurement code(s): {', '.join(sorted(unknown_codes))}"
+        )
+    
+    required_mask = np.array([code in required_codes for code in MEASUREMENT_CODE_ORDER])
+    valid_mask = np.array([code in valid_codes for code in MEASUREMENT_CODE_ORDER])
+    for array in (required_mask, valid_mask):
+        array.flags.writeable = False
+    
+    return ArticleSpec(
+        article_type=article_type,
+        required_codes=required_codes,
+        valid_codes=valid_codes,
+        codes=tuple(code for code in MEASUREMENT_CODE_ORDER if code in valid_codes),
+        names=names,
+        tolerance_rules=tolerance_rules,
+        default_tolerance=default_tolerance,
+        required_mask=required_mask,
+        valid_mask=valid_mask,
+        valid_codes_text=', '.join(sorted(valid_codes)),
+        charts=charts or {},
+    )
+
+
+# Article type -> spec; engines are selected with a single lookup in this dict
+ARTICLE_SPECS = {
+    spec.article_type: spec
+    for spec in (
+        compile_article_spec(
+            "sweat_shirt", REQUIRED_MEASUREMENT_CODES, OPTIONAL_MEASUREMENT_CODES,
+            MEASUREMENT_NAMES, TOLERANCE_RULES, charts=STANDARD_SIZE_CHART_SWEATSHIRT,
+        ),
+        compile_article_spec(
+            "hoodie", REQUIRED_MEASUREMENT_CODES, OPTIONAL_MEASUREMENT_CODES,
+            HOODIE_MEASUREMENT_NAMES, TOLERANCE_RULES,
+        ),
+        compile_article_spec(
+            "tshirt", TSHIRT_REQUIRED_MEASUREMENT_CODES, OPTIONAL_MEASUREMENT_CODES,
+            TSHIRT_MEASUREMENT_NAMES, TOLERANCE_RULES,
+        ),
+        compile_article_spec(
+            "pants", PANTS_REQUIRED_MEASUREMENT_CODES, (),
+            PANTS_MEASUREMENT_NAMES, PANTS_TOLERANCE_RULES,
+        ),
+    )
+}
+ARTICLE_TYPES_TEXT = ', '.join(sorted(ARTICLE_SPECS))
+
+
+# Tolerance rules of one article: (size, or None for all sizes, code) -> (minus, plus) in cm
+ToleranceTable = Dict[Tuple[Optional[str], str], Tuple[float, float]]
+
+
+def resolve_tolerance(
+    spec: ArticleSpec,
+    tolerance_rules: ToleranceTable,
+    size: str,
+    code: str
+) -> Tuple[float, float]:
+    """
+    Return the (minus, plus) tolerance of a code for a size.
+    
+    A rule for the size wins over a rule for all sizes, which wins over the
+    article's symmetric default.
+    """
+    rule = tolerance_rules.get((size, code)) or tolerance_rules.get((None, code))
+    if rule is None:
+        tolerance = spec.tolerance_rules.get(code, spec.default_tolerance)
+        return tolerance, tolerance
+    return rule
+
+
+class ValidationPlan(NamedTuple):
+    """
+    Static validation data for one size of one article, compiled once per chart
+    and tolerance rule version. Per-code fields follow the article's codes; row
+    arrays have one column per code in MEASUREMENT_CODE_ORDER.
+    """
+    size: str
+    codes: Tuple[str, ...]
+    names: Tuple[str, ...]
+    standard_values: Tuple[Optional[float], ...]  # None where the chart has no value
+    tolerances_minus: Tuple[float, ...]
+    tolerances_plus: Tuple[float, ...]
+    checks: Tuple[Tuple[str, str, Optional[float], float, float], ...]  # (code, name, standard, minus, plus)
+    standard_row: np.ndarray  # standard values as floats, NaN where missing
+    lower_row: np.ndarray  # lowest allowed (measured - standard), i.e. -minus
+    upper_row: np.ndarray  # highest allowed (measured - standard), i.e. +plus
+
+
+def compile_validation_plan(
+    size: str,
+    chart: Dict[str, float],
+    spec: Optional[ArticleSpec] = None,
+    tolerance_rules: Optional[ToleranceTable] = None
+) -> ValidationPlan:
+    """Compile the static validation data for one size chart."""
+    if spec is None:
+        spec = ARTICLE_SPECS[DEFAULT_ARTICLE_TYPE]
+    if tolerance_rules is None:
+        tolerance_rules = {}
+    codes = spec.codes
+    names = tuple(spec.names.get(code, code) for code in codes)
+    standard_values = tuple(chart.get(code) for code in codes)
+    limits = {code: resolve_tolerance(spec, tolerance_rules, size, code) for code in MEASUREMENT_CODE_ORDER}
+    tolerances_minus = tuple(limits[code][0] for code in codes)
+    tolerances_plus = tuple(limits[code][1] for code in codes)
+    standard_row = np.array(
+        [chart.get(code, np.nan) if code in spec.valid_codes else np.nan for code in MEASUREMENT_CODE_ORDER],
+        dtype=float
+    )
+    lower_row = np.array([-limits[code][0] for code in MEASUREMENT_CODE_ORDER], dtype=float)
+    upper_row = np.array([limits[code][1] for code in MEASUREMENT_CODE_ORDER], dtype=float)
+    for array in (standard_row, lower_row, upper_row):
+        array.flags.writeable = False
+    
+    return ValidationPlan(
+        size=size,
+        codes=codes,
+        names=names,
+        standard_values=standard_values,
+        tolerances_minus=tolerances_minus,
+        tolerances_plus=tolerances_plus,
+        checks=tuple(zip(codes, names, standard_values, tolerances_minus, tolerances_plus)),
+        standard_row=standard_row,
+        lower_row=lower_row,
+        upper_row=upper_row,
+    )
+
+
+class CompiledCharts(NamedTuple):
+    """
+    Size charts and tolerance rules of one article compiled for validation:
+    a plan per size plus the chart and tolerance limits as matrices for
+    vectorized batch validation (one row per size, one column per code in
+    MEASUREMENT_CODE_ORDER, NaN where a size has no value). When every size
+    has the same limits, the limit matrices hold a single shared row.
+    """
+    spec: ArticleSpec
+    charts: Dict[str, Dict[str, float]]
+    plans: Dict[str, ValidationPlan]
+    batch_size_index: Dict[str, int]
+    chart_matrix: np.ndarray
+    lower_matrix: np.ndarray
+    upper_matrix: np.ndarray
+    symmetric_limits: bool  # lower == -upper everywhere: one abs() comparison suffices
+    valid_sizes_text: str
+    tolerance_rule_version: Optional[str]
+
+
+def compile_size_charts(
+    charts: Dict[str, Dict[str, float]],
+    spec: Optional[ArticleSpec] = None,
+    tolerance_rules: Optional[ToleranceTable] = None,
+    tolerance_rule_version: Optional[str] = None
+) -> CompiledCharts:
+    """Compile a {size: {code: value}} chart mapping of one article for validation."""
+    if spec is None:
+        spec = ARTICLE_SPECS[DEFAULT_ARTICLE_TYPE]
+    plans = {
+        size: compile_validation_plan(size, chart, spec, tolerance_rules)
+        for size, chart in charts.items()
+    }
+    
+    def stack(rows):
+        return np.array(rows, dtype=float).reshape(-1, len(MEASUREMENT_CODE_ORDER))
+    
+    lower_matrix = stack([plan.lower_row for plan in plans.values()])
+    upper_matrix = stack([plan.upper_row for plan in plans.values()])
+    if len(plans) > 1 and (lower_matrix == lower_matrix[0]).all() and (upper_matrix == upper_matrix[0]).all():
+        # Same limits for every size: broadcast one row instead of gathering per garment
+        lower_matrix, upper_matrix = lower_matrix[:1], upper_matrix[:1]
+    
+    return CompiledCharts(
+        spec=spec,
+        charts=charts,
+        plans=plans,
+        batch_size_index={size: row for row, size in enumerate(plans)},
+        chart_matrix=stack([plan.standard_row for plan in plans.values()]),
+        lower_matrix=lower_matrix,
+        upper_matrix=upper_matrix,
+        symmetric_limits=bool((lower_matrix == -upper_matrix).all()),
+        valid_sizes_text=', '.join(sorted(plans)),
+        tolerance_rule_version=tolerance_rule_version,
+    )
+
+
+# Built-in charts and tolerances, used until a chart or tolerance rule source is registered
+BUILTIN_COMPILED_CHARTS = {
+    article_type: compile_size_charts(spec.charts, spec)
+    for article_type, spec in ARTICLE_SPECS.items()
+}
+
+_size_chart_source = None  # (loader, version) - see set_size_chart_source()
+_tolerance_rule_source = None  # (loader, version) - see set_tolerance_rule_source()
+_compiled_charts = BUILTIN_COMPILED_CHARTS
+_compiled_charts_version = None
+_compiled_charts_lock = threading.Lock()
+
+
+def _reset_compiled_charts() -> None:
+    """Drop compiled charts after a source changed (caller holds the lock)."""
+    global _compiled_charts, _compiled_charts_version
+    if _size_chart_source is None and _tolerance_rule_source is None:
+        _compiled_charts = BUILTIN_COMPILED_CHARTS
+    else:
+        _compiled_charts = {}
+    _compiled_charts_version = None
+
+
+def set_size_chart_source(
+    loader: Optional[Callable[[str], Dict[str, Dict[str, float]]]],
+    version: Optional[Callable[[], int]] = None
+) -> None:
+    """
+    Register where size charts come from (e.g. the database chart registry).
+    
+    Args:
+        loader: Returns the {size: {code: value}} charts of an article type;
+            None restores the built-in charts
+        version: Returns a number that changes whenever the loader's charts change;
+            charts are recompiled only when it does
+    """
+    global _size_chart_source
+    with _compiled_charts_lock:
+        _size_chart_source = (loader, version) if loader is not None else None
+        _reset_compiled_charts()
+
+
+def set_tolerance_rule_source(
+    loader: Optional[Callable[[str], ToleranceTable]],
+    version: Optional[Callable[[], str]] = None
+) -> None:
+    """
+    Register where tolerance rules come from (e.g. the database rule registry).
+    
+    Args:
+        loader: Returns the tolerance rules of an article type; None restores
+            the built-in symmetric tolerances
+        version: Returns a label that changes whenever the loader's rules change;
+            plans are recompiled only when it does, and it is reported in the
+            summary of every validation result
+    """
+    global _tolerance_rule_source
+    with _compiled_charts_lock:
+        _tolerance_rule_source = (loader, version) if loader is not None else None
+        _reset_compiled_charts()
+
+
+def get_size_chart_version() -> Optional[int]:
+    """Return the version of the registered chart source (None for the built-in charts)."""
+    source = _size_chart_source
+    if source is None:
+        return None
+    version = source[1]
+    return version() if version is not None else 0
+
+
+def get_tolerance_rule_version() -> Optional[str]:
+    """Return the version of the registered tolerance rule source (None for the built-in tolerances)."""
+    source = _tolerance_rule_source
+    if source is None:
+        return None
+    version = source[1]
+    return version() if version is not None else None
+
+
+def get_compiled_charts(article_type: str = DEFAULT_ARTICLE_TYPE) -> Optional[CompiledCharts]:
+    """
+    Return the compiled size charts of an article type, compiling them on
+    first use after the chart or tolerance rule source changed.
+    
+    Returns:
+        CompiledCharts, or None for an unknown article type
+    """
+    global _compiled_charts, _compiled_charts_version
+    chart_source = _size_chart_source
+    rule_source = _tolerance_rule_source
+    if chart_source is None and rule_source is None:
+        return _compiled_charts.get(article_type)
+    
+    current_version = (get_size_chart_version(), get_tolerance_rule_version())
+    if current_version == _compiled_charts_version:
+        compiled = _compiled_charts.get(article_type)
+        if compiled is not None:
+            return compiled
+    
+    spec = ARTICLE_SPECS.get(article_type)
+    if spec is None:
+        return None
+    
+    with _compiled_charts_lock:
+        if current_version != _compiled_charts_version:
+            # Other articles are recompiled lazily on their next use
+            _compiled_charts = {}
+            _compiled_charts_version = current_version
+        compiled = _compiled_charts.get(article_type)
+        if compiled is None:
+            compiled = compile_size_charts(
+                chart_source[0](article_type) if chart_source is not None else spec.charts,
+                spec,
+                rule_source[0](article_type) if rule_source is not None else None,
+                current_version[1],
+            )
+            _compiled_charts = dict(_compiled_charts, **{article_type: compiled})
+        return compiled
+
 
 # ============================================================================
 # SECTION 2: FILE PARSER
 # ============================================================================
 
+# General line patterns, tried in order (most specific first)
+LINE_PATTERNS = (
+    # Format: "Length from shoulder (A): 50.1"
+    (re.compile(r'[^\(]*\(([A-T])\)\s*[:=]\s*([0-9]+\.?[0-9]*)', re.IGNORECASE), "description_with_code"),
+    # Format: "A: 50.1 cm" or "A: 50.1x 2"
+    (re.compile(r'([A-T])\s*[:=]\s*([0-9]+\.?[0-9]*)\s*(cm|x)?', re.IGNORECASE), "code_value"),
+    # Format: "A = 50.1"
+    (re.compile(r'([A-T])\s*=\s*([0-9]+\.?[0-9]*)', re.IGNORECASE), "code_value"),
+)
+
+# Anchored fast path per line format. A line that fully matches one of these
+# is matched by the general patterns with exactly the same code and value.
+LINE_FORMAT_PATTERNS = {
+    # Format: "Length from shoulder (A): 50.1" (one parenthesis, optional cm)
+    "description_with_code": re.compile(r'[^\(]*\(([A-T])\)\s*[:=]\s*([0-9]+\.?[0-9]*)\s*(?:cm)?', re.IGNORECASE),
+    # Format: "A: 50.1", "A = 50.1" or "A: 50.1 cm"
+    "code_value": re.compile(r'([A-T])\s*[:=]\s*([0-9]+\.?[0-9]*)\s*(?:cm)?', re.IGNORECASE),
+}
+
+# Number of meaningful lines inspected to detect a file's line format
+FORMAT_PROBE_LINES = 3
+
+VALID_CODES_TEXT = ', '.join(sorted(ALL_VALID_CODES))
+
+
 class MeasurementFileParser:
     """
     Parses measurement files (.txt only) supporting multiple line formats.
@@ -196,109 +634,220 @@ class MeasurementFileParser:
         """
         Parse a .txt measurement file.
         
+        Returns:
+            Tuple[Dict[str, float], List[str]]: (parsed_measurements, error_messages)
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return MeasurementFileParser.parse_stream(file)
+        except IOError as e:
+            return {}, [f"Error: Cannot read file - {str(e)}"]
+    
+    @staticmethod
+    def parse_bytes(data: bytes) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Parse the raw contents of a measurement file held in memory.
+        
+        Returns:
+            Tuple[Dict[str, float], List[str]]: (parsed_measurements, error_messages)
+        """
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            return {}, ["Error: File is not UTF-8 encoded"]
+        
+        # newline=None gives the same universal-newline splitting as open()
+        return MeasurementFileParser.parse_stream(io.StringIO(text, newline=None))
+    
+    @staticmethod
+    def parse_stream(stream: Iterable) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Parse measurement lines from any iterable of lines.
+        
+        Accepts open text files, io.StringIO, or binary sources such as a
+        Django UploadedFile (in-memory or spooled to disk), whose bytes lines
+        are decoded as UTF-8 one at a time - the upload is never copied.
+        
+        The line format is detected from the first meaningful lines and the
+        rest of the file goes through that format's anchored pattern; only
+        lines that break the format fall back to the general matcher.
+        
         Returns:
             Tuple[Dict[str, float], List[str]]: (parsed_measurements, error_messages)
         """
         measured_values = {}
         errors = []
+        line_num = 0
+        probe = []
+        lines = enumerate(stream, 1)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
+            # Pass 1: collect the first meaningful lines and detect the format
+            for line_num, line in lines:
+                if isinstance(line, bytes):
+                    line = line.decode('utf-8')
+                line = line.strip()
+                
+                # Skip empty lines and comments
+                if not line or line[0] == '#':
+                    continue
+                
+                probe.append((line_num, line))
+                if len(probe) == FORMAT_PROBE_LINES:
+                    break
+            
+            format_pattern = MeasurementFileParser._parse_probe(probe, measured_values, errors)
+            fullmatch = format_pattern.fullmatch if format_pattern is not None else None
+            parse_general = MeasurementFileParser._parse_line_general
+            
+            # Pass 2: the rest of the file through the detected format's fast path
+            for line_num, line in lines:
+                if isinstance(line, bytes):
+                    line = line.decode('utf-8')
+                line = line.strip()
+                
+                if not line or line[0] == '#':
+                    continue
+                
+                if fullmatch is not None:
+                    match = fullmatch(line)
+                    if match:
+                        code, value_str = match.groups()
+                        code = code.upper()
+                        value = float(value_str)
+                        if value > 0 and code not in measured_values and code in ALL_VALID_CODES:
+                            measured_values[code] = value
+                            continue
+                
+                # Line breaks the format, or needs an error message
+                parse_general(line, line_num, measured_values, errors)
         except UnicodeDecodeError:
             return {}, ["Error: File is not UTF-8 encoded"]
         except IOError as e:
             return {}, [f"Error: Cannot read file - {str(e)}"]
         
-        if not lines:
+        if line_num == 0:
             return {}, ["Error: File is empty"]
         
-        # Parsing patterns (order matters - most specific first)
-        patterns = [
-            # Format: "Length from shoulder (A): 50.1"
-            (r'[^\(]*\(([A-T])\)\s*[:=]\s*([0-9]+\.?[0-9]*)', "description_with_code"),
-            # Format: "A: 50.1 cm" or "A: 50.1x 2"
-            (r'([A-T])\s*[:=]\s*([0-9]+\.?[0-9]*)\s*(cm|x)?', "code_value"),
-            # Format: "A = 50.1"
-            (r'([A-T])\s*=\s*([0-9]+\.?[0-9]*)', "code_value"),
-        ]
+        return measured_values, errors
+    
+    @staticmethod
+    def detect_line_format(lines: List[str]) -> Optional[str]:
+        """
+        Detect the line format used by a sample of meaningful lines.
         
-        found_codes = set()
+        Returns:
+            Optional[str]: Key of LINE_FORMAT_PATTERNS matching most lines, or None
+        """
+        best_format, best_count = None, 0
+        for format_type, pattern in LINE_FORMAT_PATTERNS.items():
+            count = sum(1 for line in lines if pattern.fullmatch(line))
+            if count > best_count:
+                best_format, best_count = format_type, count
+        return best_format
+    
+    @staticmethod
+    def _parse_probe(
+        probe: List[Tuple[int, str]],
+        measured_values: Dict[str, float],
+        errors: List[str]
+    ):
+        """Detect the format from the probe lines, then parse them with it."""
+        format_type = MeasurementFileParser.detect_line_format([line for _, line in probe])
+        format_pattern = LINE_FORMAT_PATTERNS.get(format_type)
         
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            
-            # Skip empty lines and comments
-            if not line or line.startswith('#'):
-                continue
-            
-            matched = False
-            
-            for pattern, format_type in patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
+        for line_num, line in probe:
+            if format_pattern is not None:
+                match = format_pattern.fullmatch(line)
                 if match:
-                    try:
-                        code = match.group(1).upper()
-                        value_str = match.group(2)
-                        
-                        # Validate code
-                        if code not in ALL_VALID_CODES:
-                            errors.append(
-                                f"Line {line_num}: Unknown measurement code '{code}'. "
-                                f"Valid codes are: {', '.join(sorted(REQUIRED_MEASUREMENT_CODES | OPTIONAL_MEASUREMENT_CODES))}"
-                            )
-                            continue
-                        
-                        # Parse value
-                        try:
-                            value = float(value_str)
-                        except ValueError:
-                            errors.append(f"Line {line_num}: Invalid numeric value '{value_str}' for code {code}")
-                            continue
-                        
-                        # Validate value is positive
-                        if value <= 0:
-                            errors.append(f"Line {line_num}: Measurement {code} must be positive, got {value}")
-                            continue
-                        
-                        # Check for duplicates
-                        if code in found_codes:
-                            errors.append(f"Line {line_num}: Duplicate measurement code '{code}'")
-                            continue
-                        
+                    code = match.group(1).upper()
+                    value = float(match.group(2))
+                    if value > 0 and code not in measured_values and code in ALL_VALID_CODES:
                         measured_values[code] = value
-                        found_codes.add(code)
-                        matched = True
-                        break
-                        
-                    except Exception as e:
-                        errors.append(f"Line {line_num}: Parse error - {str(e)}")
                         continue
-            
-            if not matched and line:
-                errors.append(f"Line {line_num}: Could not parse line format: '{line}'")
+            MeasurementFileParser._parse_line_general(line, line_num, measured_values, errors)
         
-        return measured_values, errors
+        return format_pattern
+    
+    @staticmethod
+    def _parse_line_general(
+        line: str,
+        line_num: int,
+        measured_values: Dict[str, float],
+        errors: List[str]
+    ) -> None:
+        """Parse a line against every supported pattern, recording its value or errors."""
+        matched = False
+        
+        for pattern, format_type in LINE_PATTERNS:
+            match = pattern.search(line)
+            if match:
+                try:
+                    code = match.group(1).upper()
+                    value_str = match.group(2)
+                    
+                    # Validate code
+                    if code not in ALL_VALID_CODES:
+                        errors.append(
+                            f"Line {line_num}: Unknown measurement code '{code}'. "
+                            f"Valid codes are: {VALID_CODES_TEXT}"
+                        )
+                        continue
+                    
+                    # Parse value
+                    try:
+                        value = float(value_str)
+                    except ValueError:
+                        errors.append(f"Line {line_num}: Invalid numeric value '{value_str}' for code {code}")
+                        continue
+                    
+                    # Validate value is positive
+                    if value <= 0:
+                        errors.append(f"Line {line_num}: Measurement {code} must be positive, got {value}")
+                        continue
+                    
+                    # Check for duplicates
+                    if code in measured_values:
+                        errors.append(f"Line {line_num}: Duplicate measurement code '{code}'")
+                        continue
+                    
+                    measured_values[code] = value
+                    matched = True
+                    break
+                    
+                except Exception as e:
+                    errors.append(f"Line {line_num}: Parse error - {str(e)}")
+                    continue
+        
+        if not matched:
+            errors.append(f"Line {line_num}: Could not parse line format: '{line}'")
     
     @staticmethod
-    def validate_parsed_data(measured_values: Dict[str, float]) -> List[str]:
+    def validate_parsed_data(
+        measured_values: Dict[str, float],
+        article_type: str = DEFAULT_ARTICLE_TYPE
+    ) -> List[str]:
         """
-        Validate that all required measurements are present.
+        Validate that all required measurements of the article are present.
         
         Returns:
             List[str]: Error messages for any missing or invalid data
         """
         errors = []
+        spec = ARTICLE_SPECS.get(article_type)
+        if spec is None:
+            # Reported by MeasurementValidator.validate_measurements()
+            return errors
         
         # Check for missing required measurements
-        missing_codes = REQUIRED_MEASUREMENT_CODES - set(measured_values.keys())
+        missing_codes = spec.required_codes - set(measured_values.keys())
         if missing_codes:
             errors.append(
                 f"Missing required measurement(s): {', '.join(sorted(missing_codes))}"
             )
         
-        # Check for invalid codes (should not happen after parser validation)
-        invalid_codes = set(measured_values.keys()) - ALL_VALID_CODES
+        # Check for codes the article does not use
+        invalid_codes = set(measured_values.keys()) - spec.valid_codes
         if invalid_codes:
             errors.append(
                 f"Invalid measurement code(s): {', '.join(sorted(invalid_codes))}"
@@ -307,6 +856,185 @@ class MeasurementFileParser:
         return errors
 
 
+# ============================================================================
+# SECTION 2B: TABULAR (CSV/TSV) PARSER
+# ============================================================================
+
+# Rows parsed and validated per chunk; bounds memory for very large exports
+TABLE_CHUNK_ROWS = 10000
+
+# Header names (case-insensitive) of the size and optional garment label columns
+TABLE_SIZE_COLUMN = "size"
+TABLE_LABEL_COLUMNS = {"id", "garment", "garment_id", "label", "sample"}
+
+
+class MeasurementTableParser:
+    """
+    Parses multi-garment measurement tables (CSV/TSV): one row per garment,
+    a size column and one column per measurement code.
+    
+    Example:
+        garment,size,A,B,C,...,T
+        G-001,8/9,56.5,49.2,44.0,...,3.0
+    
+    Rows are read in chunks of TABLE_CHUNK_ROWS and each chunk is converted
+    column by column into a NumPy matrix laid out like MEASUREMENT_CODE_ORDER.
+    Only the code columns of the article type are read.
+    """
+    
+    @staticmethod
+    def detect_delimiter(header_line: str) -> str:
+        """Pick the delimiter of a table from its header line."""
+        if '\t' in header_line:
+            return '\t'
+        if ';' in header_line and ',' not in header_line:
+            return ';'
+        return ','
+    
+    @staticmethod
+    def iter_chunks(
+        lines: Iterable[str],
+        delimiter: Optional[str] = None,
+        chunk_rows: int = TABLE_CHUNK_ROWS,
+        article_type: str = DEFAULT_ARTICLE_TYPE
+    ) -> Iterator[Dict]:
+        """
+        Parse a table into chunks of rows.
+        
+        Raises:
+            ValueError: If the article type is unknown, or the header is missing
+                or lacks the size or a required code column
+        
+        Yields:
+            Dictionary per chunk containing:
+            - line_numbers: List[int] - File line of each row
+            - labels: List[str] - Garment label of each row (or the line number)
+            - sizes: List[str] - Size of each row
+            - matrix: np.ndarray - rows x len(MEASUREMENT_CODE_ORDER), NaN where missing/invalid
+            - row_errors: List[List[str]] - Error messages of each row, same wording as the text parser
+        """
+        spec = ARTICLE_SPECS.get(article_type)
+        if spec is None:
+            raise ValueError(
+                f"Invalid article type '{article_type}'. Valid article types: {ARTICLE_TYPES_TEXT}"
+            )
+        
+        lines = iter(lines)
+        header_line = next(lines, None)
+        if header_line is None or not header_line.strip():
+            raise ValueError("Error: File is empty")
+        
+        if delimiter is None:
+            delimiter = MeasurementTableParser.detect_delimiter(header_line)
+        reader = csv.reader(chain([header_line], lines), delimiter=delimiter)
+        
+        header = [name.strip().lstrip('\ufeff') for name in next(reader)]
+        size_index = label_index = None
+        code_columns = []  # (column index in file, column index in matrix)
+        for index, name in enumerate(header):
+            if name.lower() == TABLE_SIZE_COLUMN:
+                size_index = index
+            elif name.lower() in TABLE_LABEL_COLUMNS:
+                label_index = index
+            elif name.upper() in spec.valid_codes:
+                code_columns.append((index, MEASUREMENT_CODE_ORDER.index(name.upper())))
+        
+        if size_index is None:
+            raise ValueError(f"Missing '{TABLE_SIZE_COLUMN}' column in header")
+        missing_columns = spec.required_codes - {MEASUREMENT_CODE_ORDER[column] for _, column in code_columns}
+        if missing_columns:
+            raise ValueError(
+                f"Missing required measurement column(s): {', '.join(sorted(missing_columns))}"
+            )
+        
+        width = len(header)
+        while True:
+            rows, line_numbers = [], []
+            for row in islice(reader, chunk_rows):
+                # Skip blank lines
+                if not row or (len(row) == 1 and not row[0].strip()):
+                    continue
+                rows.append(row + [''] * (width - len(row)) if len(row) < width else row)
+                line_numbers.append(reader.line_num)
+            if not rows:
+                return
+            yield MeasurementTableParser._parse_chunk(
+                rows, line_numbers, size_index, label_index, code_columns, spec.required_mask
+            )
+    
+    @staticmethod
+    def _parse_chunk(
+        rows: List[List[str]],
+        line_numbers: List[int],
+        size_index: int,
+        label_index: Optional[int],
+        code_columns: List[Tuple[int, int]],
+        required_mask: np.ndarray
+    ) -> Dict:
+        """Convert one chunk of rows column by column into a measurement matrix."""
+        columns = list(zip(*rows))
+        row_errors = [[] for _ in rows]
+        matrix = np.full((len(rows), len(MEASUREMENT_CODE_ORDER)), np.nan)
+        
+        for file_column, matrix_column in code_columns:
+            code = MEASUREMENT_CODE_ORDER[matrix_column]
+            cells = columns[file_column]
+            try:
+                # Fast path: the whole column converts in one call
+                values = np.array(cells, dtype=float)
+                invalid = ~np.isfinite(values)
+            except ValueError:
+                # Column has blanks or bad cells: convert cell by cell
+                values = np.full(len(cells), np.nan)
+                invalid = np.zeros(len(cells), dtype=bool)
+                for row, cell in enumerate(cells):
+                    cell = cell.strip()
+                    if not cell:
+                        continue
+                    try:
+                        value = float(cell)
+                    except ValueError:
+                        invalid[row] = True
+                        continue
+                    if math.isfinite(value):
+                        values[row] = value
+                    else:
+                        invalid[row] = True
+            
+            for row in np.flatnonzero(invalid):
+                row_errors[row].append(
+                    f"Line {line_numbers[row]}: Invalid numeric value '{cells[row].strip()}' for code {code}"
+                )
+            
+            with np.errstate(invalid='ignore'):
+                non_positive = values <= 0
+            for row in np.flatnonzero(non_positive):
+                row_errors[row].append(
+                    f"Line {line_numbers[row]}: Measurement {code} must be positive, got {float(values[row])}"
+                )
+            
+            values[invalid | non_positive] = np.nan
+            matrix[:, matrix_column] = values
+        
+        # Same check as validate_parsed_data(), once per row
+        missing = np.isnan(matrix) & required_mask
+        for row in np.flatnonzero(missing.any(axis=1)):
+            missing_codes = [MEASUREMENT_CODE_ORDER[column] for column in np.flatnonzero(missing[row])]
+            row_errors[row].append(
+                f"Line {line_numbers[row]}: Missing required measurement(s): {', '.join(sorted(missing_codes))}"
+            )
+        
+        return {
+            "line_numbers": line_numbers,
+            "labels": [
+                cell.strip() for cell in columns[label_index]
+            ] if label_index is not None else [str(line_num) for line_num in line_numbers],
+            "sizes": [cell.strip() for cell in columns[size_index]],
+            "matrix": matrix,
+            "row_errors": row_errors,
+        }
+
+
 # ============================================================================
 # SECTION 3: VALIDATION ENGINE
 # ============================================================================
@@ -318,16 +1046,18 @@ class MeasurementValidator:
     """
     
     @staticmethod
-    def get_tolerance(code: str) -> float:
-        """Get tolerance value for a measurement code."""
-        return TOLERANCE_RULES.get(code, DEFAULT_TOLERANCE)
+    def get_tolerance(code: str, article_type: str = DEFAULT_ARTICLE_TYPE) -> float:
+        """Get the default (symmetric) tolerance value for a measurement code."""
+        spec = ARTICLE_SPECS.get(article_type, ARTICLE_SPECS[DEFAULT_ARTICLE_TYPE])
+        return spec.tolerance_rules.get(code, spec.default_tolerance)
     
     @staticmethod
     def validate_measurements(
         measured_values: Dict[str, float],
         size: str,
         operator_id: Optional[str] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        article_type: str = DEFAULT_ARTICLE_TYPE
     ) -> Dict:
         """
         Validate measured values against standard chart for a specific size.
@@ -337,10 +1067,12 @@ class MeasurementValidator:
             size: Size code (e.g., "6/7", "7/8", etc.)
             operator_id: Optional operator identifier
             session_id: Optional session identifier
+            article_type: Article type whose codes, chart and tolerances apply
         
         Returns:
             Dictionary containing:
             - success: bool - True if validation passed all checks
+            - article_type: str - The article type validated against
             - size: str - The selected size
             - timestamp: str - ISO format timestamp
             - operator_id: str or None
@@ -348,11 +1080,14 @@ class MeasurementValidator:
             - measurements: List[Dict] - Per-measurement results
             - overall_result: str - "PASS" or "FAIL"
             - error_messages: List[str] - Any validation errors
-            - summary: Dict - Summary statistics
+            - summary: Dict - Summary statistics, including the tolerance rule version applied
         """
+        compiled = get_compiled_charts(article_type)
+        spec = compiled.spec if compiled is not None else ARTICLE_SPECS[DEFAULT_ARTICLE_TYPE]
         
         result = {
             "success": False,
+            "article_type": article_type,
             "size": size,
             "timestamp": datetime.now().isoformat(),
             "operator_id": operator_id,
@@ -364,124 +1099,364 @@ class MeasurementValidator:
                 "total_measurements": 0,
                 "passed_measurements": 0,
                 "failed_measurements": 0,
-                "tolerance_default": DEFAULT_TOLERANCE,
-                "tolerance_special": TOLERANCE_RULES,
+                "tolerance_default": spec.default_tolerance,
+                "tolerance_special": spec.tolerance_rules,
+                "tolerance_rule_version": compiled.tolerance_rule_version if compiled is not None else None,
             }
         }
         
-        # Validate size exists
-        if size not in STANDARD_SIZE_CHART_SWEATSHIRT:
+        # Validate article type and size exist
+        if compiled is None:
+            result["error_messages"].append(
+                f"Invalid article type '{article_type}'. Valid article types: {ARTICLE_TYPES_TEXT}"
+            )
+            return result
+        
+        plan = compiled.plans.get(size)
+        if plan is None:
             result["error_messages"].append(
-                f"Invalid size '{size}'. Valid sizes: {', '.join(sorted(STANDARD_SIZE_CHART_SWEATSHIRT.keys()))}"
+                f"Invalid size '{size}'. Valid sizes: {compiled.valid_sizes_text}"
             )
             return result
         
-        # Get standard values for this size
-        standard_values = STANDARD_SIZE_CHART_SWEATSHIRT[size]
+        measured_codes = measured_values.keys()
         
         # Check all required measurements are present
-        missing_codes = REQUIRED_MEASUREMENT_CODES - set(measured_values.keys())
-        if missing_codes:
+        if not measured_codes >= spec.required_codes:
+            missing_codes = spec.required_codes - measured_codes
             result["error_messages"].append(
                 f"Missing required measurements: {', '.join(sorted(missing_codes))}"
             )
             return result
         
         # Check for unknown codes
-        unknown_codes = set(measured_values.keys()) - ALL_VALID_CODES
-        if unknown_codes:
+        if not measured_codes <= spec.valid_codes:
+            unknown_codes = measured_codes - spec.valid_codes
             result["error_messages"].append(
                 f"Unknown measurement codes: {', '.join(sorted(unknown_codes))}"
             )
             return result
         
-        # Validate each measurement
-        overall_pass = True
+        # Validate each measurement against the compiled plan
+        measurements = result["measurements"]
+        failed_count = 0
         
-        for code in sorted(REQUIRED_MEASUREMENT_CODES | OPTIONAL_MEASUREMENT_CODES):
+        for code, name, standard_value, tolerance_minus, tolerance_plus in plan.checks:
+            # Optional measurements can be missing
             if code not in measured_values:
-                # Optional measurements can be missing
-                if code in OPTIONAL_MEASUREMENT_CODES:
-                    continue
-                # Required measurements must be present (already checked above)
                 continue
             
-            measured_value = measured_values[code]
-            standard_value = standard_values.get(code)
-            
             if standard_value is None:
                 result["error_messages"].append(
                     f"Standard value not found for code {code} in size {size}"
                 )
                 continue
             
-            # Calculate deviation
-            deviation = abs(measured_value - standard_value)
-            tolerance = MeasurementValidator.get_tolerance(code)
+            measured_value = measured_values[code]
             
-            # Determine pass/fail
-            measurement_pass = deviation <= tolerance
+            # Calculate deviation and determine pass/fail against the minus/plus limits
+            difference = measured_value - standard_value
+            measurement_pass = -tolerance_minus <= difference <= tolerance_plus
             if not measurement_pass:
-                overall_pass = False
+                failed_count += 1
             
             # Record result
-            measurement_result = {
+            measurements.append({
                 "code": code,
-                "measurement_name": MeasurementValidator.get_measurement_name(code),
+                "measurement_name": name,
                 "measured_value": measured_value,
                 "standard_value": standard_value,
-                "deviation": round(deviation, 2),
-                "tolerance": tolerance,
+                "deviation": round(abs(difference), 2),
+                # Limit on the side of the deviation
+                "tolerance": tolerance_plus if difference >= 0 else tolerance_minus,
+                "tolerance_minus": tolerance_minus,
+                "tolerance_plus": tolerance_plus,
                 "status": "PASS" if measurement_pass else "FAIL",
+            })
+        
+        summary = result["summary"]
+        summary["total_measurements"] = len(measurements)
+        summary["passed_measurements"] = len(measurements) - failed_count
+        summary["failed_measurements"] = failed_count
+        
+        # Set overall result
+        overall_pass = failed_count == 0
+        result["overall_result"] = "PASS" if overall_pass else "FAIL"
+        result["success"] = overall_pass
+        
+        return result
+    
+    @staticmethod
+    def gate_measurements(
+        measured_values: Dict[str, float],
+        size: str,
+        article_type: str = DEFAULT_ARTICLE_TYPE
+    ) -> Tuple[bool, Optional[str], List[str]]:
+        """
+        Decide PASS/FAIL only, stopping at the first out-of-tolerance code.
+        
+        Gives the same verdict as validate_measurements() without building
+        per-measurement results.
+        
+        Returns:
+            Tuple of (passed, first failing code or None, error messages)
+        """
+        compiled = get_compiled_charts(article_type)
+        if compiled is None:
+            return False, None, [
+                f"Invalid article type '{article_type}'. Valid article types: {ARTICLE_TYPES_TEXT}"
+            ]
+        
+        plan = compiled.plans.get(size)
+        if plan is None:
+            return False, None, [f"Invalid size '{size}'. Valid sizes: {compiled.valid_sizes_text}"]
+        
+        spec = compiled.spec
+        measured_codes = measured_values.keys()
+        if not measured_codes >= spec.required_codes:
+            missing_codes = spec.required_codes - measured_codes
+            return False, None, [f"Missing required measurements: {', '.join(sorted(missing_codes))}"]
+        if not measured_codes <= spec.valid_codes:
+            unknown_codes = measured_codes - spec.valid_codes
+            return False, None, [f"Unknown measurement codes: {', '.join(sorted(unknown_codes))}"]
+        
+        for code, _, standard_value, tolerance_minus, tolerance_plus in plan.checks:
+            measured_value = measured_values.get(code)
+            if measured_value is None or standard_value is None:
+                continue
+            if not -tolerance_minus <= measured_value - standard_value <= tolerance_plus:
+                return False, code, []
+        
+        return True, None, []
+    
+    @staticmethod
+    def to_batch_matrix(measured_rows: Iterable[Dict[str, float]]) -> np.ndarray:
+        """
+        Build a batch matrix from per-garment measurement dicts.
+        
+        Returns:
+            np.ndarray: N x len(MEASUREMENT_CODE_ORDER) floats, NaN where a code is missing
+        """
+        return np.array([
+            [row.get(code, np.nan) for code in MEASUREMENT_CODE_ORDER]
+            for row in measured_rows
+        ], dtype=float).reshape(-1, len(MEASUREMENT_CODE_ORDER))
+    
+    @staticmethod
+    def validate_batch(matrix, sizes: List[str], article_type: str = DEFAULT_ARTICLE_TYPE) -> Dict:
+        """
+        Validate many garments of one article type at once in a single vectorized pass.
+        
+        Args:
+            matrix: N x len(MEASUREMENT_CODE_ORDER) measured values, NaN for missing codes
+            sizes: Size code of each of the N garments
+            article_type: Article type whose codes, chart and tolerances apply
+        
+        Raises:
+            ValueError: If the article type is unknown or sizes and rows differ in length
+        
+        Returns:
+            Dictionary containing:
+            - article_type: str - The article type validated against
+            - codes: tuple - Column codes (MEASUREMENT_CODE_ORDER)
+            - sizes: List[str] - The sizes passed in
+            - measured: np.ndarray - N x C measured values
+            - standard: np.ndarray - N x C standard values (NaN for unknown sizes)
+            - deviations: np.ndarray - N x C absolute deviations (unrounded)
+            - lower_limits / upper_limits: np.ndarray - N x C allowed range of
+              (measured - standard), i.e. -minus and +plus tolerance
+            - checked: np.ndarray - N x C bool, measurement was compared to the chart
+            - within_tolerance: np.ndarray - N x C bool, checked and within tolerance
+            - known_size: np.ndarray - N bool, size exists in the chart
+            - valid: np.ndarray - N bool, known size, all required codes present and no codes
+              outside the article's code set
+            - passed: np.ndarray - N bool, overall PASS per garment
+            - passed_counts / failed_counts: np.ndarray - N per-garment summary counts
+            - tolerance_rule_version: str or None - Tolerance rules applied
+        """
+        measured = np.asarray(matrix, dtype=float).reshape(-1, len(MEASUREMENT_CODE_ORDER))
+        if len(sizes) != measured.shape[0]:
+            raise ValueError(
+                f"Got {len(sizes)} sizes for {measured.shape[0]} measurement rows"
+            )
+        
+        compiled = get_compiled_charts(article_type)
+        if compiled is None:
+            raise ValueError(
+                f"Invalid article type '{article_type}'. Valid article types: {ARTICLE_TYPES_TEXT}"
+            )
+        spec = compiled.spec
+        size_rows = np.array([compiled.batch_size_index.get(size, -1) for size in sizes], dtype=np.intp)
+        known_size = size_rows >= 0
+        if compiled.chart_matrix.shape[0]:
+            chart_rows = np.where(known_size, size_rows, 0)
+            standard = compiled.chart_matrix[chart_rows]
+            if compiled.lower_matrix.shape[0] == 1:
+                lower = np.broadcast_to(compiled.lower_matrix, measured.shape)
+                upper = np.broadcast_to(compiled.upper_matrix, measured.shape)
+            else:
+                lower = compiled.lower_matrix[chart_rows]
+                upper = compiled.upper_matrix[chart_rows]
+        else:
+            standard = np.empty_like(measured)
+            lower = upper = np.zeros_like(measured)
+        standard[~known_size] = np.nan
+        
+        present = ~np.isnan(measured)
+        missing_required = (~present & spec.required_mask).any(axis=1)
+        valid = known_size & ~missing_required
+        if len(spec.codes) < len(MEASUREMENT_CODE_ORDER):
+            # Codes outside the article's code set make the row invalid
+            valid &= ~(present & ~spec.valid_mask).any(axis=1)
+        
+        with np.errstate(invalid='ignore'):
+            difference = measured - standard
+            deviations = np.abs(difference)
+            if compiled.symmetric_limits:
+                within = deviations <= upper
+            else:
+                within = (difference >= lower) & (difference <= upper)
+        
+        checked = present & ~np.isnan(standard) & valid[:, None]
+        within_tolerance = checked & within
+        failed = checked & ~within
+        
+        return {
+            "article_type": article_type,
+            "codes": MEASUREMENT_CODE_ORDER,
+            "sizes": list(sizes),
+            "measured": measured,
+            "standard": standard,
+            "deviations": deviations,
+            "lower_limits": lower,
+            "upper_limits": upper,
+            "checked": checked,
+            "within_tolerance": within_tolerance,
+            "known_size": known_size,
+            "valid": valid,
+            "passed": valid & ~failed.any(axis=1),
+            "passed_counts": within_tolerance.sum(axis=1),
+            "failed_counts": failed.sum(axis=1),
+            "tolerance_rule_version": compiled.tolerance_rule_version,
+        }
+    
+    @staticmethod
+    def batch_row_result(
+        batch: Dict,
+        row: int,
+        operator_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Expand one row of a validate_batch() result into the same dictionary
+        validate_measurements() returns for that garment.
+        """
+        size = batch["sizes"][row]
+        compiled = get_compiled_charts(batch["article_type"])
+        spec = compiled.spec
+        result = {
+            "success": False,
+            "article_type": batch["article_type"],
+            "size": size,
+            "timestamp": datetime.now().isoformat(),
+            "operator_id": operator_id,
+            "session_id": session_id,
+            "measurements": [],
+            "overall_result": "FAIL",
+            "error_messages": [],
+            "summary": {
+                "total_measurements": 0,
+                "passed_measurements": 0,
+                "failed_measurements": 0,
+                "tolerance_default": spec.default_tolerance,
+                "tolerance_special": spec.tolerance_rules,
+                "tolerance_rule_version": batch["tolerance_rule_version"],
             }
-            
-            result["measurements"].append(measurement_result)
-            
-            result["summary"]["total_measurements"] += 1
-            if measurement_pass:
-                result["summary"]["passed_measurements"] += 1
+        }
+        
+        if not batch["known_size"][row]:
+            result["error_messages"].append(
+                f"Invalid size '{size}'. Valid sizes: {compiled.valid_sizes_text}"
+            )
+            return result
+        
+        measured = batch["measured"][row]
+        if not batch["valid"][row]:
+            missing_codes = [
+                code for code, value, required in zip(MEASUREMENT_CODE_ORDER, measured, spec.required_mask)
+                if required and np.isnan(value)
+            ]
+            if missing_codes:
+                result["error_messages"].append(
+                    f"Missing required measurements: {', '.join(sorted(missing_codes))}"
+                )
             else:
-                result["summary"]["failed_measurements"] += 1
+                unknown_codes = [
+                    code for code, value, valid in zip(MEASUREMENT_CODE_ORDER, measured, spec.valid_mask)
+                    if not valid and not np.isnan(value)
+                ]
+                result["error_messages"].append(
+                    f"Unknown measurement codes: {', '.join(sorted(unknown_codes))}"
+                )
+            return result
         
-        # Set overall result
+        standard = batch["standard"][row]
+        deviations = batch["deviations"][row]
+        lower_limits = batch["lower_limits"][row]
+        upper_limits = batch["upper_limits"][row]
+        within_tolerance = batch["within_tolerance"][row]
+        
+        for column, code in enumerate(MEASUREMENT_CODE_ORDER):
+            if np.isnan(measured[column]):
+                continue
+            if np.isnan(standard[column]):
+                result["error_messages"].append(
+                    f"Standard value not found for code {code} in size {size}"
+                )
+                continue
+            
+            measurement_pass = bool(within_tolerance[column])
+            tolerance_minus = float(-lower_limits[column])
+            tolerance_plus = float(upper_limits[column])
+            result["measurements"].append({
+                "code": code,
+                "measurement_name": spec.names.get(code, code),
+                "measured_value": float(measured[column]),
+                "standard_value": float(standard[column]),
+                "deviation": round(float(deviations[column]), 2),
+                "tolerance": tolerance_plus if measured[column] >= standard[column] else tolerance_minus,
+                "tolerance_minus": tolerance_minus,
+                "tolerance_plus": tolerance_plus,
+                "status": "PASS" if measurement_pass else "FAIL",
+            })
+        
+        result["summary"]["total_measurements"] = len(result["measurements"])
+        result["summary"]["passed_measurements"] = int(batch["passed_counts"][row])
+        result["summary"]["failed_measurements"] = int(batch["failed_counts"][row])
+        
+        overall_pass = bool(batch["passed"][row])
         result["overall_result"] = "PASS" if overall_pass else "FAIL"
         result["success"] = overall_pass
         
         return result
     
     @staticmethod
-    def get_measurement_name(code: str) -> str:
+    def get_measurement_name(code: str, article_type: str = DEFAULT_ARTICLE_TYPE) -> str:
         """Get human-readable name for measurement code."""
-        names = {
-            "A": "Length from shoulder",
-            "B": "Chest Width",
-            "C": "Chest Width (1/2 Armhole)",
-            "D": "Bottom width (Above Waistband)",
-            "E": "Hem Width",
-            "F": "Back Width",
-            "G": "Back Width (1/2 Armhole)",
-            "H": "Neck Width (Seam to Seam)",
-            "I": "Sleeve Length",
-            "J": "Sleeve Width",
-            "K": "Sleeve Width (Above Cuff)",
-            "L": "Sleeve Opening",
-            "M": "Cuff Length",
-            "N": "Armhole",
-            "O": "Back Neck Drop",
-            "P": "Front Neck Drop",
-            "Q": "Collar Width",
-            "R": "Shoulder Drop",
-            "S": "Waistband Length",
-            "T": "Forward Shoulder Seam",
-            "PRINT_PLACEMENT_FROM_CF": "Print Placement From CF",
-        }
-        return names.get(code, code)
+        spec = ARTICLE_SPECS.get(article_type, ARTICLE_SPECS[DEFAULT_ARTICLE_TYPE])
+        return spec.names.get(code, code)
 
 
 # ============================================================================
 # SECTION 4: COMPLETE VALIDATION WORKFLOW
 # ============================================================================
 
+# Validation modes: the full audit report, or a fail-fast PASS/FAIL verdict
+VALIDATION_MODE_FULL = "full"
+VALIDATION_MODE_GATE = "gate"
+VALIDATION_MODES = (VALIDATION_MODE_FULL, VALIDATION_MODE_GATE)
+
+
 class MeasurementValidationEngine:
     """
     Complete validation workflow: parse file -> validate -> return results.
@@ -493,39 +1468,145 @@ class MeasurementValidationEngine:
         file_path: str,
         size: str,
         operator_id: Optional[str] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        article_type: str = DEFAULT_ARTICLE_TYPE,
+        mode: str = VALIDATION_MODE_FULL
     ) -> Dict:
         """
         Complete validation workflow for a measurement file.
         
+        With mode="gate" only a compact PASS/FAIL verdict is returned,
+        decided at the first out-of-tolerance code (see _gate_parsed()).
+        
+        Returns:
+            Dictionary with complete validation results, or the gate verdict
+        """
+        # Step 1: Parse file
+        measured_values, parse_errors = MeasurementFileParser.parse_file(file_path)
+        
+        return MeasurementValidationEngine._validate_parsed(
+            measured_values, parse_errors, size, operator_id, session_id, article_type, mode
+        )
+    
+    @staticmethod
+    def validate_stream(
+        stream: Iterable,
+        size: str,
+        operator_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        article_type: str = DEFAULT_ARTICLE_TYPE,
+        mode: str = VALIDATION_MODE_FULL
+    ) -> Dict:
+        """
+        Complete validation workflow reading lines straight from a stream.
+        
+        Used for uploads: a Django UploadedFile is parsed line by line from
+        memory (or its spooled temp file) without writing a copy to disk.
+        
+        Returns:
+            Dictionary with complete validation results
+        """
+        # Step 1: Parse stream
+        measured_values, parse_errors = MeasurementFileParser.parse_stream(stream)
+        
+        return MeasurementValidationEngine._validate_parsed(
+            measured_values, parse_errors, size, operator_id, session_id, article_type, mode
+        )
+    
+    @staticmethod
+    def validate_bytes(
+        data: bytes,
+        size: str,
+        operator_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        article_type: str = DEFAULT_ARTICLE_TYPE,
+        mode: str = VALIDATION_MODE_FULL
+    ) -> Dict:
+        """
+        Complete validation workflow for file contents held in memory.
+        
+        Takes and returns plain picklable data, so it can run in worker processes.
+        
         Returns:
             Dictionary with complete validation results
         """
+        # Step 1: Parse contents
+        measured_values, parse_errors = MeasurementFileParser.parse_bytes(data)
+        
+        return MeasurementValidationEngine._validate_parsed(
+            measured_values, parse_errors, size, operator_id, session_id, article_type, mode
+        )
+    
+    @staticmethod
+    def validate_table(
+        lines: Iterable[str],
+        delimiter: Optional[str] = None,
+        chunk_rows: int = TABLE_CHUNK_ROWS,
+        article_type: str = DEFAULT_ARTICLE_TYPE
+    ) -> Iterator[Dict]:
+        """
+        Validate a multi-garment CSV/TSV table of one article type chunk by chunk.
+        
+        Each chunk is validated with one validate_batch() call, so memory stays
+        bounded by chunk_rows however long the table is.
+        
+        Raises:
+            ValueError: If the article type is unknown or the table header is unusable
+        
+        Yields:
+            The MeasurementTableParser.iter_chunks() dictionary with an added
+            "batch" key holding the validate_batch() result; rows whose size is
+            unknown get an "Invalid size" message in row_errors.
+        """
+        for chunk in MeasurementTableParser.iter_chunks(lines, delimiter, chunk_rows, article_type):
+            batch = MeasurementValidator.validate_batch(chunk["matrix"], chunk["sizes"], article_type)
+            for row in np.flatnonzero(~batch["known_size"]):
+                chunk["row_errors"][row].append(
+                    f"Line {chunk['line_numbers'][row]}: Invalid size '{chunk['sizes'][row]}'. Valid sizes: {get_compiled_charts(article_type).valid_sizes_text}"
+                )
+            chunk["batch"] = batch
+            yield chunk
+    
+    @staticmethod
+    def _validate_parsed(
+        measured_values: Dict[str, float],
+        parse_errors: List[str],
+        size: str,
+        operator_id: Optional[str],
+        session_id: Optional[str],
+        article_type: str = DEFAULT_ARTICLE_TYPE,
+        mode: str = VALIDATION_MODE_FULL
+    ) -> Dict:
+        """Run steps 2 and 3 of the workflow on already parsed values."""
+        if mode == VALIDATION_MODE_GATE:
+            return MeasurementValidationEngine._gate_parsed(
+                measured_values, parse_errors, size, operator_id, session_id, article_type
+            )
+        if mode != VALIDATION_MODE_FULL:
+            raise ValueError(f"Invalid validation mode '{mode}'. Valid modes: {', '.join(VALIDATION_MODES)}")
+        
         result = {
             "success": False,
             "file_parsed": False,
             "validation_passed": False,
+            "article_type": article_type,
             "size": size,
             "timestamp": datetime.now().isoformat(),
             "operator_id": operator_id,
             "session_id": session_id,
-            "parse_errors": [],
+            "parse_errors": parse_errors,
             "validation_errors": [],
             "measurements": [],
             "overall_result": "FAIL",
             "summary": {},
         }
         
-        # Step 1: Parse file
-        measured_values, parse_errors = MeasurementFileParser.parse_file(file_path)
-        result["parse_errors"] = parse_errors
-        
         if parse_errors and not measured_values:
             # Critical parsing errors
             return result
         
         # Step 2: Validate parsed data
-        parse_validation_errors = MeasurementFileParser.validate_parsed_data(measured_values)
+        parse_validation_errors = MeasurementFileParser.validate_parsed_data(measured_values, article_type)
         if parse_validation_errors:
             result["parse_errors"].extend(parse_validation_errors)
             return result
@@ -537,7 +1618,8 @@ class MeasurementValidationEngine:
             measured_values=measured_values,
             size=size,
             operator_id=operator_id,
-            session_id=session_id
+            session_id=session_id,
+            article_type=article_type
         )
         
         # Merge validation result
@@ -547,11 +1629,109 @@ class MeasurementValidationEngine:
         return result
     
     @staticmethod
-    def get_available_sizes() -> List[str]:
-        """Return list of available sizes."""
-        return sorted(STANDARD_SIZE_CHART_SWEATSHIRT.keys())
+    def _gate_parsed(
+        measured_values: Dict[str, float],
+        parse_errors: List[str],
+        size: str,
+        operator_id: Optional[str],
+        session_id: Optional[str],
+        article_type: str
+    ) -> Dict:
+        """
+        Gate verdict on already parsed values.
+        
+        Returns:
+            Dictionary containing:
+            - mode: str - "gate"
+            - success: bool - Same outcome as the full workflow
+            - overall_result: str - "PASS" or "FAIL"
+            - failed_code: str or None - First out-of-tolerance code
+            - file_parsed: bool - False if the file itself was rejected
+            - errors: List[str] - Parse/validation errors behind a FAIL without failed_code
+            - article_type, size, operator_id, session_id
+        """
+        verdict = {
+            "mode": VALIDATION_MODE_GATE,
+            "success": False,
+            "overall_result": "FAIL",
+            "failed_code": None,
+            "file_parsed": False,
+            "errors": parse_errors,
+            "article_type": article_type,
+            "size": size,
+            "operator_id": operator_id,
+            "session_id": session_id,
+        }
+        
+        if parse_errors and not measured_values:
+            return verdict
+        
+        parse_validation_errors = MeasurementFileParser.validate_parsed_data(measured_values, article_type)
+        if parse_validation_errors:
+            verdict["errors"] = parse_errors + parse_validation_errors
+            return verdict
+        
+        verdict["file_parsed"] = True
+        passed, failed_code, errors = MeasurementValidator.gate_measurements(measured_values, size, article_type)
+        if errors:
+            verdict["errors"] = parse_errors + errors
+        verdict["success"] = passed
+        verdict["overall_result"] = "PASS" if passed else "FAIL"
+        verdict["failed_code"] = failed_code
+        
+        return verdict
+    
+    @staticmethod
+    def get_available_sizes(article_type: str = DEFAULT_ARTICLE_TYPE) -> List[str]:
+        """Return list of available sizes of an article type."""
+        compiled = get_compiled_charts(article_type)
+        return sorted(compiled.charts.keys()) if compiled is not None else []
+    
+    @staticmethod
+    def get_size_chart(size: str, article_type: str = DEFAULT_ARTICLE_TYPE) -> Optional[Dict]:
+        """Get standard size chart for a specific size of an article type."""
+        compiled = get_compiled_charts(article_type)
+        return compiled.charts.get(size) if compiled is not None else None
+    
+    @staticmethod
+    def get_article_types() -> List[str]:
+        """Return list of article types the engine validates."""
+        return sorted(ARTICLE_SPECS)
+
+
+# ============================================================================
+# SECTION 5: STREAMED REPORTS
+# ============================================================================
+
+# Characters of CSV buffered before a chunk is handed to the response
+REPORT_STREAM_BUFFER = 64 * 1024
+
+
+class ReportStreamWriter:
+    """
+    Writes report rows as CSV text chunks, for StreamingHttpResponse.
+    
+    Rows are consumed lazily and only REPORT_STREAM_BUFFER characters are held
+    at a time, so memory stays flat however many rows the report has.
+    """
     
     @staticmethod
-    def get_size_chart(size: str) -> Optional[Dict]:
-        """Get standard size chart for a specific size."""
-        return STANDARD_SIZE_CHART_SWEATSHIRT.get(size)
+    def iter_csv(rows: Iterable[Iterable], buffer_size: int = REPORT_STREAM_BUFFER) -> Iterator[str]:
+        """
+        Yield the rows as CSV, in chunks of about buffer_size characters.
+        
+        Returns:
+            Iterator[str]: CSV chunks; the last one holds whatever is left
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= buffer_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
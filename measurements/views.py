@@ -1,39 +1,95 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, HttpResponse, StreamingHttpResponse
 from django.contrib import messages
 from django.core.files.storage import FileSystemStorage
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from products.charts import SIZE_CHART_MAX_AGE, SizeChartRegistry
 from products.models import Product, PurchaseOrder, StandardSizeChart
-from measurements.models import MeasurementSession, MeasurementResult
-from measurements.utils import MeasurementValidationEngine
+from accounts.models import OperatorSession
+from measurements.models import DailyQCRollup, MeasurementSession, MeasurementResult
+from measurements.utils import (
+    DEFAULT_ARTICLE_TYPE,
+    VALIDATION_MODE_FULL,
+    VALIDATION_MODE_GATE,
+    VALIDATION_MODES,
+    MeasurementValidationEngine,
+    MeasurementValidator,
+)
+from measurements.analytics_charts import CHART_DEFAULT_DAYS, chart_data, chart_key, chart_query, get_chart_png
+from measurements.background import submit_background
+from measurements.batch import iter_measurement_files, validate_measurement_files
+from measurements.reports import (
+    iter_daily_csv_report,
+    open_daily_report,
+    report_period,
+)
+from measurements.write_behind import WRITE_BEHIND_SUBMIT_TIMEOUT, WriteBehindFull, get_result_buffer
+import base64
+import binascii
+import codecs
 import json
-import csv
-from datetime import datetime, timedelta
-import os
+import logging
+from datetime import date, datetime, timedelta
 import re
-import tempfile
 import uuid
 
+logger = logging.getLogger(__name__)
+
+def active_session_product(user):
+    """
+    (product_id, article_type) of the operator's active session; results are
+    linked to the product and validated with its article type's engine
+    """
+    active = OperatorSession.objects.filter(
+        operator=user,
+        status='active'
+    ).values_list('product_id', 'product__purchase_order__article_type').first()
+    return active or (None, DEFAULT_ARTICLE_TYPE)
+
+def requested_article_type(request):
+    """Article type from the query string, else that of the active session"""
+    return request.GET.get('article_type') or active_session_product(request.user)[1]
+
 @login_required
 def measurement_dashboard(request):
     """Main measurement dashboard with size selection from validation engine"""
-    available_sizes = MeasurementValidationEngine.get_available_sizes()
+    available_sizes = MeasurementValidationEngine.get_available_sizes(requested_article_type(request))
     
     context = {
         'available_sizes': available_sizes,
     }
     return render(request, 'measurements/dashboard.html', context)
 
+def save_full_report(data, size, operator_id, session_id, article_type, product_id):
+    """Build the full validation report of a gated upload and store it"""
+    validation_result = MeasurementValidationEngine.validate_bytes(
+        data, size, operator_id, session_id, article_type
+    )
+    if validation_result.get('file_parsed'):
+        get_result_buffer().submit([
+            (session_id, size, validation_result, operator_id)
+        ], product_id=product_id)
+
 @login_required
 def upload_and_analyze(request):
     """
     Handle file upload and validate against standard sizes.
     Uses the industrial-grade measurement validation engine.
+    
+    With mode=gate only the PASS/FAIL verdict (and first failing code) is
+    returned; the full report is built and saved in the background.
     """
     if request.method == 'POST' and request.FILES.get('measurement_file'):
         try:
             uploaded_file = request.FILES['measurement_file']
             selected_size = request.POST.get('size')
+            mode = request.POST.get('mode', VALIDATION_MODE_FULL)
             
             # Validate file extension
             if not uploaded_file.name.lower().endswith('.txt'):
@@ -49,65 +105,68 @@ def upload_and_analyze(request):
                     'message': 'Size must be selected'
                 })
             
+            if mode not in VALIDATION_MODES:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f"Mode must be one of: {', '.join(VALIDATION_MODES)}"
+                })
+            
             # Get operator info if available
             operator_id = request.user.username if request.user.is_authenticated else None
             session_id = str(uuid.uuid4())
+            product_id, article_type = active_session_product(request.user)
             
-            # Save file temporarily
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as tmp_file:
-                for chunk in uploaded_file.chunks():
-                    tmp_file.write(chunk)
-                temp_file_path = tmp_file.name
-            
-            try:
-                # Run validation engine
-                validation_result = MeasurementValidationEngine.validate_file(
-                    file_path=temp_file_path,
-                    size=selected_size,
-                    operator_id=operator_id,
-                    session_id=session_id
+            if mode == VALIDATION_MODE_GATE:
+                data = uploaded_file.read()
+                verdict = MeasurementValidationEngine.validate_bytes(
+                    data, selected_size, operator_id, session_id, article_type, mode=VALIDATION_MODE_GATE
                 )
-                
-                # Store result in database
-                if validation_result.get('file_parsed'):
-                    try:
-                        # Create measurement session
-                        session = MeasurementSession.objects.create(
-                            session_id=session_id,
-                            status='completed'
-                        )
-                        
-                        # Create result record
-                        result_record = MeasurementResult.objects.create(
-                            session=session,
-                            size=selected_size,
-                            measured_values=validation_result.get('measurements', {}),
-                            standard_values=MeasurementValidationEngine.get_size_chart(selected_size),
-                            deviations={m['code']: m['deviation'] for m in validation_result.get('measurements', [])},
-                            measurement_details=validation_result.get('measurements', []),
-                            passed=validation_result.get('success', False),
-                            operator_id=operator_id,
-                        )
-                    except Exception as db_error:
-                        print(f"Database storage error: {db_error}")
-                        # Continue with response even if DB storage fails
-                
+                # Audit trail: the full report is built and stored off the request path
+                if verdict['file_parsed']:
+                    submit_background(
+                        save_full_report, data, selected_size, operator_id, session_id, article_type, product_id
+                    )
                 return JsonResponse({
                     'status': 'success',
-                    'validation_result': validation_result,
+                    'verdict': verdict,
                     'session_id': session_id,
                     'file_name': uploaded_file.name
                 })
-                
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
+            
+            # Run validation engine directly on the upload (no temp file copy)
+            validation_result = MeasurementValidationEngine.validate_stream(
+                stream=uploaded_file,
+                size=selected_size,
+                operator_id=operator_id,
+                session_id=session_id,
+                article_type=article_type
+            )
+            
+            # Store result in database: queued and saved in a batch with other
+            # stations' results; waits only while the queue is full
+            if validation_result.get('file_parsed'):
+                get_result_buffer().submit([
+                    (session_id, selected_size, validation_result, operator_id)
+                ], product_id=product_id)
+            
+            return JsonResponse({
+                'status': 'success',
+                'validation_result': validation_result,
+                'session_id': session_id,
+                'file_name': uploaded_file.name
+            })
         
+        except WriteBehindFull as e:
+            # Validated but not queued: the station should send it again shortly
+            logger.warning("Upload not saved, result storage is busy")
+            response = JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=503)
+            response['Retry-After'] = str(int(WRITE_BEHIND_SUBMIT_TIMEOUT))
+            return response
         except Exception as e:
-            print(f"Error in upload_and_analyze: {e}")
+            logger.exception("Error in upload_and_analyze")
             return JsonResponse({
                 'status': 'error',
                 'message': str(e)
@@ -118,6 +177,204 @@ def upload_and_analyze(request):
         'message': 'No file uploaded or invalid request method'
     })
 
+@login_required
+def upload_batch_and_analyze(request):
+    """
+    Validate many measurement files in one request.
+    Accepts ZIP archives and/or several .txt files under 'measurement_files';
+    files are validated across a process pool and saved in one transaction.
+    """
+    if request.method != 'POST' or not request.FILES:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'No files uploaded or invalid request method'
+        })
+    
+    selected_size = request.POST.get('size')
+    if not selected_size:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Size must be selected'
+        })
+    
+    uploaded_files = request.FILES.getlist('measurement_files') or request.FILES.getlist('measurement_file')
+    operator_id = request.user.username
+    product_id, article_type = active_session_product(request.user)
+    
+    try:
+        outcomes = validate_measurement_files(
+            iter_measurement_files(uploaded_files),
+            size=selected_size,
+            operator_id=operator_id,
+            article_type=article_type
+        )
+    except Exception as e:
+        logger.exception("Error in upload_batch_and_analyze")
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        })
+    
+    entries = [
+        (outcome['session_id'], selected_size, outcome['validation_result'], operator_id)
+        for outcome in outcomes
+        if outcome['validation_result'] and outcome['validation_result'].get('file_parsed')
+    ]
+    
+    saved = 0
+    save_error = None
+    try:
+        # Through the single result writer, which retries while the database is busy
+        saved = get_result_buffer().save(entries, product_id=product_id)
+    except Exception as db_error:
+        logger.exception("Database storage error in upload_batch_and_analyze")
+        save_error = str(db_error)
+    
+    files = []
+    passed = failed = errors = 0
+    for outcome in outcomes:
+        validation_result = outcome['validation_result']
+        if validation_result is None or not validation_result.get('file_parsed'):
+            errors += 1
+            status = 'ERROR'
+        elif validation_result.get('success'):
+            passed += 1
+            status = 'PASS'
+        else:
+            failed += 1
+            status = 'FAIL'
+        
+        files.append({
+            'file_name': outcome['file_name'],
+            'session_id': outcome['session_id'],
+            'status': status,
+            'failed_codes': [
+                m['code'] for m in (validation_result or {}).get('measurements', [])
+                if m['status'] == 'FAIL'
+            ],
+            'errors': (
+                [outcome['error']] if outcome['error']
+                else validation_result.get('parse_errors', []) + validation_result.get('error_messages', [])
+            ),
+        })
+    
+    return JsonResponse({
+        'status': 'success',
+        'article_type': article_type,
+        'size': selected_size,
+        'summary': {
+            'total_files': len(files),
+            'passed': passed,
+            'failed': failed,
+            'errors': errors,
+            'saved': saved,
+        },
+        'save_error': save_error,
+        'files': files,
+    })
+
+# Failed/invalid rows listed individually in a table upload response
+TABLE_MAX_REPORTED_ROWS = 1000
+
+@login_required
+def upload_table_and_analyze(request):
+    """
+    Validate a multi-garment CSV/TSV table (one row per garment).
+    The table is parsed and validated in bounded-size chunks; each chunk's
+    results are saved in one transaction.
+    """
+    uploaded_file = request.FILES.get('measurement_file')
+    if request.method != 'POST' or not uploaded_file:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'No file uploaded or invalid request method'
+        })
+    
+    file_name = uploaded_file.name.lower()
+    if not file_name.endswith(('.csv', '.tsv')):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Only .csv and .tsv files are supported'
+        })
+    
+    operator_id = request.user.username
+    product_id, article_type = active_session_product(request.user)
+    delimiter = '\t' if file_name.endswith('.tsv') else None
+    
+    summary = {'total_rows': 0, 'passed': 0, 'failed': 0, 'errors': 0, 'saved': 0}
+    rows = []
+    reportable_rows = 0
+    save_error = None
+    
+    try:
+        lines = codecs.iterdecode(uploaded_file, 'utf-8-sig')
+        for chunk in MeasurementValidationEngine.validate_table(
+            lines, delimiter=delimiter, article_type=article_type
+        ):
+            batch = chunk['batch']
+            entries = []
+            
+            for row, line_num in enumerate(chunk['line_numbers']):
+                if batch['valid'][row]:
+                    status = 'PASS' if batch['passed'][row] else 'FAIL'
+                    validation_result = MeasurementValidator.batch_row_result(
+                        batch, row, operator_id=operator_id, session_id=str(uuid.uuid4())
+                    )
+                    entries.append((
+                        validation_result['session_id'], chunk['sizes'][row], validation_result, operator_id
+                    ))
+                else:
+                    status = 'ERROR'
+                
+                summary['total_rows'] += 1
+                summary[{'PASS': 'passed', 'FAIL': 'failed', 'ERROR': 'errors'}[status]] += 1
+                
+                if status == 'PASS' and not chunk['row_errors'][row]:
+                    continue
+                reportable_rows += 1
+                if len(rows) < TABLE_MAX_REPORTED_ROWS:
+                    rows.append({
+                        'line': line_num,
+                        'label': chunk['labels'][row],
+                        'size': chunk['sizes'][row],
+                        'status': status,
+                        'failed_codes': [
+                            code for code, within, checked in zip(
+                                batch['codes'], batch['within_tolerance'][row], batch['checked'][row]
+                            )
+                            if checked and not within
+                        ],
+                        'errors': chunk['row_errors'][row],
+                    })
+            
+            if save_error is None:
+                try:
+                    summary['saved'] += get_result_buffer().save(entries, product_id=product_id)
+                except Exception as db_error:
+                    logger.exception("Database storage error in upload_table_and_analyze")
+                    save_error = str(db_error)
+    
+    except UnicodeDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Error: File is not UTF-8 encoded'
+        })
+    except ValueError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        })
+    
+    return JsonResponse({
+        'status': 'success',
+        'file_name': uploaded_file.name,
+        'article_type': article_type,
+        'summary': summary,
+        'save_error': save_error,
+        'rows': rows,
+        'rows_truncated': reportable_rows > len(rows),
+    })
+
 def process_text_file(file_path):
     """DEPRECATED: Use MeasurementValidationEngine instead"""
     from measurements.utils import MeasurementFileParser
@@ -202,13 +459,31 @@ def save_qc_result(request):
     
     return JsonResponse({'status': 'error', 'message': 'Invalid request'})
 
+def size_list_etag(request):
+    """
+    ETag of the size list: the chart digest and article type, no DB query.
+    Without article_type the list follows the operator's active session, and no
+    ETag is sent rather than querying the session on every conditional request.
+    """
+    article_type = request.GET.get('article_type')
+    return SizeChartRegistry.etag('sizes', article_type) if article_type else None
+
+def size_chart_etag(request):
+    """ETag of one size chart, like size_list_etag"""
+    article_type = request.GET.get('article_type')
+    return SizeChartRegistry.etag('size-chart', article_type, request.GET.get('size', '')) if article_type else None
+
 @login_required
+@cache_control(private=True, max_age=SIZE_CHART_MAX_AGE)
+@condition(etag_func=size_list_etag)
 def get_available_sizes(request):
     """Get list of available sizes for validation"""
     try:
-        sizes = MeasurementValidationEngine.get_available_sizes()
+        article_type = requested_article_type(request)
+        sizes = MeasurementValidationEngine.get_available_sizes(article_type)
         return JsonResponse({
             'status': 'success',
+            'article_type': article_type,
             'sizes': sizes
         })
     except Exception as e:
@@ -218,6 +493,8 @@ def get_available_sizes(request):
         })
 
 @login_required
+@cache_control(private=True, max_age=SIZE_CHART_MAX_AGE)
+@condition(etag_func=size_chart_etag)
 def get_size_chart(request):
     """Get standard size chart for a specific size"""
     size = request.GET.get('size')
@@ -228,7 +505,8 @@ def get_size_chart(request):
         })
     
     try:
-        chart = MeasurementValidationEngine.get_size_chart(size)
+        article_type = requested_article_type(request)
+        chart = MeasurementValidationEngine.get_size_chart(size, article_type)
         if chart is None:
             return JsonResponse({
                 'status': 'error',
@@ -236,6 +514,7 @@ def get_size_chart(request):
             })
         return JsonResponse({
             'status': 'success',
+            'article_type': article_type,
             'size': size,
             'chart': chart
         })
@@ -247,40 +526,128 @@ def get_size_chart(request):
 
 
 
+# Results per page of the history API, by default and at most
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+HISTORY_FIELDS = (
+    'id', 'created_at', 'validation_timestamp', 'session__session_id',
+    'size', 'article_type', 'passed', 'operator_id',
+)
+
+def encode_history_cursor(created_at, result_id):
+    """Opaque cursor pointing just past a (created_at, id) position"""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{result_id}".encode()).decode()
+
+def decode_history_cursor(cursor):
+    """(created_at, id) of a cursor; raises ValueError if it is malformed"""
+    try:
+        created_at, result_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(result_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+@login_required
+def results_history(request):
+    """
+    Past measurement results, newest first, with keyset pagination on
+    (created_at, id): every page is one index range scan however deep it is.
+    Filters: size, result (pass/fail), operator, start and end (YYYY-MM-DD).
+    """
+    results = MeasurementResult.objects.all()
+    try:
+        limit = min(int(request.GET.get('limit', HISTORY_PAGE_SIZE)), HISTORY_MAX_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError('limit must be positive')
+        
+        if request.GET.get('size'):
+            results = results.filter(size=request.GET['size'])
+        if request.GET.get('operator'):
+            results = results.filter(operator_id=request.GET['operator'])
+        result_filter = request.GET.get('result', '').lower()
+        if result_filter:
+            if result_filter not in ('pass', 'fail'):
+                raise ValueError("result must be 'pass' or 'fail'")
+            results = results.filter(passed=result_filter == 'pass')
+        if request.GET.get('start') or request.GET.get('end'):
+            today = timezone.localdate()
+            start_date = date.fromisoformat(request.GET.get('start') or '2000-01-01')
+            end_date = date.fromisoformat(request.GET.get('end') or today.isoformat())
+            start, end = report_period(start_date, end_date)
+            results = results.filter(created_at__gte=start, created_at__lt=end)
+        if request.GET.get('cursor'):
+            created_at, result_id = decode_history_cursor(request.GET['cursor'])
+            results = results.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=result_id)
+            )
+    except ValueError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+    
+    # One row past the page tells whether there is a next page
+    rows = list(results.order_by('-created_at', '-id').values(*HISTORY_FIELDS)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_history_cursor(rows[-1]['created_at'], rows[-1]['id'])
+    
+    return JsonResponse({
+        'status': 'success',
+        'results': [
+            {
+                'id': row['id'],
+                'session_id': row['session__session_id'],
+                'size': row['size'],
+                'article_type': row['article_type'],
+                'result': 'PASS' if row['passed'] else 'FAIL',
+                'operator_id': row['operator_id'],
+                'validation_timestamp': row['validation_timestamp'].isoformat(),
+                'created_at': row['created_at'].isoformat(),
+            }
+            for row in rows
+        ],
+        'next_cursor': next_cursor,
+    })
+
 @login_required
 def analytics_dashboard(request):
     """Enhanced analytics dashboard with daily reports"""
-    today = datetime.now().date()
+    today = timezone.localdate()
     week_ago = today - timedelta(days=7)
     
     # Get actual data from database
-    products = Product.objects.all()
     purchase_orders = PurchaseOrder.objects.all()
     standard_sizes = StandardSizeChart.objects.all()
     
     # Calculate actual statistics
-    total_products = products.count()
+    total_products = Product.objects.count()
     total_orders = purchase_orders.count()
     
     # Size distribution
-    sizes_count = {}
-    for product in products:
-        size = product.size
-        sizes_count[size] = sizes_count.get(size, 0) + 1
-    
-    # Simulate some QC data (in real app, this would come from QC results)
-    qc_data = [
-        {'size': 'M', 'passed': 8, 'failed': 2},
-        {'size': 'L', 'passed': 6, 'failed': 1},
-        {'size': 'S', 'passed': 5, 'failed': 3},
-        {'size': 'XL', 'passed': 4, 'failed': 0},
-    ]
+    sizes_count = dict(
+        Product.objects.values_list('size').annotate(count=Count('id')).order_by('size')
+    )
+    
+    # QC results of the last week, from the daily rollups (see measurements.rollups)
+    qc_data = list(
+        DailyQCRollup.objects.filter(date__gte=week_ago)
+        .values('size')
+        .annotate(passed=Sum('passed'), failed=Sum('failed'))
+        .order_by('size')
+    )
     
     total_passed = sum(item['passed'] for item in qc_data)
     total_failed = sum(item['failed'] for item in qc_data)
     total_measurements = total_passed + total_failed
     pass_rate = (total_passed / total_measurements * 100) if total_measurements > 0 else 0
     
+    today_totals = DailyQCRollup.objects.filter(date=today).aggregate(
+        passed=Coalesce(Sum('passed'), 0),
+        failed=Coalesce(Sum('failed'), 0),
+    )
+    
     analytics_data = {
         'total_products': total_products,
         'total_orders': total_orders,
@@ -292,111 +659,88 @@ def analytics_dashboard(request):
         'qc_data': qc_data,
         'standard_sizes': standard_sizes,
         'today_summary': {
-            'measurements_today': total_measurements,
-            'passed_today': total_passed,
-            'failed_today': total_failed,
+            'measurements_today': today_totals['passed'] + today_totals['failed'],
+            'passed_today': today_totals['passed'],
+            'failed_today': today_totals['failed'],
         }
     }
     
     return render(request, 'measurements/analytics.html', {'analytics_data': analytics_data})
 
+@login_required
+def analytics_chart(request, kind):
+    """PNG chart of the QC rollups, rendered on the server and cached on disk"""
+    try:
+        days = int(request.GET.get('days', CHART_DEFAULT_DAYS))
+        query = chart_query(kind, days, request.GET.get('article_type'), request.GET.get('size'))
+    except ValueError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+    
+    # The key comes from the rollup data alone, so a 304 costs no image read or render
+    data = chart_data(query)
+    key = chart_key(query, data)
+    etag = f'"{key}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    
+    response = HttpResponse(get_chart_png(query, data, key), content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
 @login_required
 def generate_daily_report(request):
     """Generate daily QC report"""
-    report_type = request.GET.get('type', 'pdf')
+    report_type = 'csv' if request.GET.get('type', 'pdf') == 'csv' else 'pdf'
     
-    if report_type == 'csv':
-        return generate_daily_csv_report()
-    else:
-        return generate_daily_pdf_report()
-
-def generate_daily_csv_report():
-    """Generate CSV daily report with actual data"""
-    response = HttpResponse(content_type='text/csv')
-    filename = f"magic_qc_daily_report_{datetime.now().strftime('%Y%m%d')}.csv"
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    writer = csv.writer(response)
-    
-    # Header
-    writer.writerow(['Magic QC - Daily Measurement Report'])
-    writer.writerow(['Report Date', datetime.now().strftime('%Y-%m-%d')])
-    writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-    writer.writerow([])
-    
-    # Products Summary
-    products = Product.objects.select_related('purchase_order').all()
-    writer.writerow(['PRODUCTS SUMMARY'])
-    writer.writerow(['PO Number', 'Brand', 'Article Type', 'Size', 'Color', 'Quantity'])
-    
-    for product in products:
-        writer.writerow([
-            product.purchase_order.po_number,
-            product.purchase_order.brand,
-            product.purchase_order.get_article_type_display(),
-            product.size,
-            product.color,
-            product.quantity
-        ])
-    
-    writer.writerow([])
-    
-    # QC Summary
-    writer.writerow(['QUALITY CONTROL SUMMARY'])
-    writer.writerow(['Size', 'Passed', 'Failed', 'Pass Rate'])
-    
-    # Simulated QC data
-    qc_summary = [
-        ['M', 8, 2, '80.0%'],
-        ['L', 6, 1, '85.7%'],
-        ['S', 5, 3, '62.5%'],
-        ['XL', 4, 0, '100.0%'],
-    ]
-    
-    for row in qc_summary:
-        writer.writerow(row)
-    
-    writer.writerow(['Total', 23, 6, '79.3%'])
+    today = timezone.localdate()
+    try:
+        start_date = date.fromisoformat(request.GET.get('start') or today.isoformat())
+        end_date = date.fromisoformat(request.GET.get('end') or start_date.isoformat())
+    except ValueError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'start and end must be dates in YYYY-MM-DD format'
+        }, status=400)
+    if end_date < start_date:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'end must not be before start'
+        }, status=400)
     
+    if report_type == 'csv' and end_date != start_date:
+        return generate_daily_csv_report(start_date, end_date)
+    return daily_report_file_response(request, start_date, report_type)
+
+def daily_report_file_response(request, report_date, report_type):
+    """
+    Serve a day's report from its rendered file, answering 304 when the
+    client already has this version. While a newer version is rendering,
+    the last complete one is served with its own ETag.
+    """
+    artifact, report_file = open_daily_report(report_date, report_type)
+    not_modified = get_conditional_response(request, etag=artifact.etag)
+    if not_modified is not None:
+        report_file.close()
+        return not_modified
+    
+    response = FileResponse(
+        report_file,
+        as_attachment=True,
+        filename=artifact.filename,
+        content_type=artifact.content_type,
+    )
+    response['ETag'] = artifact.etag
+    response['Cache-Control'] = 'private, no-cache'
     return response
 
-def generate_daily_pdf_report():
-    """Generate PDF daily report (simplified as text)"""
-    response = HttpResponse(content_type='text/plain')
-    filename = f"magic_qc_daily_report_{datetime.now().strftime('%Y%m%d')}.txt"
+def generate_daily_csv_report(start_date, end_date):
+    """Stream the CSV report for a date range, straight from the database"""
+    response = StreamingHttpResponse(iter_daily_csv_report(start_date, end_date), content_type='text/csv')
+    filename = f"magic_qc_daily_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    # Get actual data
-    products = Product.objects.select_related('purchase_order').all()
-    
-    report_content = []
-    report_content.append("MAGIC QC - DAILY MEASUREMENT REPORT")
-    report_content.append("=" * 60)
-    report_content.append(f"Report Date: {datetime.now().strftime('%Y-%m-%d')}")
-    report_content.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_content.append("")
-    
-    # Products Summary
-    report_content.append("PRODUCTS IN SYSTEM")
-    report_content.append("-" * 30)
-    for product in products:
-        report_content.append(f"PO-{product.purchase_order.po_number}: {product.size} {product.color} - Qty: {product.quantity}")
-    
-    report_content.append("")
-    report_content.append(f"Total Products: {products.count()}")
-    report_content.append("")
-    
-    # QC Summary
-    report_content.append("QUALITY CONTROL SUMMARY")
-    report_content.append("-" * 30)
-    report_content.append("Size   Passed  Failed  Pass Rate")
-    report_content.append("----   ------  ------  ---------")
-    report_content.append("M        8       2      80.0%")
-    report_content.append("L        6       1      85.7%") 
-    report_content.append("S        5       3      62.5%")
-    report_content.append("XL       4       0      100.0%")
-    report_content.append("----   ------  ------  ---------")
-    report_content.append("Total   23       6      79.3%")
-    
-    response.write("\n".join(report_content))
-    return response
\ No newline at end of file
+    return response
@@ -0,0 +1,192 @@
+"""
+Write-behind result persistence.
+Validated results are queued in process memory and saved by one writer
+thread in batches: every WRITE_BEHIND_BATCH uploads or WRITE_BEHIND_INTERVAL
+seconds, whichever comes first, each batch in one transaction of bulk
+inserts. The thread is the single writer of results, so stations no longer
+contend for the SQLite write lock; a batch that still finds the database
+busy is retried with jittered backoff. Results are written to the audit log
+as they are queued, and whatever is still queued at a graceful exit is saved
+before it.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Iterable, List, Optional
+
+from django.db import close_old_connections, transaction
+
+from measurements.audit import audit_results
+from measurements.background import next_group
+from measurements.persistence import ResultEntry, save_validation_results
+from measurements.sqlite import run_with_busy_retry
+
+# A batch is saved once it holds this many uploads, or once its first upload
+# has waited this many seconds
+WRITE_BEHIND_BATCH = 200
+WRITE_BEHIND_INTERVAL = 0.1
+
+# Uploads queued before submitters wait (backpressure), and how long they wait
+WRITE_BEHIND_QUEUE_MAX = 2000
+WRITE_BEHIND_SUBMIT_TIMEOUT = 5.0
+
+# Seconds save() waits for its results to be committed
+WRITE_BEHIND_SAVE_TIMEOUT = 60
+
+# Seconds a graceful exit waits for the queue to be saved before giving up
+WRITE_BEHIND_EXIT_TIMEOUT = 30
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindFull(Exception):
+    """The queue stayed full for WRITE_BEHIND_SUBMIT_TIMEOUT; nothing was queued."""
+
+
+class ResultWriteBuffer:
+    """Bounded queue of validation results with a single batching writer thread."""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=WRITE_BEHIND_QUEUE_MAX)
+        self._thread = threading.Thread(target=self._run, name='measurements-write-behind', daemon=True)
+        self._thread.start()
+
+    def _put(self, entries: tuple, product_id: Optional[int], future: Optional[Future]) -> None:
+        try:
+            self._queue.put((entries, product_id, future), timeout=WRITE_BEHIND_SUBMIT_TIMEOUT)
+        except queue.Full:
+            raise WriteBehindFull('Result storage is busy, please try again') from None
+        audit_results(entries, product_id)
+
+    def submit(self, entries: Iterable[ResultEntry], product_id: Optional[int] = None) -> None:
+        """
+        Queue results to be saved, waiting while the queue is full.
+
+        Raises:
+            WriteBehindFull: If no room freed up within WRITE_BEHIND_SUBMIT_TIMEOUT
+        """
+        self._put(tuple(entries), product_id, None)
+
+    def save(self, entries: Iterable[ResultEntry], product_id: Optional[int] = None) -> int:
+        """
+        Save results through the writer thread and wait until they are committed.
+
+        Returns:
+            int: Number of results saved
+
+        Raises:
+            WriteBehindFull: If no room freed up within WRITE_BEHIND_SUBMIT_TIMEOUT
+            Exception: Whatever the save raised
+        """
+        entries = tuple(entries)
+        if not entries:
+            return 0
+        future = Future()
+        self._put(entries, product_id, future)
+        return future.result(timeout=WRITE_BEHIND_SAVE_TIMEOUT)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every result queued so far is saved.
+
+        Returns:
+            bool: False if the timeout ran out first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            # A full queue behind a stuck save counts against the timeout too
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Save everything queued, then stop the thread."""
+        if not self._thread.is_alive():
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Write-behind queue still full at close; unsaved results are in the audit log for replay")
+            return
+        self._thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _save(self, items: List[tuple]) -> None:
+        by_product = defaultdict(list)
+        for entries, product_id, _ in items:
+            by_product[product_id].extend(entries)
+        with transaction.atomic():
+            for product_id, entries in by_product.items():
+                # Audited when queued
+                save_validation_results(entries, product_id=product_id, audit=False)
+
+    def _save_items(self, items: List[tuple]) -> None:
+        try:
+            run_with_busy_retry(self._save, items)
+        except Exception:
+            logger.exception("Write-behind batch save error")
+            close_old_connections()
+        else:
+            for entries, _, future in items:
+                if future is not None:
+                    future.set_result(len(entries))
+            return
+
+        # Save one upload at a time so a bad result doesn't take the rest of the batch with it
+        for entries, product_id, future in items:
+            try:
+                run_with_busy_retry(save_validation_results, entries, product_id=product_id, audit=False)
+            except Exception as e:
+                logger.exception(
+                    "Results %s not saved (kept in the audit log for replay)", [entry[0] for entry in entries]
+                )
+                if future is not None:
+                    future.set_exception(e)
+            else:
+                if future is not None:
+                    future.set_result(len(entries))
+
+    def _run(self) -> None:
+        while True:
+            group = next_group(self._queue, WRITE_BEHIND_BATCH, WRITE_BEHIND_INTERVAL, _STOP)
+            items = []
+            waiters = []
+            stop = False
+            for item in group:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    items.append(item)
+
+            if items:
+                self._save_items(items)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_result_buffer() -> ResultWriteBuffer:
+    """Return the process's write-behind buffer, starting it on first use."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = ResultWriteBuffer()
+            # A graceful exit saves what is still queued, but a stuck save doesn't hold it up
+            atexit.register(_buffer.close, WRITE_BEHIND_EXIT_TIMEOUT)
+        return _buffer
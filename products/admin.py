@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PurchaseOrder, Product, StandardSizeChart
+from .models import PurchaseOrder, Product, StandardSizeChart, ToleranceRule
 
 @admin.register(PurchaseOrder)
 class PurchaseOrderAdmin(admin.ModelAdmin):
@@ -15,5 +15,10 @@ class ProductAdmin(admin.ModelAdmin):
 
 @admin.register(StandardSizeChart)
 class StandardSizeChartAdmin(admin.ModelAdmin):
-    list_display = ['size', 'A_length_from_shoulder', 'B_chest_width', 'I_sleeve_length']
-    list_filter = ['size']
\ No newline at end of file
+    list_display = ['size', 'article_type', 'A_length_from_shoulder', 'B_chest_width', 'I_sleeve_length']
+    list_filter = ['size', 'article_type']
+
+@admin.register(ToleranceRule)
+class ToleranceRuleAdmin(admin.ModelAdmin):
+    list_display = ['article_type', 'size', 'code', 'minus_tolerance', 'plus_tolerance', 'updated_at']
+    list_filter = ['article_type', 'size', 'code']
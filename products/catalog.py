@@ -0,0 +1,205 @@
+"""
+Product catalog queries.
+Serves the operator panel's product lists from one joined .values() query per
+(brand, article type), cached in process memory until a PO or product changes,
+and pages through search results with keyset pagination.
+"""
+
+import heapq
+import json
+import threading
+import time
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.db import DatabaseError
+from django.db.models import Count, Max, Q
+
+from .models import Product, PurchaseOrder
+
+ARTICLE_TYPE_NAMES = dict(PurchaseOrder.ARTICLE_TYPE_CHOICES)
+
+# Cached (brand, article type) lists; past this the cache starts over
+CATALOG_CACHE_MAX_KEYS = 256
+
+# Seconds between checks that the product tables still match the cached lists
+CATALOG_CHECK_INTERVAL = 5
+
+# Products per page of catalog search, by default and at most
+CATALOG_PAGE_SIZE = 25
+CATALOG_MAX_PAGE_SIZE = 100
+
+
+class CatalogEntry(NamedTuple):
+    """One cached product list, with its JSON response body encoded once."""
+    products: Tuple[Dict, ...]
+    body: bytes
+
+
+class ProductCatalog:
+    """
+    In-process cache of product lists keyed by (brand, article type).
+
+    Saving or deleting a PurchaseOrder or Product invalidates the whole cache
+    (see products.signals); lists are rebuilt on next use. Changes made by
+    another process, or by .update(), are picked up within
+    CATALOG_CHECK_INTERVAL, when the product count or the latest product or
+    PO update time no longer matches the one the lists were loaded at.
+    """
+
+    _products: Dict[Tuple[str, Optional[str]], CatalogEntry] = {}
+    _generation = 0  # bumped on invalidate, so a load that raced it isn't stored
+    _loaded_state: Optional[tuple] = None  # table state the cached lists were loaded at
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _table_state(cls) -> Optional[tuple]:
+        """(product count, latest product update, latest PO update); one aggregate query."""
+        try:
+            state = Product.objects.aggregate(
+                count=Count('id'), updated_at=Max('updated_at'), po_updated_at=Max('purchase_order__updated_at'),
+            )
+        except DatabaseError:
+            return None
+        return state['count'], state['updated_at'], state['po_updated_at']
+
+    @classmethod
+    def _check_tables(cls) -> None:
+        if time.monotonic() < cls._checked_at + CATALOG_CHECK_INTERVAL:
+            return
+        cls._checked_at = time.monotonic()
+        # Taken before any reload: a change committed during one shows up at the next check
+        state = cls._table_state()
+        if state != cls._loaded_state:
+            cls.invalidate()
+            cls._loaded_state = state
+
+    @classmethod
+    def _load(cls, brand: str, article_type: Optional[str]) -> CatalogEntry:
+        products = Product.objects.filter(purchase_order__brand=brand)
+        if article_type:
+            products = products.filter(purchase_order__article_type=article_type)
+        rows = products.order_by('purchase_order_id', 'id').values_list(
+            'purchase_order_id', 'purchase_order__po_number', 'id',
+            'size', 'color', 'quantity', 'purchase_order__article_type',
+        )
+        products = tuple(
+            {
+                'po_id': po_id,
+                'po_number': po_number,
+                'product_id': product_id,
+                'size': size,
+                'color': color,
+                'quantity': quantity,
+                'article_type': ARTICLE_TYPE_NAMES.get(po_article_type, po_article_type),
+            }
+            for po_id, po_number, product_id, size, color, quantity, po_article_type in rows
+        )
+        return CatalogEntry(products, json.dumps({'products': products}).encode('utf-8'))
+
+    @classmethod
+    def get_entry(cls, brand: str, article_type: Optional[str] = None) -> CatalogEntry:
+        """
+        Return the cached list of a brand's products, optionally of one article
+        type, with its JSON body. The product dicts are shared; don't modify them.
+        """
+        cls._check_tables()
+        key = (brand, article_type or None)
+        entry = cls._products.get(key)
+        if entry is None:
+            generation = cls._generation
+            entry = cls._load(brand, article_type)
+            with cls._lock:
+                if generation != cls._generation:
+                    return entry
+                if len(cls._products) >= CATALOG_CACHE_MAX_KEYS:
+                    cls._products = {}
+                # Copy-on-write: readers never see a dict being resized
+                cls._products = {**cls._products, key: entry}
+        return entry
+
+    @classmethod
+    def get_products(cls, brand: str, article_type: Optional[str] = None) -> List[Dict]:
+        """Return the products of a brand's POs, optionally of one article type."""
+        return list(cls.get_entry(brand, article_type).products)
+
+    @classmethod
+    def get_products_json(cls, brand: str, article_type: Optional[str] = None) -> bytes:
+        """Return {"products": [...]} as encoded JSON, serialized once per cached list."""
+        return cls.get_entry(brand, article_type).body
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop every cached list; the next access reloads it."""
+        with cls._lock:
+            cls._products = {}
+            cls._generation += 1
+
+
+def search_products(
+    query: str = '',
+    brand: Optional[str] = None,
+    article_type: Optional[str] = None,
+    size: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = CATALOG_PAGE_SIZE
+) -> Tuple[List[Dict], Optional[int]]:
+    """
+    One page of products, newest first, matching the filters and a search on
+    PO number, brand or colour. Pages continue below `before_id`.
+
+    Once a brand is picked its products come from the cached catalog list and
+    are filtered in memory, so the database never sorts a brand's products per
+    request; searches across all brands walk the product primary key down
+    until the page is full.
+
+    Returns:
+        Tuple[List[Dict], Optional[int]]: The products, and the before_id of
+        the next page (None on the last page)
+    """
+    if brand:
+        needle = query.lower()
+        brand_matches = needle in brand.lower()
+        candidates = (
+            product for product in ProductCatalog.get_entry(brand, article_type).products
+            if (not size or product['size'] == size)
+            and (before_id is None or product['product_id'] < before_id)
+            and (brand_matches or needle in product['po_number'].lower() or needle in product['color'].lower())
+        )
+        rows = heapq.nlargest(limit + 1, candidates, key=itemgetter('product_id'))
+        next_before_id = rows[limit - 1]['product_id'] if len(rows) > limit else None
+        return [{**product, 'brand': brand} for product in rows[:limit]], next_before_id
+
+    products = Product.objects.all()
+    if article_type:
+        products = products.filter(purchase_order__article_type=article_type)
+    if size:
+        products = products.filter(size=size)
+    if query:
+        products = products.filter(
+            Q(purchase_order__po_number__icontains=query)
+            | Q(purchase_order__brand__icontains=query)
+            | Q(color__icontains=query)
+        )
+    if before_id is not None:
+        products = products.filter(id__lt=before_id)
+
+    rows = list(products.order_by('-id').values_list(
+        'purchase_order_id', 'purchase_order__po_number', 'purchase_order__brand', 'id',
+        'size', 'color', 'quantity', 'purchase_order__article_type',
+    )[:limit + 1])
+    next_before_id = rows[limit - 1][3] if len(rows) > limit else None
+    return [
+        {
+            'po_id': po_id,
+            'po_number': po_number,
+            'brand': po_brand,
+            'product_id': product_id,
+            'size': product_size,
+            'color': color,
+            'quantity': quantity,
+            'article_type': ARTICLE_TYPE_NAMES.get(po_article_type, po_article_type),
+        }
+        for po_id, po_number, po_brand, product_id, product_size, color, quantity, po_article_type in rows[:limit]
+    ], next_before_id
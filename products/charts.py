@@ -0,0 +1,194 @@
+"""
+Size chart registry.
+Loads every StandardSizeChart row once into float arrays keyed by article type
+and size, and serves them from process memory until a chart row changes.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+from django.db import DatabaseError
+from django.db.models import Count, Max
+
+from measurements.utils import ARTICLE_SPECS, DEFAULT_ARTICLE_TYPE
+from .models import StandardSizeChart
+
+# Measurement code -> StandardSizeChart field
+CHART_FIELDS = (
+    ('A', 'A_length_from_shoulder'),
+    ('B', 'B_chest_width'),
+    ('C', 'C_chest_width_armholes'),
+    ('D', 'D_bottom_width'),
+    ('E', 'E_new_width'),
+    ('F', 'F_back_width'),
+    ('G', 'G_back_width_armholes'),
+    ('H', 'H_neck_width'),
+    ('I', 'I_sleeve_length'),
+    ('J', 'J_sleeve_width'),
+    ('K', 'K_sleeve_width_above_cuff'),
+    ('L', 'L_sleeve_opening'),
+    ('M', 'M_cuff_length'),
+    ('N', 'N_armhole'),
+    ('O', 'O_back_neck_drop'),
+    ('P', 'P_front_neck_drop'),
+    ('Q', 'Q_collar_width'),
+    ('R', 'R_shoulder_drop'),
+    ('S', 'S_waistband_length'),
+    ('T', 'T_forward_shoulder_seam'),
+    ('PRINT_PLACEMENT_FROM_CF', 'front_placement_from_cf'),
+)
+CHART_CODES = tuple(code for code, _ in CHART_FIELDS)
+
+# Seconds clients may reuse a size list or chart before revalidating its ETag
+SIZE_CHART_MAX_AGE = 60
+
+# Seconds between checks that no other process changed the chart rows
+SIZE_CHART_CHECK_INTERVAL = 5
+
+# Charts built into the validation engine, used where the database has no row
+BUILTIN_CHARTS = {article_type: spec.charts for article_type, spec in ARTICLE_SPECS.items()}
+
+
+class SizeChart(NamedTuple):
+    """One size chart: values as a float array in CHART_CODES order."""
+    article_type: str
+    size: str
+    values: np.ndarray  # NaN where the chart has no value
+    chart: Dict[str, float]
+
+
+def _build_chart(article_type: str, size: str, chart: Dict[str, float]) -> SizeChart:
+    values = np.array([chart.get(code, np.nan) for code in CHART_CODES], dtype=float)
+    values.flags.writeable = False
+    return SizeChart(article_type=article_type, size=size, values=values, chart=chart)
+
+
+class SizeChartRegistry:
+    """
+    In-process cache of all size charts keyed by article type, then size.
+
+    Database rows take precedence over the built-in charts. Saving or
+    deleting a StandardSizeChart invalidates the cache (see products.signals),
+    bumping `version` so the validation engine recompiles its plans. Changes
+    made by another process are picked up within SIZE_CHART_CHECK_INTERVAL,
+    when the row count or latest update time no longer matches the loaded
+    charts'. The digest is a hash of the chart contents, the same in every
+    process serving the same charts, and backs the ETags of the size chart
+    endpoints.
+    """
+
+    version = 0
+    _loaded: Optional[Tuple[str, Dict[str, Dict[str, SizeChart]], tuple]] = None  # (digest, charts, table state)
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _table_state(cls) -> Optional[tuple]:
+        """(row count, latest update) of the chart table; one aggregate query."""
+        try:
+            state = StandardSizeChart.objects.aggregate(count=Count('id'), updated_at=Max('updated_at'))
+        except DatabaseError:
+            return None
+        return state['count'], state['updated_at']
+
+    @classmethod
+    def _load(cls) -> Tuple[str, Dict[str, Dict[str, SizeChart]], tuple]:
+        # Taken first: a change committed during the load shows up at the next check
+        table_state = cls._table_state()
+        charts = {
+            article_type: {
+                size: _build_chart(article_type, size, chart) for size, chart in article_charts.items()
+            }
+            for article_type, article_charts in BUILTIN_CHARTS.items()
+        }
+
+        try:
+            rows = list(StandardSizeChart.objects.values(
+                'article_type', 'size', *(field for _, field in CHART_FIELDS)
+            ))
+        except DatabaseError:
+            # Table not migrated yet - serve the built-in charts
+            rows = []
+
+        for row in rows:
+            chart = {}
+            for code, field in CHART_FIELDS:
+                value = row[field]
+                # Measurements must be positive, so 0 means "not specified"
+                if value is not None and value > 0:
+                    chart[code] = float(value)
+            charts.setdefault(row['article_type'], {})[row['size']] = _build_chart(
+                row['article_type'], row['size'], chart
+            )
+
+        digest = hashlib.sha1()
+        for article_type in sorted(charts):
+            for size in sorted(charts[article_type]):
+                chart = charts[article_type][size].chart
+                digest.update(f"{article_type}|{size}|{sorted(chart.items())}\n".encode())
+
+        return digest.hexdigest()[:12], charts, table_state
+
+    @classmethod
+    def _get(cls) -> Tuple[str, Dict[str, Dict[str, SizeChart]], tuple]:
+        loaded = cls._loaded
+        if loaded is not None and time.monotonic() >= cls._checked_at + SIZE_CHART_CHECK_INTERVAL:
+            cls._checked_at = time.monotonic()
+            if cls._table_state() != loaded[2]:
+                cls.invalidate()
+                loaded = None
+        if loaded is None:
+            with cls._lock:
+                if cls._loaded is None:
+                    cls._loaded = cls._load()
+                    cls._checked_at = time.monotonic()
+                loaded = cls._loaded
+        return loaded
+
+    @classmethod
+    def all(cls) -> Dict[str, Dict[str, SizeChart]]:
+        """Return every chart, loading them from the database on first use."""
+        return cls._get()[1]
+
+    @classmethod
+    def get_version(cls) -> int:
+        """Return `version`, after checking the charts are still current."""
+        cls._get()
+        return cls.version
+
+    @classmethod
+    def get_digest(cls) -> str:
+        """Return the digest (content hash) of the current charts."""
+        return cls._get()[0]
+
+    @classmethod
+    def etag(cls, *parts: str) -> str:
+        """Strong ETag for a response built from the charts and the given request parts."""
+        key = '|'.join((cls.get_digest(),) + parts)
+        return f'"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+    @classmethod
+    def get(cls, size: str, article_type: str = DEFAULT_ARTICLE_TYPE) -> Optional[SizeChart]:
+        """Return the chart for a size and article type, or None."""
+        return cls.all().get(article_type, {}).get(size)
+
+    @classmethod
+    def get_charts(cls, article_type: str = DEFAULT_ARTICLE_TYPE) -> Dict[str, Dict[str, float]]:
+        """Return {size: {code: value}} for one article type."""
+        return {size: chart.chart for size, chart in cls.all().get(article_type, {}).items()}
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached charts; the next access reloads them."""
+        with cls._lock:
+            cls._loaded = None
+            cls.version += 1
+
+    @classmethod
+    def reload(cls) -> None:
+        """Invalidate and load the charts again right away."""
+        cls.invalidate()
+        cls.all()
@@ -23,6 +23,7 @@ class Command(BaseCommand):
         for data in sizes_data:
             StandardSizeChart.objects.update_or_create(
                 size=data['size'],
+                article_type=data.get('article_type', 'sweat_shirt'),
                 defaults=data
             )
         
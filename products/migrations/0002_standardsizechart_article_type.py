@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standardsizechart',
+            name='article_type',
+            field=models.CharField(choices=[('sweat_shirt', 'Sweat Shirt'), ('hoodie', 'Hoodie'), ('tshirt', 'T-Shirt'), ('pants', 'Pants')], default='sweat_shirt', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='standardsizechart',
+            name='size',
+            field=models.CharField(choices=[('6/7', '6/7 Years'), ('7/8', '7/8 Years'), ('8/9', '8/9 Years'), ('9/10', '9/10 Years'), ('10/11', '10/11 Years'), ('12/13', '12/13 Years'), ('S', 'Small'), ('M', 'Medium'), ('L', 'Large'), ('XL', 'Extra Large')], max_length=10),
+        ),
+        migrations.AlterUniqueTogether(
+            name='standardsizechart',
+            unique_together={('size', 'article_type')},
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:39
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_standardsizechart_article_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ToleranceRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('article_type', models.CharField(choices=[('sweat_shirt', 'Sweat Shirt'), ('hoodie', 'Hoodie'), ('tshirt', 'T-Shirt'), ('pants', 'Pants')], default='sweat_shirt', max_length=20)),
+                ('size', models.CharField(blank=True, help_text='Leave blank to apply to all sizes', max_length=10)),
+                ('code', models.CharField(choices=[('A', 'A'), ('B', 'B'), ('C', 'C'), ('D', 'D'), ('E', 'E'), ('F', 'F'), ('G', 'G'), ('H', 'H'), ('I', 'I'), ('J', 'J'), ('K', 'K'), ('L', 'L'), ('M', 'M'), ('N', 'N'), ('O', 'O'), ('P', 'P'), ('PRINT_PLACEMENT_FROM_CF', 'PRINT_PLACEMENT_FROM_CF'), ('Q', 'Q'), ('R', 'R'), ('S', 'S'), ('T', 'T')], max_length=30)),
+                ('minus_tolerance', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Minus tolerance (cm)')),
+                ('plus_tolerance', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Plus tolerance (cm)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tolerance Rule',
+                'verbose_name_plural': 'Tolerance Rules',
+                'unique_together': {('article_type', 'size', 'code')},
+            },
+        ),
+    ]
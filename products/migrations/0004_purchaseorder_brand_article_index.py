@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_tolerancerule'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['brand', 'article_type'], name='products_pu_brand_20cead_idx'),
+        ),
+    ]
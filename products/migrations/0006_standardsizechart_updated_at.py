@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standardsizechart',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
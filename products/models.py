@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.validators import MinValueValidator
+from measurements.utils import MEASUREMENT_CODE_ORDER
 
 class PurchaseOrder(models.Model):
     BRAND_CHOICES = [
@@ -24,6 +25,12 @@ class PurchaseOrder(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Operator panel catalog lookups (see products.catalog)
+            models.Index(fields=['brand', 'article_type']),
+        ]
+
     def __str__(self):
         return f"PO-{self.po_number}"
 
@@ -45,6 +52,7 @@ class Product(models.Model):
     size = models.CharField(max_length=10, choices=SIZE_CHOICES)
     quantity = models.IntegerField(validators=[MinValueValidator(1)])
     color = models.CharField(max_length=50)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.purchase_order.article_type} - {self.size} - {self.color}"
@@ -63,7 +71,8 @@ class StandardSizeChart(models.Model):
         ('XL', 'Extra Large'),
     ]
     
-    size = models.CharField(max_length=10, choices=SIZE_CHOICES, unique=True)
+    size = models.CharField(max_length=10, choices=SIZE_CHOICES)
+    article_type = models.CharField(max_length=20, choices=PurchaseOrder.ARTICLE_TYPE_CHOICES, default='sweat_shirt')
     
     # Measurements from the provided chart (in cm)
     A_length_from_shoulder = models.DecimalField(max_digits=5, decimal_places=2, verbose_name="A - Length from shoulder")
@@ -87,10 +96,36 @@ class StandardSizeChart(models.Model):
     S_waistband_length = models.DecimalField(max_digits=5, decimal_places=2, verbose_name="S - Waistband length")
     T_forward_shoulder_seam = models.DecimalField(max_digits=5, decimal_places=2, verbose_name="T - Forward shoulder seam")
     front_placement_from_cf = models.DecimalField(max_digits=5, decimal_places=2, verbose_name="Front placement from CF")
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = "Standard Size Chart"
         verbose_name_plural = "Standard Size Charts"
+        unique_together = [('size', 'article_type')]
+    
+    def __str__(self):
+        return f"Standard Size - {self.size} ({self.get_article_type_display()})"
+
+class ToleranceRule(models.Model):
+    """
+    Buyer tolerance for one measurement code, in cm below and above the
+    standard value. A rule without a size applies to every size of the
+    article; a rule for a specific size takes precedence over it.
+    """
+    CODE_CHOICES = [(code, code) for code in MEASUREMENT_CODE_ORDER]
+    
+    article_type = models.CharField(max_length=20, choices=PurchaseOrder.ARTICLE_TYPE_CHOICES, default='sweat_shirt')
+    size = models.CharField(max_length=10, blank=True, help_text="Leave blank to apply to all sizes")
+    code = models.CharField(max_length=30, choices=CODE_CHOICES)
+    minus_tolerance = models.DecimalField(max_digits=5, decimal_places=2, validators=[MinValueValidator(0)], verbose_name="Minus tolerance (cm)")
+    plus_tolerance = models.DecimalField(max_digits=5, decimal_places=2, validators=[MinValueValidator(0)], verbose_name="Plus tolerance (cm)")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Tolerance Rule"
+        verbose_name_plural = "Tolerance Rules"
+        unique_together = [('article_type', 'size', 'code')]
     
     def __str__(self):
-        return f"Standard Size - {self.size}"
\ No newline at end of file
+        size = self.size or "all sizes"
+        return f"{self.get_article_type_display()} {size} {self.code}: -{self.minus_tolerance}/+{self.plus_tolerance}"
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import ProductCatalog
+from .charts import SizeChartRegistry
+from .models import Product, PurchaseOrder, StandardSizeChart, ToleranceRule
+from .tolerances import ToleranceRuleRegistry
+
+
+@receiver([post_save, post_delete], sender=StandardSizeChart)
+def invalidate_size_charts(sender, **kwargs):
+    """Reload the chart registry once the chart change is committed"""
+    SizeChartRegistry.invalidate()
+    # Reload eagerly so the next validation request doesn't pay for the query
+    transaction.on_commit(SizeChartRegistry.reload)
+
+
+@receiver([post_save, post_delete], sender=ToleranceRule)
+def invalidate_tolerance_rules(sender, **kwargs):
+    """Reload the tolerance rule registry once the rule change is committed"""
+    ToleranceRuleRegistry.invalidate()
+    transaction.on_commit(ToleranceRuleRegistry.reload)
+
+
+@receiver([post_save, post_delete], sender=PurchaseOrder)
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_product_catalog(sender, **kwargs):
+    """Drop cached product lists now and again once the change is committed"""
+    ProductCatalog.invalidate()
+    # A list loaded from the pre-commit snapshot in the meantime is dropped too
+    transaction.on_commit(ProductCatalog.invalidate)
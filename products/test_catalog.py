@@ -0,0 +1,257 @@
+"""
+Test suite for the product catalog.
+Tests the cached product lists and their pre-encoded JSON bodies, that
+edits made without signals are picked up, and the paginated product search.
+"""
+
+import json
+import time
+from datetime import date
+
+from magic_qc.testing import clear_products, setup_test_database
+
+
+def create_catalog():
+    """Two ZARA POs and one H&M PO with products, oldest first."""
+    from products.models import Product, PurchaseOrder
+
+    clear_products()
+    orders = [
+        PurchaseOrder.objects.create(
+            po_number=po_number, date=date(2026, 6, 1), brand=brand,
+            origin_country='Portugal', article_type=article_type,
+        )
+        for po_number, brand, article_type in (
+            ('PO-Z1', 'ZARA', 'sweat_shirt'), ('PO-Z2', 'ZARA', 'hoodie'), ('PO-H1', 'H&M', 'sweat_shirt'),
+        )
+    ]
+    return [
+        Product.objects.create(purchase_order=order, size=size, quantity=quantity, color=color)
+        for order, size, quantity, color in (
+            (orders[0], '8/9', 40, 'Navy'),
+            (orders[0], '9/10', 20, 'Grey'),
+            (orders[1], '8/9', 15, 'Black'),
+            (orders[2], '8/9', 30, 'Navy'),
+        )
+    ]
+
+
+def operator_client():
+    """Test client logged in as an operator."""
+    from django.test import Client
+    from accounts.models import CustomUser
+    user, _ = CustomUser.objects.get_or_create(username='catalog_operator', defaults={'role': 'operator'})
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def test_catalog_cached_json_body():
+    """Test a brand's list is encoded once and served from the cache until a product changes."""
+    setup_test_database()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from products.catalog import ProductCatalog
+
+    print("\n" + "="*70)
+    print("TEST 1: Product Catalog - Cached JSON Body")
+    print("="*70)
+
+    products = create_catalog()
+    ProductCatalog.invalidate()
+    body = ProductCatalog.get_products_json('ZARA')
+    listed = json.loads(body)['products']
+    print(f"ZARA products: {[(p['po_number'], p['size'], p['color']) for p in listed]}")
+    assert body == json.dumps({'products': ProductCatalog.get_products('ZARA')}).encode('utf-8')
+    assert [p['product_id'] for p in listed] == [p.id for p in products[:3]]
+    assert listed[2] == {
+        'po_id': products[2].purchase_order_id, 'po_number': 'PO-Z2', 'product_id': products[2].id,
+        'size': '8/9', 'color': 'Black', 'quantity': 15, 'article_type': 'Hoodie',
+    }
+    assert [p['po_number'] for p in ProductCatalog.get_products('ZARA', 'hoodie')] == ['PO-Z2']
+
+    # Within the check interval the same bytes come back without a query
+    with CaptureQueriesContext(connection) as queries:
+        assert ProductCatalog.get_products_json('ZARA') is body
+    assert not queries.captured_queries
+
+    client = operator_client()
+    response = client.get(reverse('products_by_brand') + '?brand=ZARA')
+    assert response.status_code == 200 and response['Content-Type'] == 'application/json'
+    assert response.content == body
+
+    # A save drops the cached list
+    products[1].color = 'Teal'
+    products[1].save()
+    new_body = ProductCatalog.get_products_json('ZARA')
+    assert new_body != body and json.loads(new_body)['products'][1]['color'] == 'Teal'
+
+    clear_products()
+    print("✓ Encoded once, served without queries, re-encoded after a save")
+
+
+def test_catalog_picks_up_unsignalled_edits():
+    """Test .update() edits, which send no signals, are picked up within CATALOG_CHECK_INTERVAL."""
+    setup_test_database()
+    from django.utils import timezone
+    from products import catalog
+    from products.catalog import ProductCatalog
+    from products.models import Product, PurchaseOrder
+
+    print("\n" + "="*70)
+    print("TEST 2: Product Catalog - Edits Without Signals")
+    print("="*70)
+
+    products = create_catalog()
+    original_interval = catalog.CATALOG_CHECK_INTERVAL
+    catalog.CATALOG_CHECK_INTERVAL = 0.2
+    try:
+        ProductCatalog.invalidate()
+        assert [p['color'] for p in ProductCatalog.get_products('H&M')] == ['Navy']
+
+        # Like a save in another process: the row changes, this process gets no signal
+        Product.objects.filter(id=products[3].id).update(color='Olive', updated_at=timezone.now())
+        assert [p['color'] for p in ProductCatalog.get_products('H&M')] == ['Navy']
+        time.sleep(0.3)
+        colors = [p['color'] for p in ProductCatalog.get_products('H&M')]
+        print(f"H&M colors after the interval: {colors}")
+        assert colors == ['Olive']
+
+        PurchaseOrder.objects.filter(po_number='PO-H1').update(po_number='PO-H1B', updated_at=timezone.now())
+        time.sleep(0.3)
+        assert [p['po_number'] for p in ProductCatalog.get_products('H&M')] == ['PO-H1B']
+
+        # A new product in another process
+        Product.objects.bulk_create([Product(purchase_order=products[3].purchase_order, size='9/10',
+                                             quantity=5, color='Sand')])
+        time.sleep(0.3)
+        assert [p['color'] for p in ProductCatalog.get_products('H&M')] == ['Olive', 'Sand']
+    finally:
+        catalog.CATALOG_CHECK_INTERVAL = original_interval
+        clear_products()
+
+    print("✓ Product and PO edits made without signals show up after the check interval")
+
+
+def search(client, **params) -> list:
+    """Product ids of every page of a search, following next_before to the end."""
+    from django.urls import reverse
+    ids, pages = [], 0
+    while True:
+        response = client.get(reverse('search_products'), params)
+        assert response.status_code == 200
+        payload = response.json()
+        assert len(payload['products']) <= int(params.get('limit', 25))
+        ids.extend(product['product_id'] for product in payload['products'])
+        pages += 1
+        if payload['next_before'] is None:
+            return ids
+        params = dict(params, before=payload['next_before'])
+        assert pages < 100
+
+
+def test_search_pagination():
+    """Test pages follow the before cursor newest first, with and without a brand."""
+    setup_test_database()
+    from django.urls import reverse
+
+    print("\n" + "="*70)
+    print("TEST 3: Product Search - Pagination")
+    print("="*70)
+
+    products = create_catalog()
+    ids = [product.id for product in products]
+    client = operator_client()
+
+    for limit in (1, 2, 3, 25):
+        assert search(client, limit=limit) == ids[::-1], f"limit={limit}"
+        assert search(client, brand='ZARA', limit=limit) == ids[2::-1], f"ZARA limit={limit}"
+
+    first = client.get(reverse('search_products'), {'limit': 2}).json()
+    print(f"First page: {[p['product_id'] for p in first['products']]}, next_before: {first['next_before']}")
+    assert first['next_before'] == ids[2]
+    assert search(client, before=ids[2]) == [ids[1], ids[0]]
+    assert search(client, brand='ZARA', before=ids[1]) == [ids[0]]
+
+    # Both paths return the same fields
+    database_row = client.get(reverse('search_products'), {'q': 'PO-Z2'}).json()['products'][0]
+    cached_row = client.get(reverse('search_products'), {'brand': 'ZARA', 'q': 'PO-Z2'}).json()['products'][0]
+    assert database_row == cached_row and cached_row['brand'] == 'ZARA'
+
+    for bad in ({'before': 'x'}, {'limit': 'ten'}, {'limit': 0}):
+        assert client.get(reverse('search_products'), bad).status_code == 400, bad
+
+    clear_products()
+    print("✓ Every page size walks all products once, newest first; bad cursors get 400")
+
+
+def test_search_filters():
+    """Test the search box and the brand, article type and size filters."""
+    setup_test_database()
+
+    print("\n" + "="*70)
+    print("TEST 4: Product Search - Filters")
+    print("="*70)
+
+    z1_8, z1_9, z2_8, h1_8 = (product.id for product in create_catalog())
+    client = operator_client()
+
+    cases = [
+        ({'q': 'navy'}, [h1_8, z1_8]),
+        ({'q': 'po-z'}, [z2_8, z1_9, z1_8]),
+        ({'q': 'h&m'}, [h1_8]),
+        ({'q': 'nothing'}, []),
+        ({'brand': 'ZARA', 'q': 'grey'}, [z1_9]),
+        ({'brand': 'ZARA', 'q': 'zar'}, [z2_8, z1_9, z1_8]),
+        ({'brand': 'ZARA', 'q': 'po-z1'}, [z1_9, z1_8]),
+        ({'brand': 'H&M'}, [h1_8]),
+        ({'brand': 'OTHER'}, []),
+        ({'article_type': 'hoodie'}, [z2_8]),
+        ({'brand': 'ZARA', 'article_type': 'sweat_shirt'}, [z1_9, z1_8]),
+        ({'size': '8/9'}, [h1_8, z2_8, z1_8]),
+        ({'brand': 'ZARA', 'size': '8/9'}, [z2_8, z1_8]),
+        ({'article_type': 'sweat_shirt', 'size': '8/9', 'q': 'navy'}, [h1_8, z1_8]),
+    ]
+    for params, expected in cases:
+        ids = search(client, limit=1, **params)
+        print(f"{params}: {len(ids)} products")
+        assert ids == expected, params
+
+    clear_products()
+    print("✓ Search and filters select exactly the matching products, on both paths")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "█"*70)
+    print("█ PRODUCT CATALOG - TEST SUITE")
+    print("█"*70)
+
+    try:
+        test_catalog_cached_json_body()
+        test_catalog_picks_up_unsignalled_edits()
+        test_search_pagination()
+        test_search_filters()
+
+        print("\n" + "█"*70)
+        print("█ ALL TESTS PASSED ✓")
+        print("█"*70)
+        print("\nSummary:")
+        print("  • Product lists are encoded once and served from the cache")
+        print("  • Edits made without signals are picked up within CATALOG_CHECK_INTERVAL")
+        print("  • Product search pages newest first with the before cursor")
+        print("  • The search box and brand/article type/size filters select the right products")
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,103 @@
+"""
+Tolerance rule registry.
+Loads every ToleranceRule row once into per-article tolerance tables and serves
+them from process memory until a rule changes.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.db import DatabaseError
+from django.db.models import Count, Max
+
+from measurements.utils import ToleranceTable
+from .models import ToleranceRule
+
+# Seconds between checks that no other process changed the rule rows
+TOLERANCE_RULE_CHECK_INTERVAL = 5
+
+
+class ToleranceRuleRegistry:
+    """
+    In-process cache of all tolerance rules keyed by article type.
+
+    The version is a hash of the rule contents, so every process serving the
+    same rules reports the same version in validation results. Saving or
+    deleting a ToleranceRule invalidates the cache (see products.signals);
+    changes made by another process are picked up within
+    TOLERANCE_RULE_CHECK_INTERVAL, when the row count or latest update time
+    no longer matches the loaded rules'.
+    """
+
+    _rules: Optional[Tuple[str, Dict[str, ToleranceTable], tuple]] = None  # (version, rules, table state)
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _table_state(cls) -> Optional[tuple]:
+        """(row count, latest update) of the rule table; one aggregate query."""
+        try:
+            state = ToleranceRule.objects.aggregate(count=Count('id'), updated_at=Max('updated_at'))
+        except DatabaseError:
+            return None
+        return state['count'], state['updated_at']
+
+    @classmethod
+    def _load(cls) -> Tuple[str, Dict[str, ToleranceTable], tuple]:
+        # Taken first: a change committed during the load shows up at the next check
+        table_state = cls._table_state()
+        try:
+            rows = list(ToleranceRule.objects.order_by('article_type', 'size', 'code').values_list(
+                'article_type', 'size', 'code', 'minus_tolerance', 'plus_tolerance'
+            ))
+        except DatabaseError:
+            # Table not migrated yet - no rules, built-in tolerances apply
+            rows = []
+
+        rules = {}
+        digest = hashlib.sha1()
+        for article_type, size, code, minus_tolerance, plus_tolerance in rows:
+            rules.setdefault(article_type, {})[(size or None, code)] = (float(minus_tolerance), float(plus_tolerance))
+            digest.update(f"{article_type}|{size}|{code}|{minus_tolerance}|{plus_tolerance}\n".encode())
+
+        return digest.hexdigest()[:12], rules, table_state
+
+    @classmethod
+    def _get(cls) -> Tuple[str, Dict[str, ToleranceTable], tuple]:
+        loaded = cls._rules
+        if loaded is not None and time.monotonic() >= cls._checked_at + TOLERANCE_RULE_CHECK_INTERVAL:
+            cls._checked_at = time.monotonic()
+            if cls._table_state() != loaded[2]:
+                cls.invalidate()
+                loaded = None
+        if loaded is None:
+            with cls._lock:
+                if cls._rules is None:
+                    cls._rules = cls._load()
+                    cls._checked_at = time.monotonic()
+                loaded = cls._rules
+        return loaded
+
+    @classmethod
+    def get_rules(cls, article_type: str) -> ToleranceTable:
+        """Return {(size or None, code): (minus, plus)} for one article type."""
+        return cls._get()[1].get(article_type, {})
+
+    @classmethod
+    def get_version(cls) -> str:
+        """Return the version (content hash) of the current rules."""
+        return cls._get()[0]
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached rules; the next access reloads them."""
+        with cls._lock:
+            cls._rules = None
+
+    @classmethod
+    def reload(cls) -> None:
+        """Invalidate and load the rules again right away."""
+        cls.invalidate()
+        cls._get()
@@ -3,7 +3,10 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.db.models import Count
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from .models import PurchaseOrder, Product, StandardSizeChart
+from .charts import CHART_CODES, DEFAULT_ARTICLE_TYPE, SIZE_CHART_MAX_AGE, SizeChartRegistry
 from .forms import PurchaseOrderForm, ProductForm
 
 def is_admin(user):
@@ -77,37 +80,26 @@ def add_product(request, po_id):
     }
     return render(request, 'products/add_product.html', context)
 
+def standard_measurements_etag(request):
+    """ETag from the chart digest and the requested size; no DB query"""
+    return SizeChartRegistry.etag(
+        'standard-measurements', request.GET.get('article_type', DEFAULT_ARTICLE_TYPE), request.GET.get('size') or ''
+    )
+
 @login_required
+@cache_control(private=True, max_age=SIZE_CHART_MAX_AGE)
+@condition(etag_func=standard_measurements_etag)
 def get_standard_measurements(request):
     size = request.GET.get('size')
-    try:
-        standard_size = StandardSizeChart.objects.get(size=size)
-        data = {
-            'A': float(standard_size.A_length_from_shoulder),
-            'B': float(standard_size.B_chest_width),
-            'C': float(standard_size.C_chest_width_armholes),
-            'D': float(standard_size.D_bottom_width),
-            'E': float(standard_size.E_new_width),
-            'F': float(standard_size.F_back_width),
-            'G': float(standard_size.G_back_width_armholes),
-            'H': float(standard_size.H_neck_width),
-            'I': float(standard_size.I_sleeve_length),
-            'J': float(standard_size.J_sleeve_width),
-            'K': float(standard_size.K_sleeve_width_above_cuff),
-            'L': float(standard_size.L_sleeve_opening),
-            'M': float(standard_size.M_cuff_length),
-            'N': float(standard_size.N_armhole),
-            'O': float(standard_size.O_back_neck_drop),
-            'P': float(standard_size.P_front_neck_drop),
-            'Q': float(standard_size.Q_collar_width),
-            'R': float(standard_size.R_shoulder_drop),
-            'S': float(standard_size.S_waistband_length),
-            'T': float(standard_size.T_forward_shoulder_seam),
-            'front_placement': float(standard_size.front_placement_from_cf),
-        }
-        return JsonResponse(data)
-    except StandardSizeChart.DoesNotExist:
+    article_type = request.GET.get('article_type', DEFAULT_ARTICLE_TYPE)
+    standard_size = SizeChartRegistry.get(size, article_type)
+    if standard_size is None:
         return JsonResponse({'error': 'Standard measurements not found for this size'}, status=404)
+    
+    chart = standard_size.chart
+    data = {code: chart.get(code, 0.0) for code in CHART_CODES if code != 'PRINT_PLACEMENT_FROM_CF'}
+    data['front_placement'] = chart.get('PRINT_PLACEMENT_FROM_CF', 0.0)
+    return JsonResponse(data)
 
 @login_required
 @user_passes_test(is_admin, login_url='/accounts/admin/login/')
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+"""Quick benchmark script for validation engine"""
+import os
+import sys
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'magic_qc.settings')
+sys.path.insert(0, os.path.dirname(__file__))
+django.setup()
+
+# Run benchmarks
+if '--concurrency' in sys.argv:
+    # Concurrent uploads against a throwaway SQLite database
+    from measurements.bench_upload_concurrency import run_upload_concurrency_benchmark
+    run_upload_concurrency_benchmark()
+else:
+    from measurements.bench_validation_engine import run_all_benchmarks
+    run_all_benchmarks()
@@ -11,4 +11,20 @@ django.setup()
 
 # Run tests
 from measurements.test_validation_engine import run_all_tests
+from measurements.test_result_storage import run_all_tests as run_result_storage_tests
+from measurements.test_reports import run_all_tests as run_reports_tests
+from measurements.test_analytics_charts import run_all_tests as run_analytics_chart_tests
+from measurements.test_results_history import run_all_tests as run_results_history_tests
+from measurements.test_size_chart_views import run_all_tests as run_size_chart_view_tests
+from products.test_catalog import run_all_tests as run_catalog_tests
+from accounts.test_pin_login import run_all_tests as run_pin_login_tests
+from accounts.test_operator_bootstrap import run_all_tests as run_operator_bootstrap_tests
 run_all_tests()
+run_result_storage_tests()
+run_reports_tests()
+run_analytics_chart_tests()
+run_results_history_tests()
+run_size_chart_view_tests()
+run_catalog_tests()
+run_pin_login_tests()
+run_operator_bootstrap_tests()